@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Callable, List, Literal, Optional, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.services.export import MEDIA_TYPES, ExportFormat, export_rows
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageQuery
+
+T = TypeVar("T")
+
+# The body stays a plain JSON list; the cursor for the next page rides in
+# this header and is absent on the last page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_params(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER}"),
+    sort: Optional[str] = Query(default=None),
+    order: Optional[Literal["asc", "desc"]] = Query(default=None),
+) -> PageQuery:
+    return PageQuery(limit=limit, cursor=cursor, sort=sort, descending=None if order is None else order == "desc")
+
+
+def paged(
+    response: Response,
+    fetch: Callable[[PageQuery], Tuple[List[T], Optional[str]]],
+    page: PageQuery,
+    **filters: Any,
+) -> List[T]:
+    try:
+        items, next_cursor = fetch(replace(page, filters=filters))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+def export_params(
+    format: ExportFormat = Query(default="ndjson"),
+    since: Optional[datetime] = Query(default=None, description="Inclusive; naive times are UTC"),
+    until: Optional[datetime] = Query(default=None, description="Exclusive; naive times are UTC"),
+    order: Optional[Literal["asc", "desc"]] = Query(default=None),
+) -> Tuple[ExportFormat, PageQuery]:
+    descending = None if order is None else order == "desc"
+    return format, PageQuery(descending=descending, since=since, until=until)
+
+
+def exported(
+    name: str,
+    fetch: Callable[[PageQuery], Tuple[List[Any], Optional[str]]],
+    model: Type[BaseModel],
+    params: Tuple[ExportFormat, PageQuery],
+    **filters: Any,
+) -> StreamingResponse:
+    """Stream every matching row as CSV / NDJSON, one keyset page at a time."""
+    fmt, query = params
+    try:
+        chunks = export_rows(fetch, replace(query, filters=filters), model, fmt)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    disposition = f'attachment; filename="{name}.{fmt}"'
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers={"Content-Disposition": disposition})
+
+
+__all__ = ["NEXT_CURSOR_HEADER", "export_params", "exported", "page_params", "paged"]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+
+from app.api.paging import page_params, paged
 
 from app.core.passes import list_pass_plans
 from app.schemas import (
     APIMessage,
+    BulkImportResult,
     Pass,
     PassCreate,
     PassPlan,
@@ -16,11 +19,22 @@ from app.schemas import (
     VehicleCreate,
     VehicleUpdate,
 )
+from app.services.bulk_import import ImportFormat, bulk_importer, detect_format
 from app.services.datastore import db
+from app.services.pagination import PageQuery
 
 router = APIRouter()
 
 
+def _import(run, file: UploadFile, fmt: ImportFormat | None) -> BulkImportResult:
+    try:
+        fmt = fmt or detect_format(file.filename, file.content_type)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    # The upload is spooled to disk by Starlette; rows are read off it in chunks.
+    return run(file.file, fmt)
+
+
 # Users -----------------------------------------------------------------
 def _cors_response() -> Response:
     return Response(
@@ -39,8 +53,12 @@ def options_users() -> Response:
 
 
 @router.get("/users", response_model=list[User])
-def list_users() -> list[User]:
-    return db.list_users()
+def list_users(
+    response: Response,
+    page: PageQuery = Depends(page_params),
+    role: str | None = Query(default=None),
+) -> list[User]:
+    return paged(response, db.page_users, page, role=role)
 
 
 @router.post("/users", response_model=User, status_code=status.HTTP_201_CREATED)
@@ -48,6 +66,22 @@ def create_user(payload: UserCreate) -> User:
     return db.create_user(payload)
 
 
+@router.post("/users/import", response_model=BulkImportResult)
+def import_users(
+    file: UploadFile = File(...),
+    format: ImportFormat | None = Query(default=None),
+) -> BulkImportResult:
+    return _import(bulk_importer.import_users, file, format)
+
+
+@router.get("/users/{user_id}", response_model=User)
+def get_user(user_id: str) -> User:
+    user = db.get_user(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
 @router.put("/users/{user_id}", response_model=User)
 def update_user(user_id: str, payload: UserUpdate) -> User:
     try:
@@ -72,8 +106,12 @@ def options_vehicles() -> Response:
 
 
 @router.get("/vehicles", response_model=list[Vehicle])
-def list_vehicles() -> list[Vehicle]:
-    return db.list_vehicles()
+def list_vehicles(
+    response: Response,
+    page: PageQuery = Depends(page_params),
+    user_id: str | None = Query(default=None),
+) -> list[Vehicle]:
+    return paged(response, db.page_vehicles, page, user_id=user_id)
 
 
 @router.post("/vehicles", response_model=Vehicle, status_code=status.HTTP_201_CREATED)
@@ -84,6 +122,14 @@ def create_vehicle(payload: VehicleCreate) -> Vehicle:
         raise HTTPException(status_code=400, detail=f"Unknown user_id {exc.args[0]}")
 
 
+@router.post("/vehicles/import", response_model=BulkImportResult)
+def import_vehicles(
+    file: UploadFile = File(...),
+    format: ImportFormat | None = Query(default=None),
+) -> BulkImportResult:
+    return _import(bulk_importer.import_vehicles, file, format)
+
+
 @router.put("/vehicles/{vehicle_id}", response_model=Vehicle)
 def update_vehicle(vehicle_id: str, payload: VehicleUpdate) -> Vehicle:
     try:
@@ -122,8 +168,14 @@ def list_pass_plans_endpoint() -> list[PassPlan]:
 
 
 @router.get("/passes", response_model=list[Pass])
-def list_passes() -> list[Pass]:
-    return db.list_passes()
+def list_passes(
+    response: Response,
+    page: PageQuery = Depends(page_params),
+    user_id: str | None = Query(default=None),
+    role: str | None = Query(default=None),
+    is_paid: bool | None = Query(default=None),
+) -> list[Pass]:
+    return paged(response, db.page_passes, page, user_id=user_id, role=role, is_paid=is_paid)
 
 
 @router.post("/passes", response_model=Pass, status_code=status.HTTP_201_CREATED)
@@ -134,6 +186,14 @@ def create_pass(payload: PassCreate) -> Pass:
         raise HTTPException(status_code=400, detail=f"Unknown user_id {exc.args[0]}")
 
 
+@router.post("/passes/import", response_model=BulkImportResult)
+def import_passes(
+    file: UploadFile = File(...),
+    format: ImportFormat | None = Query(default=None),
+) -> BulkImportResult:
+    return _import(bulk_importer.import_passes, file, format)
+
+
 @router.put("/passes/{pass_id}", response_model=Pass)
 def update_pass(pass_id: str, payload: PassUpdate) -> Pass:
     try:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, status
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
 
 from app.schemas import (
     ClientGuestPaymentRequest,
@@ -18,7 +20,8 @@ from app.schemas import (
     RoleUpgradeSubmit,
     WalletTopUpRequest,
 )
-from app.services.datastore import db
+from app.services.datastore import adb, db
+from app.services.summary_cache import client_summary_cache, etag_matches
 
 router = APIRouter()
 
@@ -34,11 +37,20 @@ def register_client(payload: ClientRegistrationRequest) -> ClientRegistrationRes
 
 
 @router.get("/summary/{user_id}", response_model=ClientSummary)
-def fetch_client_summary(user_id: str) -> ClientSummary:
-    try:
-        return db.get_client_summary(user_id)
-    except KeyError:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+def fetch_client_summary(user_id: str, if_none_match: Optional[str] = Header(default=None)) -> Response:
+    """Served from the per-user summary cache; an unchanged ``If-None-Match`` poll gets a 304."""
+    entry = client_summary_cache.get(user_id)
+    if entry is None:
+        started = client_summary_cache.begin()
+        try:
+            summary = db.get_client_summary(user_id)
+        except KeyError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        entry = client_summary_cache.put(user_id, started, summary)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
 
 
 @router.get("/wallet/{user_id}", response_model=ClientWalletActivity)
@@ -91,8 +103,8 @@ def pay_guest_session(payload: ClientGuestPaymentRequest) -> Payment:
 
 
 @router.get("/parking", response_model=ParkingOverview)
-def get_parking_overview() -> ParkingOverview:
-    return db.get_parking_overview()
+async def get_parking_overview() -> ParkingOverview:
+    return await adb.get_parking_overview()
 
 
 @router.get("/notifications/{user_id}", response_model=list[Notification])
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Literal, Optional
 
-from app.schemas import FaceEnrollRequest, FaceEnrollResponse, FaceVerifyRequest, FaceVerifyResponse, UserFace
+from fastapi import APIRouter, HTTPException, Query, Response, status
+
+from app.schemas import (
+    APIMessage,
+    FaceCacheMetrics,
+    FaceCompactionReport,
+    FaceEnrollRequest,
+    FaceEnrollResponse,
+    FaceProfilePage,
+    FaceVerifyBatchRequest,
+    FaceVerifyBatchResponse,
+    FaceVerifyRequest,
+    FaceVerifyResponse,
+)
 from app.services.face_recognition import face_recognition_service
 
 router = APIRouter()
@@ -24,6 +37,50 @@ def verify_face(payload: FaceVerifyRequest) -> FaceVerifyResponse:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
-@router.get("/profiles", response_model=list[UserFace])
-def list_profiles() -> list[UserFace]:
-    return face_recognition_service.list_profiles()
+@router.post("/verify/batch", response_model=FaceVerifyBatchResponse)
+def verify_faces_batch(payload: FaceVerifyBatchRequest) -> FaceVerifyBatchResponse:
+    return face_recognition_service.verify_batch(payload)
+
+
+@router.get("/profiles", response_model=FaceProfilePage, response_model_exclude_none=True)
+def list_profiles(
+    user_id: Optional[str] = Query(default=None),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    include_embeddings: bool = Query(default=False),
+) -> FaceProfilePage:
+    return face_recognition_service.list_profiles(
+        user_id=user_id, offset=offset, limit=limit, include_embeddings=include_embeddings
+    )
+
+
+@router.get("/profiles/export", response_class=Response)
+def export_profiles(
+    user_id: Optional[str] = Query(default=None),
+    dtype: Literal["float32", "float16"] = Query(default="float32"),
+) -> Response:
+    payload, version = face_recognition_service.export_embeddings(user_id=user_id, dtype=dtype)
+    return Response(
+        content=payload,
+        media_type="application/octet-stream",
+        headers={"X-Face-Gallery-Version": version},
+    )
+
+
+@router.delete("/profiles/{profile_id}", response_model=APIMessage)
+def delete_profile(profile_id: str) -> APIMessage:
+    try:
+        face_recognition_service.delete_profile(profile_id)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Face profile not found")
+    return APIMessage(message="Face profile removed")
+
+
+@router.post("/compact", response_model=FaceCompactionReport)
+def compact_gallery() -> FaceCompactionReport:
+    return face_recognition_service.compact()
+
+
+@router.get("/metrics", response_model=FaceCacheMetrics)
+def face_cache_metrics() -> FaceCacheMetrics:
+    return face_recognition_service.cache_metrics()
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from typing import Tuple
 
-from app.schemas import AccessEvent
-from app.services.datastore import db
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.paging import export_params, exported
+from app.schemas import AccessEvent, DecisionLiteral
+from app.services.datastore import adb, db
+from app.services.export import ExportFormat
+from app.services.pagination import PageQuery
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[AccessEvent])
 @router.get("/", response_model=list[AccessEvent])
-def list_access_events(limit: int = Query(default=50, le=200)) -> list[AccessEvent]:
-    return db.list_access_events(limit=limit)
+async def list_access_events(limit: int = Query(default=50, le=200)) -> list[AccessEvent]:
+    return await adb.list_access_events(limit=limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_access_events(
+    params: Tuple[ExportFormat, PageQuery] = Depends(export_params),
+    gate: str | None = Query(default=None),
+    decision: DecisionLiteral | None = Query(default=None),
+) -> StreamingResponse:
+    return exported("access-events", db.page_access_events, AccessEvent, params, gate=gate, decision=decision)
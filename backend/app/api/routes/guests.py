@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.api.paging import export_params, exported, page_params, paged
 
 from app.schemas import (
     GuestPaymentRequest,
@@ -12,13 +17,43 @@ from app.schemas import (
     Payment,
 )
 from app.services.datastore import db
+from app.services.export import ExportFormat
+from app.services.pagination import PageQuery
 
 router = APIRouter()
 
 
 @router.get("/sessions", response_model=list[GuestSession])
-def list_guest_sessions() -> list[GuestSession]:
-    return db.list_guest_sessions()
+def list_guest_sessions(
+    response: Response,
+    page: PageQuery = Depends(page_params),
+    status: str | None = Query(default=None),
+    plate_text: str | None = Query(default=None),
+) -> list[GuestSession]:
+    plate = plate_text.upper() if plate_text else None  # sessions store plates upper-cased
+    return paged(response, db.page_guest_sessions, page, status=status, plate_text=plate)
+
+
+@router.get("/payments", response_model=list[Payment])
+def list_payments(
+    response: Response,
+    page: PageQuery = Depends(page_params),
+    processor: str | None = Query(default=None),
+    session_id: str | None = Query(default=None),
+    pass_id: str | None = Query(default=None),
+) -> list[Payment]:
+    return paged(response, db.page_payments, page, processor=processor, session_id=session_id, pass_id=pass_id)
+
+
+@router.get("/payments/export", response_class=StreamingResponse)
+def export_payments(
+    params: Tuple[ExportFormat, PageQuery] = Depends(export_params),
+    processor: str | None = Query(default=None),
+    session_id: str | None = Query(default=None),
+    pass_id: str | None = Query(default=None),
+) -> StreamingResponse:
+    filters = {"processor": processor, "session_id": session_id, "pass_id": pass_id}
+    return exported("payments", db.page_payments, Payment, params, **filters)
 
 
 @router.post("/session/open", response_model=GuestSession, status_code=status.HTTP_201_CREATED)
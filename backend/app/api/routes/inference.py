@@ -2,15 +2,12 @@ from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException, Response, status
 
-from app.schemas import InferenceRequest, InferenceResponse
-from app.services.cache import CacheKeys, redis_cache
+from app.schemas import AdmissionMetrics, InferenceRequest, InferenceResponse
+from app.services.admission import AdmissionRejected, admission_controller
 from app.services.inference import inference_service
 
 router = APIRouter()
 
-RATE_LIMIT_REQUESTS = 5
-RATE_LIMIT_WINDOW_SECONDS = 3
-
 
 @router.options("", include_in_schema=False)
 @router.options("/", include_in_schema=False)
@@ -28,10 +25,17 @@ def options_inference() -> Response:
 @router.post("", response_model=InferenceResponse)
 @router.post("/", response_model=InferenceResponse)
 async def run_inference(payload: InferenceRequest) -> InferenceResponse:
-    limiter_key = CacheKeys.rate_limit(payload.gate)
-    if redis_cache.hit_rate_limit(limiter_key, RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW_SECONDS):
+    try:
+        async with admission_controller.admit(payload.gate):
+            return await inference_service.infer(payload)
+    except AdmissionRejected as exc:
         raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Gate capture throttled. Please wait a few seconds.",
-        )
-    return await inference_service.infer(payload)
+            status_code=exc.status_code,
+            detail=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
+@router.get("/metrics", response_model=AdmissionMetrics)
+def inference_metrics() -> AdmissionMetrics:
+    return admission_controller.metrics()
@@ -10,14 +10,14 @@ from app.schemas import (
     ParkingVenueStatus,
     ParkingVenueUpdate,
 )
-from app.services.datastore import db
+from app.services.datastore import adb, db
 
 router = APIRouter()
 
 
 @router.get("/overview", response_model=ParkingOverview)
-def overview() -> ParkingOverview:
-    return db.get_parking_overview()
+async def overview() -> ParkingOverview:
+    return await adb.get_parking_overview()
 
 
 @router.get("/venues", response_model=list[ParkingVenueStatus])
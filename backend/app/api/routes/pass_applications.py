@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.api.paging import page_params, paged
 
 from app.schemas import PassApplication, PassApplicationDecision
 from app.services.datastore import db
+from app.services.pagination import PageQuery
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[PassApplication])
-def list_pass_applications(status: str | None = Query(default=None)) -> list[PassApplication]:
+def list_pass_applications(
+    response: Response,
+    page: PageQuery = Depends(page_params),
+    status: str | None = Query(default=None),
+    user_id: str | None = Query(default=None),
+) -> list[PassApplication]:
     if status and status not in {"pending", "approved", "rejected"}:
         raise HTTPException(status_code=400, detail="Invalid status filter")
-    return db.list_pass_applications(status=status)
+    return paged(response, db.page_pass_applications, page, status=status, user_id=user_id)
 
 
 @router.post("/{application_id}/decision", response_model=PassApplication)
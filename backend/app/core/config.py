@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import AnyHttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -18,6 +18,18 @@ class Settings(BaseSettings):
     supabase_url: str = "https://your-project.supabase.co"
     supabase_key: str = "SUPABASE_SERVICE_ROLE_KEY"
     use_supabase: bool = True
+    mock_data_dir: Optional[str] = None
+    mock_wal_fsync_ms: int = 50
+    mock_snapshot_interval_seconds: float = 300.0
+    sqlite_path: Optional[str] = None
+    sqlite_statement_cache: int = 256
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_async_workers: int = 4
+    supabase_pool_size: int = 20
+    supabase_timeout_seconds: float = 10.0
+    supabase_fanout_workers: int = 16
+    import_chunk_size: int = 500
+    import_hash_workers: int = 0
     redis_url: str = "redis://localhost:6379/0"
     redis_cache_ttl: int = 60
     jwt_secret_key: str = "dev-secret"
@@ -43,7 +55,31 @@ class Settings(BaseSettings):
     ocr_languages: List[str] = ["en"]
     ocr_crop_margin: float = 0.08
     lpr_frame_cache_ms: int = 600
+    vision_workers: int = 2
+    admission_queue_depth: int = 2
+    admission_max_pending: int = 32
+    plate_negative_cache_ttl: float = 5.0
+    client_summary_cache_ttl: float = 30.0
+    access_policy_path: str = "app/data/access_policy.json"
+    access_policy_reload_seconds: float = 2.0
+    face_model_pack: str = "buffalo_l"
+    face_allowed_modules: List[str] = ["detection", "recognition"]
+    face_det_size: int = 640
+    face_det_max_side: int = 640
+    face_fast_path: bool = True
+    face_store_dir: str = "app/data/face_store"
+    face_store_reload_seconds: float = 1.0
     face_store_path: str = "app/data/face_store.json"
+    face_index: Literal["exact", "ivf"] = "exact"
+    face_index_min_size: int = 5000
+    face_index_nlist: int = 0
+    face_index_nprobe: int = 16
+    face_cache_entries: int = 1024
+    face_cache_results: bool = True
+    face_match_threshold: float = 0.35
+    face_gallery_mode: Literal["all", "centroid", "exemplars"] = "all"
+    face_max_exemplars: int = 5
+    face_compaction_interval_seconds: float = 600.0
     touchngo_base_url: str = "https://sandbox.touchngo.com.my/mock"
     touchngo_api_key: str = "demo-key"
     touchngo_merchant_id: str = "SMARTGATE"
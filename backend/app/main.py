@@ -9,6 +9,11 @@ from loguru import logger
 
 from app.core.config import settings
 from app.api import api_router
+from app.api.paging import NEXT_CURSOR_HEADER
+from app.services.access_policy import access_policy
+from app.services.bulk_import import bulk_importer
+from app.services.datastore import MockDatabase, adb, db
+from app.services.face_recognition import face_recognition_service
 from app.services.vision import vision_pipeline
 
 app = FastAPI(title=settings.project_name, version=settings.backend_version)
@@ -23,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 app.include_router(api_router, prefix=settings.api_prefix)
 
@@ -49,6 +55,61 @@ async def warmup_vision_pipeline() -> None:
         logger.warning("Vision pipeline unavailable after warmup; falling back to mock detections")
 
 
+@app.on_event("startup")
+async def start_face_compaction() -> None:
+    if settings.face_gallery_mode == "all" or settings.face_compaction_interval_seconds <= 0:
+        return
+    app.state.face_compaction = asyncio.create_task(
+        face_recognition_service.run_compaction(settings.face_compaction_interval_seconds)
+    )
+
+
+@app.on_event("startup")
+async def start_policy_reloader() -> None:
+    app.state.policy_reloader = asyncio.create_task(access_policy.run_reloader())
+
+
+@app.on_event("startup")
+async def start_mock_snapshots() -> None:
+    if not isinstance(db, MockDatabase) or not settings.mock_data_dir or settings.mock_snapshot_interval_seconds <= 0:
+        return
+    app.state.mock_snapshots = asyncio.create_task(db.run_checkpoints(settings.mock_snapshot_interval_seconds))
+
+
+@app.on_event("shutdown")
+async def close_async_store() -> None:
+    await adb.aclose()
+
+
+@app.on_event("shutdown")
+async def close_local_store() -> None:
+    task = getattr(app.state, "mock_snapshots", None)
+    if task is not None:
+        task.cancel()
+    close = getattr(db, "close", None)  # MockDatabase / SqliteStore
+    if close is not None:
+        await asyncio.to_thread(close)
+
+
+@app.on_event("shutdown")
+async def stop_import_pool() -> None:
+    await asyncio.to_thread(bulk_importer.close)
+
+
+@app.on_event("shutdown")
+async def stop_face_compaction() -> None:
+    task = getattr(app.state, "face_compaction", None)
+    if task is not None:
+        task.cancel()
+
+
+@app.on_event("shutdown")
+async def stop_policy_reloader() -> None:
+    task = getattr(app.state, "policy_reloader", None)
+    if task is not None:
+        task.cancel()
+
+
 if __name__ == "__main__":  # pragma: no cover - convenience entrypoint
     import uvicorn
 
@@ -14,6 +14,7 @@ DecisionLiteral = Literal["ALLOW", "DENY", "GUEST"]
 GuestStatusLiteral = Literal["open", "closed", "paid"]
 PassPlanLiteral = Literal["short_semester", "long_semester", "annual"]
 ParkingDirectionLiteral = Literal["entry", "exit"]
+FaceStateLiteral = Literal["unchecked", "absent", "unknown", "match", "mismatch"]
 SlugStr = constr(pattern=r"^[a-z0-9\-]+$")  # type: ignore[arg-type]
 
 
@@ -95,6 +96,24 @@ class PassUpdate(BaseModel):
     starts_at: Optional[datetime] = None
 
 
+class UserImport(UserCreate):
+    # Imported accounts get the same default portal password as ``create_user``.
+    password: Optional[constr(min_length=6)] = None  # type: ignore[valid-type]
+
+
+class BulkImportError(BaseModel):
+    row: int
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    entity: Literal["users", "vehicles", "passes"]
+    received: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[BulkImportError] = Field(default_factory=list)
+
+
 class Pass(PassBase):
     id: str
 
@@ -177,6 +196,14 @@ class ClientGuestPaymentRequest(GuestPaymentRequest):
     user_id: Optional[str] = None
 
 
+class FaceMatch(BaseModel):
+    user_id: str
+    score: float
+    owner_name: Optional[str] = None
+    owner_phone: Optional[str] = None
+    owner_affiliation: Optional[str] = None
+
+
 class AccessDecision(BaseModel):
     plate_text: str
     confidence: float
@@ -188,6 +215,8 @@ class AccessDecision(BaseModel):
     owner_phone: Optional[str] = None
     owner_affiliation: Optional[str] = None
     pass_valid_to: Optional[datetime] = None
+    face_state: Optional[FaceStateLiteral] = None
+    face_match: Optional[FaceMatch] = None
 
 
 class InferenceRequest(BaseModel):
@@ -200,6 +229,14 @@ class InferenceRequest(BaseModel):
         default=None,
         description="Raw frame encoded as base64 string for YOLO/EasyOCR pipeline.",
     )
+    driver_image_base64: Optional[str] = Field(
+        default=None,
+        description="Driver photo checked against the plate owner's enrolled face.",
+    )
+    face_check: bool = Field(
+        default=False,
+        description="Check the driver's face in image_base64 when no driver image is sent.",
+    )
 
 
 class InferenceResponse(BaseModel):
@@ -207,6 +244,16 @@ class InferenceResponse(BaseModel):
     event: AccessEvent
 
 
+class AdmissionMetrics(BaseModel):
+    workers: int
+    in_flight: int
+    pending: int
+    queue_depths: Dict[str, int]
+    service_time_ms: float
+    retry_after_seconds: int
+    shed: Dict[str, int]
+
+
 class GateFrequencyPoint(BaseModel):
     timestamp: datetime
     outer: int
@@ -268,10 +315,17 @@ class Gate(GateBase):
 class UserFace(BaseModel):
     id: str
     user_id: str
-    embedding: list[float]
+    embedding: Optional[list[float]] = None
     captured_at: datetime
 
 
+class FaceProfilePage(BaseModel):
+    items: List[UserFace]
+    total: int
+    offset: int
+    limit: int
+
+
 class FaceEnrollRequest(BaseModel):
     user_id: str
     image_base64: str
@@ -282,14 +336,6 @@ class FaceEnrollResponse(BaseModel):
     profile: UserFace
 
 
-class FaceMatch(BaseModel):
-    user_id: str
-    score: float
-    owner_name: Optional[str] = None
-    owner_phone: Optional[str] = None
-    owner_affiliation: Optional[str] = None
-
-
 class FaceVerifyRequest(BaseModel):
     image_base64: str
     top_k: int = Field(default=3, ge=1, le=5)
@@ -300,6 +346,43 @@ class FaceVerifyResponse(BaseModel):
     matches: List[FaceMatch]
 
 
+class FaceVerifyBatchRequest(BaseModel):
+    images_base64: List[str] = Field(..., min_length=1, max_length=32)
+    top_k: int = Field(default=3, ge=1, le=5)
+    threshold: float = Field(default=0.35, ge=0.0, le=1.0)
+
+
+class FaceVerifyBatchItem(BaseModel):
+    index: int
+    matches: List[FaceMatch] = Field(default_factory=list)
+    error: Optional[str] = None
+
+
+class FaceVerifyBatchResponse(BaseModel):
+    results: List[FaceVerifyBatchItem]
+
+
+class FaceCacheMetrics(BaseModel):
+    max_entries: int
+    embeddings: int
+    results: int
+    embedding_hits: int
+    embedding_misses: int
+    embedding_hit_rate: float
+    result_hits: int
+    result_misses: int
+    result_hit_rate: float
+    gallery_version: int
+
+
+class FaceCompactionReport(BaseModel):
+    mode: str
+    users: int
+    rows_before: int
+    rows_after: int
+    duration_ms: float
+
+
 class ClientRegistrationRequest(BaseModel):
     name: str = Field(..., max_length=80)
     email: EmailStr
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from itertools import product
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.constants import ROLE_LADDER, ROLE_WEIGHTS
+
+PASS_STATES = ("missing", "unpaid", "expired", "valid")
+FACE_STATES = ("unchecked", "absent", "unknown", "match", "mismatch")
+DECISIONS = ("ALLOW", "DENY", "GUEST")
+ACTIONS = ("open_guest_session",)
+WILDCARD_GATE = "*"
+
+FactsKey = Tuple[bool, str, str, str, str]  # registered, pass state, role, required role, face
+_ALL_KEYS = len(PASS_STATES) * 2 * len(ROLE_LADDER) ** 2 * len(FACE_STATES)
+_TEMPLATE_FIELDS = {
+    "gate": "outer",
+    "required_role": "guest",
+    "role": "guest",
+    "role_title": "Guest",
+    "pass_expiry": "1970-01-01",
+}
+
+
+@dataclass(frozen=True)
+class AccessFacts:
+    registered: bool
+    pass_state: str
+    role: str
+    required_role: str
+    face: str = "unchecked"
+
+    @property
+    def key(self) -> FactsKey:
+        return self.registered, self.pass_state, self.role, self.required_role, self.face
+
+
+@dataclass(frozen=True)
+class PolicyOutcome:
+    rule: str
+    decision: str
+    reason: str
+    actions: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    name: str
+    decision: str
+    reason: str
+    actions: Tuple[str, ...]
+
+    def render(self, gate: str, facts: AccessFacts, pass_expiry: Optional[str]) -> PolicyOutcome:
+        reason = self.reason.format(
+            gate=gate,
+            required_role=facts.required_role,
+            role=facts.role,
+            role_title=facts.role.title(),
+            pass_expiry=pass_expiry or "",
+        )
+        return PolicyOutcome(rule=self.name, decision=self.decision, reason=reason, actions=self.actions)
+
+
+_NO_MATCH = _CompiledRule(name="no_match", decision="DENY", reason="No access rule matched", actions=())
+_UNAVAILABLE: Dict[str, Dict[FactsKey, _CompiledRule]] = {
+    WILDCARD_GATE: {},
+}
+
+
+def _as_choices(value: Any, domain: Iterable[Any], field: str) -> Tuple[Any, ...]:
+    domain = tuple(domain)
+    choices = tuple(value) if isinstance(value, list) else (value,)
+    unknown = [choice for choice in choices if choice not in domain]
+    if unknown:
+        raise ValueError(f"Unknown {field} value(s) {unknown}; expected one of {list(domain)}")
+    return choices
+
+
+def _rule_keys(when: Mapping[str, Any]) -> List[FactsKey]:
+    unknown = set(when) - {"registered", "pass", "role", "required_role", "role_meets_gate", "face"}
+    if unknown:
+        raise ValueError(f"Unknown condition(s) {sorted(unknown)}")
+    registered = _as_choices(when.get("registered", [True, False]), (True, False), "registered")
+    passes = _as_choices(when.get("pass", list(PASS_STATES)), PASS_STATES, "pass")
+    roles = _as_choices(when.get("role", list(ROLE_LADDER)), ROLE_LADDER, "role")
+    required = _as_choices(when.get("required_role", list(ROLE_LADDER)), ROLE_LADDER, "required_role")
+    faces = _as_choices(when.get("face", list(FACE_STATES)), FACE_STATES, "face")
+    meets = when.get("role_meets_gate")
+    keys: List[FactsKey] = []
+    for key in product(registered, passes, roles, required, faces):
+        if meets is not None and (ROLE_WEIGHTS[key[2]] >= ROLE_WEIGHTS[key[3]]) != meets:
+            continue
+        keys.append(key)
+    return keys
+
+
+def compile_policy(document: Mapping[str, Any]) -> Dict[str, Dict[FactsKey, _CompiledRule]]:
+    """Compile a policy document into one flat facts -> rule table per gate.
+
+    Rules are first-match in file order. Every condition ranges over a small
+    closed domain, so each gate's table enumerates all fact combinations up
+    front and evaluation is a single dict lookup regardless of rule count.
+    """
+    parsed: List[Tuple[Optional[frozenset[str]], List[FactsKey], _CompiledRule]] = []
+    for idx, raw in enumerate(document.get("rules", [])):
+        name = raw.get("name") or f"rule_{idx}"
+        try:
+            decision = raw["decision"]
+            if decision not in DECISIONS:
+                raise ValueError(f"Unknown decision {decision}")
+            actions = _as_choices(raw.get("actions", []), ACTIONS, "action")
+            reason = str(raw.get("reason", ""))
+            reason.format(**_TEMPLATE_FIELDS)
+            gates = raw.get("gates")
+            scope = frozenset(slug.lower() for slug in gates) if gates else None
+            keys = _rule_keys(raw.get("when", {}))
+        except (KeyError, ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid access rule {name}: {exc}") from exc
+        parsed.append((scope, keys, _CompiledRule(name=name, decision=decision, reason=reason, actions=actions)))
+
+    scoped_gates = {gate for scope, _, _ in parsed if scope for gate in scope}
+    tables: Dict[str, Dict[FactsKey, _CompiledRule]] = {}
+    for gate in [WILDCARD_GATE, *sorted(scoped_gates)]:
+        table: Dict[FactsKey, _CompiledRule] = {}
+        for scope, keys, rule in parsed:
+            if scope is not None and gate not in scope:
+                continue
+            for key in keys:
+                table.setdefault(key, rule)
+            if len(table) == _ALL_KEYS:
+                break
+        tables[gate] = table
+    return tables
+
+
+class AccessPolicy:
+    """Hot-reloadable access policy backed by a JSON rule file.
+
+    ``evaluate`` only reads the compiled tables. ``run_reloader`` checks the
+    file's mtime every ``reload_interval`` seconds and recompiles it on a
+    worker thread, so a large policy never stalls the event loop.
+    """
+
+    def __init__(self, path: str, reload_interval: float) -> None:
+        self._path = path
+        self._reload_interval = max(0.0, reload_interval)
+        self._lock = Lock()
+        self._tables = _UNAVAILABLE
+        self._mtime: Optional[float] = None
+        self.reload()
+
+    def evaluate(self, gate: str, facts: AccessFacts, pass_expiry: Optional[str] = None) -> PolicyOutcome:
+        tables = self._tables
+        table = tables.get(gate) or tables[WILDCARD_GATE]
+        rule = table.get(facts.key, _NO_MATCH)
+        return rule.render(gate, facts, pass_expiry)
+
+    def reload(self) -> bool:
+        with self._lock:
+            try:
+                mtime = os.stat(self._path).st_mtime
+            except OSError as exc:
+                logger.error("Access policy {} not readable: {}", self._path, exc)
+                return False
+            self._mtime = mtime
+            try:
+                with open(self._path, "r", encoding="utf-8") as handle:
+                    tables = compile_policy(json.load(handle))
+            except (OSError, ValueError) as exc:
+                logger.error("Access policy {} rejected, keeping previous rules: {}", self._path, exc)
+                return False
+            self._tables = tables
+            logger.info("Access policy loaded from {} ({} gate tables)", self._path, len(tables))
+            return True
+
+    def _maybe_reload(self) -> None:
+        try:
+            mtime = os.stat(self._path).st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    async def run_reloader(self) -> None:
+        """Background loop picking up policy edits; a no-op when reloading is disabled."""
+        if not self._reload_interval:
+            return
+        while True:
+            await asyncio.sleep(self._reload_interval)
+            try:
+                await asyncio.to_thread(self._maybe_reload)
+            except Exception as exc:  # pragma: no cover - keep the loop alive
+                logger.error("Access policy reload check failed: {}", exc)
+
+
+access_policy = AccessPolicy(settings.access_policy_path, settings.access_policy_reload_seconds)
+
+__all__ = ["access_policy", "AccessFacts", "AccessPolicy", "PolicyOutcome", "compile_policy", "FACE_STATES", "PASS_STATES"]
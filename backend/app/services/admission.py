@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator, Deque, Dict
+
+from app.core.config import settings
+from app.schemas import AdmissionMetrics
+
+
+class AdmissionRejected(Exception):
+    """Raised when a frame is shed instead of being admitted to the pipeline."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """In-process admission control for ``/api/infer``.
+
+    A global cap sized to the vision worker count bounds how many frames run
+    at once. Frames beyond the cap wait in a small per-gate queue; when a
+    gate's queue is full the oldest waiting frame is dropped so the gate
+    always converges on its newest capture. Waiters are served round-robin
+    across gates so a chatty camera cannot starve the others.
+    """
+
+    def __init__(self, workers: int, queue_depth: int, max_pending: int) -> None:
+        self._workers = max(1, workers)
+        self._queue_depth = max(1, queue_depth)
+        self._max_pending = max(1, max_pending)
+        self._in_flight = 0
+        self._queues: "OrderedDict[str, Deque[asyncio.Future[None]]]" = OrderedDict()
+        self._service_time = 0.5  # seconds, EWMA seeded with a pessimistic guess
+        self._shed: Counter[str] = Counter()
+
+    @asynccontextmanager
+    async def admit(self, gate: str) -> AsyncIterator[None]:
+        await self._acquire(gate)
+        started = monotonic()
+        try:
+            yield
+        finally:
+            self._observe(monotonic() - started)
+            self._release()
+
+    def metrics(self) -> AdmissionMetrics:
+        return AdmissionMetrics(
+            workers=self._workers,
+            in_flight=self._in_flight,
+            pending=self._pending(),
+            queue_depths={gate: len(queue) for gate, queue in self._queues.items()},
+            service_time_ms=round(self._service_time * 1000, 1),
+            retry_after_seconds=self._retry_after(),
+            shed=dict(self._shed),
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    async def _acquire(self, gate: str) -> None:
+        if self._in_flight < self._workers and not self._pending():
+            self._in_flight += 1
+            return
+        if self._pending() >= self._max_pending:
+            self._shed["overloaded"] += 1
+            raise AdmissionRejected(503, "Inference pipeline saturated. Retry shortly.", self._retry_after())
+        # Same slug ``_resolve_gate`` picks, so "Outer"/"outer"/None share one queue.
+        key = (gate or "outer").lower()
+        queue = self._queues.setdefault(key, deque())
+        if len(queue) >= self._queue_depth:
+            stale = queue.popleft()
+            if not stale.done():
+                self._shed["coalesced"] += 1
+                stale.set_exception(
+                    AdmissionRejected(429, "Superseded by a newer frame from this gate.", self._retry_after())
+                )
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in queue:
+                queue.remove(waiter)
+                if not queue and self._queues.get(key) is queue:
+                    del self._queues[key]
+            elif waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # The slot was handed over just before cancellation; pass it on.
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        for gate in list(self._queues):
+            queue = self._queues[gate]
+            while queue:
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                if queue:
+                    self._queues.move_to_end(gate)
+                else:
+                    del self._queues[gate]
+                waiter.set_result(None)
+                return
+            del self._queues[gate]
+        self._in_flight -= 1
+
+    def _pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _observe(self, elapsed: float) -> None:
+        self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+
+    def _retry_after(self) -> int:
+        backlog = self._pending() + 1
+        return max(1, math.ceil(self._service_time * backlog / self._workers))
+
+
+admission_controller = AdmissionController(
+    workers=settings.vision_workers,
+    queue_depth=settings.admission_queue_depth,
+    max_pending=settings.admission_max_pending,
+)
+
+__all__ = ["admission_controller", "AdmissionController", "AdmissionRejected"]
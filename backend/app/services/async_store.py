@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from httpx import AsyncClient, Limits, Timeout
+from postgrest import AsyncPostgrestClient
+
+from app.core.config import settings
+from app.schemas import (
+    AccessEvent,
+    AccessEventBase,
+    Gate,
+    GuestSession,
+    GuestSessionCreate,
+    ParkingEventRequest,
+    ParkingOverview,
+    ParkingVenueStatus,
+    Pass,
+    User,
+    Vehicle,
+)
+
+from .cache import CacheKeys, redis_cache
+from .plate_cache import normalize_plate, plate_lookup_cache
+
+
+class _PooledPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client whose httpx session keeps a bounded keep-alive pool."""
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, Timeout],
+        verify: bool = True,
+    ) -> AsyncClient:
+        pool_size = max(1, settings.supabase_pool_size)
+        return AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            follow_redirects=True,
+            http2=True,
+            limits=Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+
+class AsyncSupabaseStore:
+    """Awaitable Supabase access for the gate hot path.
+
+    Mirrors the subset of ``SupabaseStore`` used by inference and the polled
+    read routes, but talks to PostgREST through a pooled ``httpx.AsyncClient``
+    so concurrent gates are not capped by the default thread pool.
+    """
+
+    def __init__(self) -> None:
+        headers = {
+            "apikey": settings.supabase_key,
+            "Authorization": f"Bearer {settings.supabase_key}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        self.client = _PooledPostgrestClient(
+            f"{settings.supabase_url.rstrip('/')}/rest/v1",
+            headers=headers,
+            timeout=settings.supabase_timeout_seconds,
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _generate_id(self, prefix: str) -> str:
+        return f"{prefix}-{uuid4().hex[:6].upper()}"
+
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def _execute(self, query) -> List[Dict]:
+        response = await query.execute()
+        if getattr(response, "error", None):
+            raise RuntimeError(response.error.message)  # pragma: no cover - depends on Supabase
+        return response.data or []
+
+    async def _insert_row(self, table: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data = await self._execute(self.client.from_(table).insert(payload))
+        if not data:
+            raise RuntimeError(f"Supabase insert into {table} returned no data")
+        return data[0]
+
+    async def _single(self, query) -> Optional[Dict]:
+        data = await self._execute(query.limit(1))
+        return data[0] if data else None
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    # ------------------------------------------------------------------
+    # Gate decision reads
+    # ------------------------------------------------------------------
+    async def get_gate_by_slug(self, slug: str) -> Optional[Gate]:
+        row = await self._single(self.client.from_("gates").select("*").eq("slug", slug.lower()))
+        return Gate(**row) if row else None
+
+    async def get_user(self, user_id: str) -> Optional[User]:
+        row = await self._single(self.client.from_("users").select("*").eq("id", user_id))
+        return User(**row) if row else None
+
+    async def find_user_by_plate(self, plate_text: str) -> Tuple[Optional[User], Optional[Vehicle]]:
+        # One request: indexed match on the generated plate_key (migration 007), owner embedded.
+        row = await self._single(
+            self.client.from_("vehicles").select("*", "users(*)").eq("plate_key", normalize_plate(plate_text))
+        )
+        if not row:
+            return None, None
+        user_row = row.pop("users", None)
+        return (User(**user_row) if user_row else None), Vehicle(**row)
+
+    async def get_latest_pass(self, user_id: str) -> Optional[Pass]:
+        row = await self._single(
+            self.client.from_("passes").select("*").eq("user_id", user_id).order("valid_to", desc=True)
+        )
+        return Pass(**row) if row else None
+
+    async def find_guest_session_by_plate(self, plate_text: str, status: Optional[str] = None) -> Optional[GuestSession]:
+        normalized = plate_text.upper()
+        cached = await asyncio.to_thread(redis_cache.get_json, CacheKeys.guest_session(normalized))
+        if cached:
+            session = GuestSession(**cached)
+            if status is None or session.status == status:
+                return session
+        query = self.client.from_("guest_sessions").select("*").eq("plate_text", normalized)
+        if status:
+            query = query.eq("status", status)
+        row = await self._single(query.order("start_time", desc=True))
+        if not row:
+            return None
+        session = GuestSession(**row)
+        await self._cache_guest_session(session)
+        return session
+
+    # ------------------------------------------------------------------
+    # Gate decision writes
+    # ------------------------------------------------------------------
+    async def open_guest_session(self, payload: GuestSessionCreate) -> GuestSession:
+        body = {
+            "id": self._generate_id("GST"),
+            "plate_text": payload.plate_text.upper(),
+            "start_time": self._now().isoformat(),
+            "status": "open",
+        }
+        session = GuestSession(**await self._insert_row("guest_sessions", body))
+        await self._cache_guest_session(session)
+        return session
+
+    async def add_access_event(self, payload: AccessEventBase) -> AccessEvent:
+        body = payload.model_dump()
+        body["id"] = self._generate_id("EVT")
+        body["timestamp"] = self._now().isoformat()
+        event = AccessEvent(**await self._insert_row("access_events", body))
+        await asyncio.to_thread(
+            redis_cache.push_json, CacheKeys.access_events(), event.model_dump(mode="json"), max_length=100
+        )
+        return event
+
+    async def record_parking_event(self, payload: ParkingEventRequest) -> ParkingVenueStatus:
+        venue_row = await self._single(self.client.from_("parking_venues").select("*").eq("id", payload.venue_id))
+        if not venue_row:
+            raise KeyError(payload.venue_id)
+        delta = 1 if payload.direction == "entry" else -1
+        occupied = max(0, min(venue_row["capacity"], venue_row["occupied"] + delta))
+        await self._execute(
+            self.client.from_("parking_venues").update({"occupied": occupied}).eq("id", payload.venue_id)
+        )
+        await self._insert_row(
+            "parking_events",
+            {
+                "id": self._generate_id("PEV"),
+                "venue_id": payload.venue_id,
+                "direction": payload.direction,
+                "delta": delta,
+            },
+        )
+        venue_row["occupied"] = occupied
+        venue_row["percent"] = round((occupied / venue_row["capacity"]) * 100, 1) if venue_row["capacity"] else 0.0
+        return ParkingVenueStatus(**venue_row)
+
+    # ------------------------------------------------------------------
+    # Polled read routes
+    # ------------------------------------------------------------------
+    async def list_access_events(self, limit: int = 50) -> List[AccessEvent]:
+        cached = await asyncio.to_thread(redis_cache.list_json, CacheKeys.access_events(), limit)
+        if cached:
+            return [AccessEvent(**row) for row in cached]
+        rows = await self._execute(
+            self.client.from_("access_events").select("*").order("timestamp", desc=True).limit(limit)
+        )
+        return [AccessEvent(**row) for row in rows]
+
+    async def get_parking_overview(self) -> ParkingOverview:
+        rows = await self._execute(self.client.from_("parking_venues").select("*").order("name"))
+        venues = [
+            ParkingVenueStatus(
+                id=row["id"],
+                name=row["name"],
+                capacity=row["capacity"],
+                occupied=row["occupied"],
+                percent=round((row["occupied"] / row["capacity"]) * 100, 1) if row["capacity"] else 0.0,
+            )
+            for row in rows
+        ]
+        return ParkingOverview(venues=venues)
+
+    async def _cache_guest_session(self, session: GuestSession) -> None:
+        # The Redis client is synchronous; keep its round trips off the event loop.
+        key = CacheKeys.guest_session(session.plate_text)
+        if session.status == "open":
+            await asyncio.to_thread(redis_cache.set_json, key, session.model_dump(mode="json"), ttl=4 * 60 * 60)
+        else:
+            await asyncio.to_thread(redis_cache.delete, key)
+            plate_lookup_cache.invalidate(session.plate_text)
+
+
+class AsyncMockStore:
+    """Awaitable facade over ``MockDatabase`` or ``SqliteStore``.
+
+    ``MockDatabase`` answers in microseconds without touching a lock another
+    process can hold, so its calls run inline on the event loop instead of
+    paying for a thread hop. ``SqliteStore`` writes start with ``BEGIN
+    IMMEDIATE`` and may wait up to ``busy_timeout`` for another writer (a
+    bulk import, another worker), so with ``workers`` its calls run on a
+    small dedicated pool instead; each pool thread keeps its own connection.
+    """
+
+    def __init__(self, store: Any, workers: int = 0) -> None:
+        self._store = store
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sqlite-store") if workers else None
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._store, name)
+        if not callable(attr):
+            return attr
+        executor = self._executor
+
+        if executor is None:
+
+            async def call(*args: Any, **kwargs: Any) -> Any:
+                return attr(*args, **kwargs)
+
+        else:
+
+            async def call(*args: Any, **kwargs: Any) -> Any:
+                return await asyncio.get_running_loop().run_in_executor(executor, partial(attr, *args, **kwargs))
+
+        return call
+
+    async def aclose(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+__all__ = ["AsyncSupabaseStore", "AsyncMockStore"]
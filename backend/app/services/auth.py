@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence
 
 import jwt
 from passlib.context import CryptContext
@@ -11,6 +12,22 @@ from app.core.config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _hash_password(password: str) -> str:
+    # Module-level so a process pool can pickle it by reference.
+    return pwd_context.hash(password)
+
+
+def hash_passwords(passwords: Sequence[str], executor: Optional[Executor] = None) -> List[str]:
+    """Hash a batch of passwords, spread over ``executor`` when one is given.
+
+    bcrypt is deliberately slow (hundreds of ms a hash); a process pool spreads a
+    batch over every core without tying up the server's request threads.
+    """
+    if executor is None or len(passwords) < 2:
+        return [_hash_password(password) for password in passwords]
+    return list(executor.map(_hash_password, passwords, chunksize=max(1, len(passwords) // 32)))
+
+
 class AuthService:
     def __init__(self) -> None:
         self.secret = settings.jwt_secret_key
@@ -18,7 +35,7 @@ class AuthService:
         self.expire_minutes = settings.jwt_expire_minutes
 
     def hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+        return _hash_password(password)
 
     def verify_password(self, password: str, hashed: str) -> bool:
         return pwd_context.verify(password, hashed)
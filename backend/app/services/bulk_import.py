@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import PurePath
+from threading import Lock
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Type, Union
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.schemas import BulkImportError, BulkImportResult, PassCreate, UserCreate, UserImport, VehicleCreate
+
+from .auth import hash_passwords
+from .datastore import db
+
+ImportFormat = Literal["csv", "json", "ndjson"]
+# A source record: its 1-based position and the raw mapping, or why it could not be read.
+SourceRow = Tuple[int, Union[Dict[str, Any], str]]
+
+DEFAULT_PASSWORD = "password"  # what ``create_user`` gives every account
+_FORMATS_BY_SUFFIX: Dict[str, ImportFormat] = {".csv": "csv", ".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+_FORMATS_BY_TYPE: Dict[str, ImportFormat] = {
+    "text/csv": "csv",
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> ImportFormat:
+    fmt = _FORMATS_BY_SUFFIX.get(PurePath(filename or "").suffix.lower())
+    fmt = fmt or _FORMATS_BY_TYPE.get((content_type or "").split(";")[0].strip().lower())
+    if fmt is None:
+        raise ValueError("Cannot tell the import format; name the file .csv/.json/.ndjson or pass format")
+    return fmt
+
+
+def iter_rows(stream: BinaryIO, fmt: ImportFormat) -> Iterator[SourceRow]:
+    """Yield source records one at a time; CSV and NDJSON are never held in memory whole.
+
+    A JSON array has no incremental parser in the standard library, so it is
+    loaded in one go; send large batches as CSV or NDJSON. Raises
+    ``ValueError`` when the input itself cannot be read.
+    """
+    if fmt == "json":
+        data = json.load(stream)
+        if not isinstance(data, list):
+            raise ValueError("JSON import body must be an array of objects")
+        for position, item in enumerate(data, 1):
+            yield position, item if isinstance(item, dict) else "Row is not a JSON object"
+        return
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            for position, row in enumerate(csv.DictReader(text), 1):
+                if None in row:
+                    yield position, "Row has more cells than the header"
+                    continue
+                # Empty cells fall back to the schema default.
+                yield position, {key: value for key, value in row.items() if key and value not in ("", None)}
+            return
+        position = 0
+        for line in text:
+            if not line.strip():
+                continue
+            position += 1
+            try:
+                item = json.loads(line)
+            except ValueError as exc:
+                yield position, f"Invalid JSON: {exc}"
+                continue
+            yield position, item if isinstance(item, dict) else "Row is not a JSON object"
+    finally:
+        text.detach()  # leave the caller's stream open
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class BulkImporter:
+    """Validate and insert user / vehicle / pass batches chunk by chunk.
+
+    Records are validated as they are read and handed to the store's
+    ``bulk_create_*`` methods ``chunk_size`` at a time, so memory stays
+    bounded by one chunk and every chunk is a handful of statements rather
+    than several per row. Password hashes for a user chunk are computed in a
+    process pool first. A bad record only fails itself: it is reported by
+    position in ``BulkImportResult.errors`` and the batch carries on.
+    """
+
+    def __init__(self, store: Any, chunk_size: int, hash_workers: int) -> None:
+        self._store = store
+        self._chunk_size = max(1, chunk_size)
+        self._hash_workers = hash_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = Lock()
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._hash_workers < 2:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn, not fork: the server process is multi-threaded.
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(self._hash_workers, mp_context=context)
+            return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def import_users(self, stream: BinaryIO, fmt: ImportFormat) -> BulkImportResult:
+        def insert(rows: Sequence[UserImport]) -> List[Optional[str]]:
+            hashes = hash_passwords([row.password or DEFAULT_PASSWORD for row in rows], self._executor())
+            payloads = [UserCreate.model_construct(**row.model_dump(exclude={"password"})) for row in rows]
+            return self._store.bulk_create_users(payloads, hashes)
+
+        return self._run("users", iter_rows(stream, fmt), UserImport, insert)
+
+    def import_vehicles(self, stream: BinaryIO, fmt: ImportFormat) -> BulkImportResult:
+        return self._run("vehicles", iter_rows(stream, fmt), VehicleCreate, self._store.bulk_create_vehicles)
+
+    def import_passes(self, stream: BinaryIO, fmt: ImportFormat) -> BulkImportResult:
+        return self._run("passes", iter_rows(stream, fmt), PassCreate, self._store.bulk_create_passes)
+
+    def _run(
+        self,
+        entity: str,
+        rows: Iterator[SourceRow],
+        schema: Type[BaseModel],
+        insert: Callable[[List[Any]], List[Optional[str]]],
+    ) -> BulkImportResult:
+        received = created = 0
+        errors: List[BulkImportError] = []
+        chunk: List[Tuple[int, BaseModel]] = []
+
+        def flush() -> int:
+            try:
+                outcomes = insert([item for _, item in chunk])
+            except Exception as exc:
+                logger.error("Bulk {} import chunk of {} failed: {}", entity, len(chunk), exc)
+                outcomes = [f"Chunk insert failed: {exc}"] * len(chunk)
+            errors.extend(
+                BulkImportError(row=position, error=error) for (position, _), error in zip(chunk, outcomes) if error
+            )
+            done = sum(error is None for error in outcomes)
+            chunk.clear()
+            return done
+
+        try:
+            for position, raw in rows:
+                received += 1
+                if isinstance(raw, str):
+                    errors.append(BulkImportError(row=position, error=raw))
+                    continue
+                try:
+                    chunk.append((position, schema.model_validate(raw)))
+                except ValidationError as exc:
+                    errors.append(BulkImportError(row=position, error=_describe(exc)))
+                    continue
+                if len(chunk) >= self._chunk_size:
+                    created += flush()
+        except ValueError as exc:
+            # Unreadable input (bad encoding, broken JSON array): keep what
+            # was imported and report where reading stopped.
+            errors.append(BulkImportError(row=received + 1, error=f"Could not read input: {exc}"))
+        if chunk:
+            created += flush()
+        errors.sort(key=lambda error: error.row)
+        logger.info("Bulk {} import: {} received, {} created, {} failed", entity, received, created, len(errors))
+        return BulkImportResult(entity=entity, received=received, created=created, failed=len(errors), errors=errors)
+
+
+bulk_importer = BulkImporter(db, settings.import_chunk_size, settings.import_hash_workers)
+
+__all__ = ["BulkImporter", "ImportFormat", "bulk_importer", "detect_format", "iter_rows"]
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timezone
+from itertools import count
 from random import randint
 from threading import RLock
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
 from loguru import logger
@@ -62,26 +66,125 @@ from app.schemas import (
 
 from .cache import CacheKeys, redis_cache
 from .auth import auth_service
+from .mock_journal import MockJournal, WalRecord
+from .mock_records import (
+    AccessEventRecord,
+    ClientProfileRecord,
+    GuestSessionRecord,
+    ParkingVenueRecord,
+    PassRecord,
+    UserRecord,
+    VehicleRecord,
+    compact,
+    to_models,
+)
+from .pagination import PageQuery, ResolvedPage, finish_page, resolve_page
+from .plate_cache import plate_lookup_cache
+from .summary_cache import SUMMARY_COLLECTIONS, client_summary_cache
 from .touchngo import touchngo_gateway
 
+# Secondary index: lookup key -> insertion-ordered set of record ids.
+Index = Dict[str, Dict[str, None]]
+IndexSpec = Tuple[Index, Callable[[Any], Iterable[str]]]
+# Sort order for keyset pages: ascending ``(sort value, id)`` pairs.
+Order = List[Tuple[Any, str]]
+
+# Collections captured by snapshots / the WAL and the model each one holds
+# (``None`` = plain JSON values). List-valued collections hold lists of it.
+# Hot collections keep compact rows instead (``mock_records.RECORD_TYPES``).
+PERSISTED_COLLECTIONS: Dict[str, Any] = {
+    "users": User,
+    "vehicles": Vehicle,
+    "passes": Pass,
+    "access_events": AccessEvent,
+    "guest_sessions": GuestSession,
+    "payments": Payment,
+    "gates": Gate,
+    "client_registrations": ClientRegistration,
+    "client_profiles": ClientProfile,
+    "wallet_transactions": WalletTransaction,
+    "role_upgrades": RoleUpgradeRequest,
+    "parking_venues": ParkingVenueStatus,
+    "user_credentials": None,
+    "notifications": Notification,
+    "pass_applications": PassApplication,
+    "guest_rate": None,
+}
+ACCESS_EVENT_LIMIT = 200
+USER_LOCK_STRIPES = 64
+# Collections with their own leaf lock; everything else is either catalog
+# (``_lock``) or per-user state (``_user_lock``).
+LEAF_COLLECTIONS = ("guest_sessions", "payments", "access_events", "parking_venues", "guest_rate")
+# Rows read per step when walking a sort order; filtered pages may need several.
+PAGE_SCAN_CHUNK = 256
+
+
+def _index_add(index: Index, keys: Iterable[str], record_id: str) -> None:
+    for key in keys:
+        index.setdefault(key, {})[record_id] = None
+
+
+def _index_discard(index: Index, keys: Iterable[str], record_id: str) -> None:
+    for key in keys:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(record_id, None)
+            if not bucket:
+                del index[key]
 
-class MockDatabase:
-    """Small in-memory store to keep the prototype self-contained."""
 
-    def __init__(self) -> None:
+class MockDatabase:
+    """Small in-memory store to keep the prototype self-contained.
+
+    Collections are dicts keyed by id. Lookups by plate, owner, email, slug
+    and so on go through secondary indexes that every mutation keeps current
+    via ``_put`` / ``_drop``, so the gate hot path never scans a collection.
+    The ``page_*`` methods walk sorted ``(value, id)`` orders that are built
+    on first use and kept current the same way (``_order``).
+
+    Writers lock only what they touch, always in this order: ``_lock`` for
+    the catalog (users, vehicles, passes, applications, gates, credentials),
+    then a striped per-user lock (profile, registration, wallet,
+    notifications, role upgrades), then one leaf lock per collection in
+    ``LEAF_COLLECTIONS``. Readers take no lock: point lookups rely on
+    single dict operations being atomic, list endpoints return cached
+    immutable snapshots (``_snapshot``) rebuilt after a write, and
+    ``access_events`` / ``guest_rate`` are replaced rather than mutated.
+
+    Users, vehicles, passes, guest sessions, access events, parking venues
+    and client profiles are stored as slotted records (``mock_records``) and
+    converted to their schema with ``to_model`` on the way out. Counters and
+    flags (occupancy, wallet balance, paid) are written in place under the
+    owning lock; a lock-free reader may see such a write before its
+    neighbouring timestamp, never half a value. Any change to an indexed
+    field goes through ``_put`` with a fresh record.
+
+    With ``data_dir`` set the store is durable: every mutation is journaled
+    (``_put`` / ``_drop`` do it for indexed collections, ``_journal`` for the
+    rest) and ``checkpoint`` snapshots the lot. Startup restores the latest
+    snapshot plus the WAL tail instead of seeding.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None) -> None:
         self._lock = RLock()
-        self.users: Dict[str, User] = {}
-        self.vehicles: Dict[str, Vehicle] = {}
-        self.passes: Dict[str, Pass] = {}
-        self.access_events: List[AccessEvent] = []
-        self.guest_sessions: Dict[str, GuestSession] = {}
+        self._user_locks = tuple(RLock() for _ in range(USER_LOCK_STRIPES))
+        self._leaf_locks: Dict[str, RLock] = {collection: RLock() for collection in LEAF_COLLECTIONS}
+        self._versions: Dict[str, int] = {}
+        self._snapshots: Dict[str, Tuple[int, Tuple[Any, ...]]] = {}
+        self._clock = count(1)
+        self._wal: Optional[MockJournal] = None
+        self.users: Dict[str, UserRecord] = {}
+        self.vehicles: Dict[str, VehicleRecord] = {}
+        self.passes: Dict[str, PassRecord] = {}
+        self.access_events: List[AccessEventRecord] = []
+        self.guest_sessions: Dict[str, GuestSessionRecord] = {}
         self.payments: Dict[str, Payment] = {}
         self.gates: Dict[str, Gate] = {}
         self.client_registrations: Dict[str, ClientRegistration] = {}
-        self.client_profiles: Dict[str, ClientProfile] = {}
+        self.client_profiles: Dict[str, ClientProfileRecord] = {}
         self.wallet_transactions: Dict[str, List[WalletTransaction]] = {}
         self.role_upgrades: Dict[str, List[RoleUpgradeRequest]] = {}
-        self.parking_venues: Dict[str, ParkingVenueStatus] = {}
+        self.parking_venues: Dict[str, ParkingVenueRecord] = {}
         self.user_credentials: Dict[str, str] = {}
         self.notifications: Dict[str, List[Notification]] = {}
         self.pass_applications: Dict[str, PassApplication] = {}
@@ -89,8 +192,45 @@ class MockDatabase:
             "base_rate": settings.base_guest_rate,
             "per_minute_rate": settings.per_minute_guest_rate,
         }
-        self.seed()
+        self._vehicles_by_plate: Index = {}
+        self._vehicles_by_user: Index = {}
+        self._passes_by_user: Index = {}
+        self._applications_by_user: Index = {}
+        self._registrations_by_user: Index = {}
+        self._users_by_email: Index = {}
+        self._users_by_login: Index = {}
+        self._gates_by_slug: Index = {}
+        self._sessions_by_plate: Index = {}
+        self._upgrade_owners: Dict[str, str] = {}
+        self._index_specs: Dict[str, Tuple[IndexSpec, ...]] = {
+            "users": (
+                (self._users_by_email, lambda user: (user.email.lower(),)),
+                (self._users_by_login, lambda user: {user.email.lower(), user.name.lower(), user.id.lower()}),
+            ),
+            "vehicles": (
+                (self._vehicles_by_plate, lambda vehicle: (self._normalize_plate(vehicle.plate_text),)),
+                (self._vehicles_by_user, lambda vehicle: (vehicle.user_id,)),
+            ),
+            "passes": ((self._passes_by_user, lambda parking_pass: (parking_pass.user_id,)),),
+            "pass_applications": ((self._applications_by_user, lambda app: (app.user_id,)),),
+            "client_registrations": ((self._registrations_by_user, lambda registration: (registration.user_id,)),),
+            "gates": ((self._gates_by_slug, lambda gate: (gate.slug,)),),
+            "guest_sessions": ((self._sessions_by_plate, lambda session: (session.plate_text.upper(),)),),
+            "payments": (),
+        }
+        # Page filters answered from a secondary index rather than a sort order walk.
+        self._page_indexes: Dict[Tuple[str, str], Index] = {
+            ("vehicles", "user_id"): self._vehicles_by_user,
+            ("passes", "user_id"): self._passes_by_user,
+            ("pass_applications", "user_id"): self._applications_by_user,
+            ("guest_sessions", "plate_text"): self._sessions_by_plate,
+        }
+        self._orders: Dict[str, Dict[str, Order]] = {}
         self._guest_cache_ttl = 4 * 60 * 60  # 4 hours, covers long visitor stays
+        if data_dir:
+            self._open_journal(data_dir)
+        else:
+            self.seed()
 
     # ------------------------------------------------------------------
     # Helpers
@@ -123,10 +263,225 @@ class MockDatabase:
             status="pending",
             submitted_at=self._now(),
         )
-        self.pass_applications[app_id] = application
+        self._put("pass_applications", application)
         self._create_notification(user_id, "Pass application submitted. Await admin review.")
         return application
 
+    # ------------------------------------------------------------------
+    # Indexed collections
+    # ------------------------------------------------------------------
+    def _put(self, collection: str, record: Any) -> None:
+        """Insert or replace ``record`` in ``collection`` and keep its indexes current.
+
+        Models are stored as the collection's compact record type.
+        """
+        record = compact(collection, record)
+        table: Dict[str, Any] = getattr(self, collection)
+        previous = table.get(record.id)
+        table[record.id] = record
+        self._touch(collection)
+        self._reorder(collection, previous, record)
+        for index, keys in self._index_specs[collection]:
+            new_keys = keys(record)
+            if previous is not None:
+                old_keys = keys(previous)
+                if old_keys == new_keys:
+                    continue
+                _index_discard(index, old_keys, record.id)
+            _index_add(index, new_keys, record.id)
+        self._journal(collection, record.id, record)
+        if previous is not None and previous is not record:
+            self._summary_touched(collection, record.id, previous)  # e.g. a vehicle moved to another owner
+
+    def _drop(self, collection: str, record_id: str) -> Optional[Any]:
+        table: Dict[str, Any] = getattr(self, collection)
+        record = table.pop(record_id, None)
+        if record is not None:
+            self._touch(collection)
+            self._reorder(collection, record, None)
+            for index, keys in self._index_specs[collection]:
+                _index_discard(index, keys(record), record_id)
+            self._journal(collection, record_id, op="del")
+            self._summary_touched(collection, record_id, record)  # the del entry carries no record
+        return record
+
+    def _rebuild_indexes(self) -> None:
+        for collection, specs in self._index_specs.items():
+            for index, keys in specs:
+                index.clear()
+                for record in getattr(self, collection).values():
+                    _index_add(index, keys(record), record.id)
+        self._upgrade_owners = {
+            request.id: user_id for user_id, requests in self.role_upgrades.items() for request in requests
+        }
+        self._orders.clear()
+        for collection in PERSISTED_COLLECTIONS:
+            self._touch(collection)
+
+    def _lookup(self, collection: str, index: Index, key: str) -> Optional[Any]:
+        table: Dict[str, Any] = getattr(self, collection)
+        for record_id in list(index.get(key, ())):
+            record = table.get(record_id)
+            if record is not None:
+                return record
+        return None
+
+    def _lookup_all(self, collection: str, index: Index, key: str) -> List[Any]:
+        table: Dict[str, Any] = getattr(self, collection)
+        records = (table.get(record_id) for record_id in list(index.get(key, ())))
+        return [record for record in records if record is not None]
+
+    # ------------------------------------------------------------------
+    # Keyset pages
+    # ------------------------------------------------------------------
+    def _order(self, collection: str, sort: str) -> Order:
+        """Ascending ``(sort value, id)`` pairs of ``collection``.
+
+        Built on first use under the collection's writer lock, then kept
+        sorted by ``_put`` / ``_drop``. Readers only bisect and slice it.
+        """
+        orders = self._orders.setdefault(collection, {})
+        order = orders.get(sort)
+        if order is None:
+            with self._leaf_locks.get(collection, self._lock):
+                order = orders.get(sort)
+                if order is None:
+                    table: Dict[str, Any] = getattr(self, collection)
+                    order = sorted((getattr(record, sort), record.id) for record in table.values())
+                    orders[sort] = order
+        return order
+
+    def _reorder(self, collection: str, previous: Optional[Any], record: Optional[Any]) -> None:
+        orders = self._orders.get(collection)
+        if not orders:
+            return
+        for sort, order in list(orders.items()):
+            old_key = (getattr(previous, sort), previous.id) if previous is not None else None
+            new_key = (getattr(record, sort), record.id) if record is not None else None
+            if old_key == new_key:
+                continue
+            if old_key is not None:
+                pos = bisect_left(order, old_key)
+                if pos < len(order) and order[pos] == old_key:
+                    del order[pos]
+            if new_key is not None:
+                insort(order, new_key)
+
+    def _page(self, collection: str, query: PageQuery) -> Tuple[List[Any], Optional[str]]:
+        """One keyset page of raw rows (records or models) plus the next cursor."""
+        page = resolve_page(collection, query)
+        table: Dict[str, Any] = getattr(self, collection)
+        matches = self._page_matcher(page)
+
+        for name, value in page.filters.items():
+            index = self._page_indexes.get((collection, name))
+            if index is not None:
+                rows = [record for record in self._lookup_all(collection, index, str(value)) if matches(record)]
+                return finish_page(self._page_rows(rows, page), page)
+
+        sort, after = page.sort, page.after
+        order = self._order(collection, sort)
+        # Sorting on the windowed field: start the walk at the window's near
+        # edge and stop at its far one instead of filtering the whole order.
+        windowed = sort == page.range_field
+        near, far = (page.until, page.since) if page.descending else (page.since, page.until)
+        if windowed and near is not None:
+            edge = (near, "")  # sorts before every real id at that instant
+            if after is None or (after > edge if page.descending else after < edge):
+                after = edge
+        rows: List[Any] = []
+        while len(rows) <= page.limit:
+            # Re-bisect from the last key seen each step, so rows inserted or
+            # removed by a concurrent writer never shift the walk.
+            if page.descending:
+                end = bisect_left(order, after) if after is not None else len(order)
+                chunk = order[max(0, end - PAGE_SCAN_CHUNK):end]
+                if not chunk:
+                    break
+                after = chunk[0]
+                keys = reversed(chunk)
+            else:
+                start = bisect_right(order, after) if after is not None else 0
+                chunk = order[start:start + PAGE_SCAN_CHUNK]
+                if not chunk:
+                    break
+                after = chunk[-1]
+                keys = iter(chunk)
+            past_window = False
+            for value, record_id in keys:
+                if windowed and far is not None and (value < far if page.descending else value >= far):
+                    past_window = True
+                    break
+                record = table.get(record_id)
+                # Skip rows deleted or re-keyed since this slice was taken.
+                if record is None or getattr(record, sort) != value or not matches(record):
+                    continue
+                rows.append(record)
+                if len(rows) > page.limit:
+                    break
+            if past_window:
+                break
+        return finish_page(rows, page)
+
+    @staticmethod
+    def _page_matcher(page: ResolvedPage) -> Callable[[Any], bool]:
+        filters, range_field = page.filters, page.range_field
+        windowed = range_field is not None and (page.since is not None or page.until is not None)
+
+        def matches(record: Any) -> bool:
+            if windowed and not page.in_window(getattr(record, range_field)):
+                return False
+            return all(getattr(record, name) == value for name, value in filters.items())
+
+        return matches
+
+    @staticmethod
+    def _page_rows(rows: List[Any], page: ResolvedPage) -> List[Any]:
+        # Small candidate sets (one owner's rows, the capped event feed): sort them directly.
+        sort = page.sort
+
+        def position(record: Any) -> Tuple[Any, str]:
+            return (getattr(record, sort), record.id)
+
+        if page.after is not None:
+            after = page.after
+            rows = [row for row in rows if (position(row) < after if page.descending else position(row) > after)]
+        rows.sort(key=position, reverse=page.descending)
+        return rows[: page.limit + 1]
+
+    # ------------------------------------------------------------------
+    # Locks and snapshots
+    # ------------------------------------------------------------------
+    def _user_lock(self, user_id: str) -> RLock:
+        return self._user_locks[hash(user_id) % USER_LOCK_STRIPES]
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold every lock (in order) - for checkpoints, which need a quiescent store."""
+        with ExitStack() as stack:
+            for lock in (self._lock, *self._user_locks, *self._leaf_locks.values()):
+                stack.enter_context(lock)
+            yield
+
+    def _touch(self, collection: str) -> None:
+        """Invalidate the list snapshot of ``collection``; call after mutating it."""
+        self._versions[collection] = next(self._clock)
+
+    def _snapshot(self, collection: str) -> Tuple[Any, ...]:
+        """Immutable view of a dict collection, rebuilt only after a write.
+
+        Lock-free: copying a dict is a single step under the GIL, and the
+        version is read first, so a copy that raced with a writer is tagged
+        with the old version and simply rebuilt on the next call.
+        """
+        version = self._versions.get(collection, 0)
+        cached = self._snapshots.get(collection)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        records = tuple(getattr(self, collection).values())
+        self._snapshots[collection] = (version, records)
+        return records
+
     @staticmethod
     def _build_parking_venue(venue_id: str, name: str, capacity: int, occupied: int) -> ParkingVenueStatus:
         capacity = max(0, capacity)
@@ -134,20 +489,147 @@ class MockDatabase:
         percent = round((occupied / capacity) * 100, 1) if capacity else 0.0
         return ParkingVenueStatus(id=venue_id, name=name, capacity=capacity, occupied=occupied, percent=percent)
 
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _journal(self, collection: str, key: Optional[str] = None, value: Any = None, op: str = "set") -> None:
+        """Append a mutation to the WAL (a no-op for the volatile store).
+
+        Every write passes through here once it is visible, so this is also
+        where cached client summaries it changes are dropped.
+        """
+        if self._wal is not None:
+            self._wal.append(op, collection, key, value)
+        self._summary_touched(collection, key, value)
+
+    @staticmethod
+    def _summary_touched(collection: str, key: Optional[str], value: Any) -> None:
+        if collection not in SUMMARY_COLLECTIONS:
+            return
+        if collection == "guest_sessions":
+            client_summary_cache.invalidate_plate(getattr(value, "plate_text", None))
+        elif collection in ("users", "client_profiles", "wallet_transactions", "role_upgrades"):
+            client_summary_cache.invalidate(key)  # keyed by the owning user
+        else:
+            client_summary_cache.invalidate(getattr(value, "user_id", None))
+
+    def _open_journal(self, data_dir: str) -> None:
+        journal = MockJournal(data_dir, fsync_ms=settings.mock_wal_fsync_ms)
+        state, records = journal.recover()
+        with self._lock:
+            if state is None and not records:
+                self.seed()
+            else:
+                if state is not None:
+                    self._restore(state)
+                for record in records:
+                    self._replay(record)
+                self._rebuild_indexes()
+                logger.info("Restored mock store from {} ({} WAL records replayed)", data_dir, len(records))
+            journal.open()
+            self._wal = journal
+        if state is None or records:
+            # Fold the seed / replayed tail into a snapshot so the next start is quick.
+            self.checkpoint()
+
+    def _restore(self, state: Dict[str, Any]) -> None:
+        for collection in PERSISTED_COLLECTIONS:
+            if collection not in state:
+                continue
+            value = state[collection]
+            # Snapshots written before the compact records still hold models.
+            if isinstance(value, list):
+                value = [compact(collection, item) for item in value]
+            else:
+                value = {key: compact(collection, item) for key, item in value.items()}
+            setattr(self, collection, value)
+
+    def _replay(self, record: WalRecord) -> None:
+        _, op, collection, key, payload = record
+        model = PERSISTED_COLLECTIONS[collection]
+
+        def decode(value: Any) -> Any:
+            if model is None:
+                return value
+            if isinstance(value, list):
+                return [compact(collection, model.model_validate(item)) for item in value]
+            return compact(collection, model.model_validate(value))
+
+        table = getattr(self, collection)
+        if op == "set":
+            if key is None:
+                setattr(self, collection, decode(payload))
+            else:
+                table[key] = decode(payload)
+        elif op == "del":
+            table.pop(key, None)
+        elif op == "push":
+            target = table if key is None else table.setdefault(key, [])
+            target.insert(0, decode(payload))
+            if key is None:
+                del target[ACCESS_EVENT_LIMIT:]
+        else:
+            raise ValueError(f"Unknown WAL op {op!r}")
+
+    def _capture(self) -> Dict[str, Any]:
+        """Copy every persisted collection deep enough to pickle outside ``_lock``.
+
+        Only containers are copied. A record updated in place while the copy
+        is pickled may be saved with the newer value, but that write was
+        journaled after the cut, so replay lands on the same state.
+        """
+        state: Dict[str, Any] = {}
+        for collection in PERSISTED_COLLECTIONS:
+            value = getattr(self, collection)
+            if isinstance(value, list):
+                state[collection] = list(value)
+            else:
+                state[collection] = {
+                    key: list(item) if isinstance(item, list) else item for key, item in value.items()
+                }
+        return state
+
+    def checkpoint(self) -> None:
+        if self._wal is not None:
+            self._wal.checkpoint(self._capture, self._exclusive())
+
+    async def run_checkpoints(self, interval_seconds: float) -> None:
+        """Snapshot periodically, skipping rounds with nothing new in the WAL."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            if self._wal is None or not self._wal.appended:
+                continue
+            try:
+                await asyncio.to_thread(self.checkpoint)
+            except Exception as exc:  # pragma: no cover - keep the loop alive
+                logger.error("Mock store snapshot failed: {}", exc)
+
+    def close(self) -> None:
+        if self._wal is None:
+            return
+        if self._wal.appended:
+            self.checkpoint()
+        self._wal.close()
+        self._wal = None
+
     # ------------------------------------------------------------------
     # Seeds
     # ------------------------------------------------------------------
     def seed(self) -> None:
         with self._lock:
             logger.info("Seeding SmartGate demo data")
-            self.users = {user.id: user for user in seed.seed_users()}
-            self.vehicles = {vehicle.id: vehicle for vehicle in seed.seed_vehicles()}
-            self.passes = {p.id: p for p in seed.seed_passes()}
-            self.access_events = seed.seed_events()
-            self.guest_sessions = {session.id: session for session in seed.seed_guest_sessions()}
+            self.users = {user.id: UserRecord.from_model(user) for user in seed.seed_users()}
+            self.vehicles = {vehicle.id: VehicleRecord.from_model(vehicle) for vehicle in seed.seed_vehicles()}
+            self.passes = {p.id: PassRecord.from_model(p) for p in seed.seed_passes()}
+            self.access_events = [AccessEventRecord.from_model(event) for event in seed.seed_events()]
+            self.guest_sessions = {
+                session.id: GuestSessionRecord.from_model(session) for session in seed.seed_guest_sessions()
+            }
             self.payments = {payment.id: payment for payment in seed.seed_payments()}
             self.gates = {gate.id: gate for gate in seed.seed_gates()}
-            self.parking_venues = {venue.id: venue for venue in seed.seed_parking_venues()}
+            self.parking_venues = {
+                venue.id: ParkingVenueRecord.from_model(venue) for venue in seed.seed_parking_venues()
+            }
             self.client_registrations.clear()
             self.client_profiles.clear()
             self.wallet_transactions.clear()
@@ -156,6 +638,7 @@ class MockDatabase:
             self.pass_applications.clear()
             self._seed_client_profiles()
             self._seed_credentials()
+            self._rebuild_indexes()
 
     def _seed_client_profiles(self) -> None:
         now = self._now()
@@ -179,7 +662,7 @@ class MockDatabase:
                 updated_at=now,
             )
             self.client_registrations[registration_id] = registration
-            self.client_profiles[user.id] = profile
+            self.client_profiles[user.id] = ClientProfileRecord.from_model(profile)
             txn = WalletTransaction(
                 id=self._generate_id("TXN"),
                 user_id=user.id,
@@ -203,49 +686,65 @@ class MockDatabase:
     # Users CRUD
     # ------------------------------------------------------------------
     def list_users(self) -> List[User]:
-        enriched: List[User] = []
-        for user in self.users.values():
-            profile = self._ensure_client_profile(user.id)
-            enriched.append(user.model_copy(update={"wallet_balance": round(profile.wallet_balance, 2)}))
-        return enriched
+        return [self._with_wallet_balance(user) for user in self._snapshot("users")]
+
+    def page_users(self, query: PageQuery) -> Tuple[List[User], Optional[str]]:
+        users, cursor = self._page("users", query)
+        return [self._with_wallet_balance(user) for user in users], cursor
+
+    def _with_wallet_balance(self, user: UserRecord) -> User:
+        profile = self._ensure_client_profile(user.id)
+        return user.replace(wallet_balance=round(profile.wallet_balance, 2)).to_model()
 
     def get_user(self, user_id: str) -> Optional[User]:
-        return self.users.get(user_id)
+        user = self.users.get(user_id)
+        return user.to_model() if user else None
+
+    def get_users_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        found: Dict[str, User] = {}
+        for user_id in set(user_ids):
+            user = self.users.get(user_id)
+            if user is not None:
+                found[user_id] = user.to_model()
+        return found
 
     def create_user(self, payload: UserCreate) -> User:
+        hashed = auth_service.hash_password("password")  # slow; keep it outside the lock
         with self._lock:
             user_id = payload.id or self._generate_id("USR")
             user = User(id=user_id, **payload.model_dump(exclude={"id"}))
-            self.users[user.id] = user
-            self.user_credentials[user.id] = auth_service.hash_password("password")
+            self._put("users", user)
+            self.user_credentials[user.id] = hashed
+            self._journal("user_credentials", user.id, hashed)
             return user
 
     def update_user(self, user_id: str, payload: UserUpdate) -> User:
         with self._lock:
             if user_id not in self.users:
                 raise KeyError(user_id)
-            user = self.users[user_id]
-            updated = user.model_copy(update=payload.model_dump(exclude_unset=True))
-            self.users[user_id] = updated
-            return updated
+            updated = self.users[user_id].replace(**payload.model_dump(exclude_unset=True))
+            self._put("users", updated)
+            return updated.to_model()
 
     def delete_user(self, user_id: str) -> None:
         with self._lock:
             if user_id not in self.users:
                 raise KeyError(user_id)
-            self.users.pop(user_id)
-            vehicles_to_remove = [vid for vid, vehicle in self.vehicles.items() if vehicle.user_id == user_id]
-            for vid in vehicles_to_remove:
-                self.vehicles.pop(vid, None)
-            passes_to_remove = [pid for pid, parking_pass in self.passes.items() if parking_pass.user_id == user_id]
-            for pid in passes_to_remove:
-                self.passes.pop(pid, None)
+            self._drop("users", user_id)
+            for vid in list(self._vehicles_by_user.get(user_id, ())):
+                self._drop("vehicles", vid)
+            for pid in list(self._passes_by_user.get(user_id, ())):
+                self._drop("passes", pid)
 
     # ------------------------------------------------------------------
     # Vehicles CRUD
     # ------------------------------------------------------------------
     def list_vehicles(self) -> List[Vehicle]:
-        return list(self.vehicles.values())
+        return to_models(self._snapshot("vehicles"))
+
+    def page_vehicles(self, query: PageQuery) -> Tuple[List[Vehicle], Optional[str]]:
+        vehicles, cursor = self._page("vehicles", query)
+        return to_models(vehicles), cursor
 
     def create_vehicle(self, payload: VehicleCreate) -> Vehicle:
         with self._lock:
@@ -253,7 +752,8 @@ class MockDatabase:
                 raise KeyError(payload.user_id)
             vehicle_id = payload.id or self._generate_id("VEH")
             vehicle = Vehicle(id=vehicle_id, **payload.model_dump(exclude={"id"}))
-            self.vehicles[vehicle.id] = vehicle
+            self._put("vehicles", vehicle)
+            plate_lookup_cache.invalidate(vehicle.plate_text)
             return vehicle
 
     def update_vehicle(self, vehicle_id: str, payload: VehicleUpdate) -> Vehicle:
@@ -263,21 +763,26 @@ class MockDatabase:
             current = self.vehicles[vehicle_id]
             if payload.user_id and payload.user_id not in self.users:
                 raise KeyError(payload.user_id)
-            updated = current.model_copy(update=payload.model_dump(exclude_unset=True))
-            self.vehicles[vehicle_id] = updated
-            return updated
+            updated = current.replace(**payload.model_dump(exclude_unset=True))
+            self._put("vehicles", updated)
+            plate_lookup_cache.invalidate(updated.plate_text)
+            return updated.to_model()
 
     def delete_vehicle(self, vehicle_id: str) -> None:
         with self._lock:
             if vehicle_id not in self.vehicles:
                 raise KeyError(vehicle_id)
-            self.vehicles.pop(vehicle_id)
+            self._drop("vehicles", vehicle_id)
 
     # ------------------------------------------------------------------
     # Passes CRUD
     # ------------------------------------------------------------------
     def list_passes(self) -> List[Pass]:
-        return list(self.passes.values())
+        return to_models(self._snapshot("passes"))
+
+    def page_passes(self, query: PageQuery) -> Tuple[List[Pass], Optional[str]]:
+        passes, cursor = self._page("passes", query)
+        return to_models(passes), cursor
 
     def create_pass(self, payload: PassCreate) -> Pass:
         with self._lock:
@@ -296,7 +801,7 @@ class MockDatabase:
                 is_paid=False,
                 paid_at=None,
             )
-            self.passes[pass_id] = parking_pass
+            self._put("passes", parking_pass)
             self._create_notification(
                 payload.user_id,
                 f"{plan.label} pass issued. Pay RM {plan.price_rm:.2f} via wallet.",
@@ -329,28 +834,31 @@ class MockDatabase:
                     current.user_id,
                     f"{plan.label} pass updated. Pay RM {plan.price_rm:.2f} via wallet.",
                 )
-            updated = current.model_copy(update=fields)
-            self.passes[pass_id] = updated
-            return updated
+            updated = current.replace(**fields)
+            self._put("passes", updated)
+            return updated.to_model()
 
     def delete_pass(self, pass_id: str) -> None:
         with self._lock:
             if pass_id not in self.passes:
                 raise KeyError(pass_id)
-            self.passes.pop(pass_id)
+            self._drop("passes", pass_id)
 
     def get_latest_pass(self, user_id: str) -> Optional[Pass]:
-        passes = [parking_pass for parking_pass in self.passes.values() if parking_pass.user_id == user_id]
+        passes = self._lookup_all("passes", self._passes_by_user, user_id)
         if not passes:
             return None
-        return max(passes, key=lambda p: p.valid_to)
+        return max(passes, key=lambda p: p.valid_to).to_model()
 
     def list_pass_applications(self, status: Optional[str] = None) -> List[PassApplication]:
-        apps = list(self.pass_applications.values())
+        apps = list(self._snapshot("pass_applications"))
         if status:
             apps = [app for app in apps if app.status == status]
         return sorted(apps, key=lambda app: app.submitted_at, reverse=True)
 
+    def page_pass_applications(self, query: PageQuery) -> Tuple[List[PassApplication], Optional[str]]:
+        return self._page("pass_applications", query)
+
     def review_pass_application(self, app_id: str, payload: PassApplicationDecision) -> PassApplication:
         with self._lock:
             application = self.pass_applications.get(app_id)
@@ -367,7 +875,7 @@ class MockDatabase:
                     "reviewed_at": now,
                 }
             )
-            self.pass_applications[app_id] = updated
+            self._put("pass_applications", updated)
             if payload.status == "approved":
                 self.create_pass(
                     PassCreate(
@@ -381,6 +889,58 @@ class MockDatabase:
                 self._create_notification(application.user_id, payload.note or "Pass application rejected")
             return updated
 
+    # ------------------------------------------------------------------
+    # Bulk import
+    # ------------------------------------------------------------------
+    # Each call takes the catalog lock once for the whole chunk and returns
+    # one error message (or ``None`` for created) per payload, in order.
+    def bulk_create_users(self, payloads: Sequence[UserCreate], password_hashes: Sequence[str]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = []
+        with self._lock:
+            for payload, hashed in zip(payloads, password_hashes):
+                user_id = payload.id or self._generate_id("USR")
+                if user_id in self.users:
+                    errors.append(f"User {user_id} already exists")
+                elif self._find_user_by_email(payload.email):
+                    errors.append(f"Email {payload.email} already registered")
+                else:
+                    self._put("users", User(id=user_id, **payload.model_dump(exclude={"id"})))
+                    self.user_credentials[user_id] = hashed
+                    self._journal("user_credentials", user_id, hashed)
+                    errors.append(None)
+        return errors
+
+    def bulk_create_vehicles(self, payloads: Sequence[VehicleCreate]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = []
+        with self._lock:
+            for payload in payloads:
+                vehicle_id = payload.id or self._generate_id("VEH")
+                plate = self._normalize_plate(payload.plate_text)
+                if payload.user_id not in self.users:
+                    errors.append(f"Unknown user_id {payload.user_id}")
+                elif vehicle_id in self.vehicles:
+                    errors.append(f"Vehicle {vehicle_id} already exists")
+                elif plate in self._vehicles_by_plate:
+                    errors.append(f"Plate {plate} already registered")
+                else:
+                    self._put("vehicles", Vehicle(id=vehicle_id, **payload.model_dump(exclude={"id"})))
+                    plate_lookup_cache.invalidate(payload.plate_text)
+                    errors.append(None)
+        return errors
+
+    def bulk_create_passes(self, payloads: Sequence[PassCreate]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = []
+        with self._lock:
+            for payload in payloads:
+                if payload.user_id not in self.users:
+                    errors.append(f"Unknown user_id {payload.user_id}")
+                elif payload.id and payload.id in self.passes:
+                    errors.append(f"Pass {payload.id} already exists")
+                else:
+                    self.create_pass(payload)  # re-entrant; already holding _lock
+                    errors.append(None)
+        return errors
+
     # ------------------------------------------------------------------
     # Access events
     # ------------------------------------------------------------------
@@ -388,36 +948,46 @@ class MockDatabase:
         cached = redis_cache.list_json(CacheKeys.access_events(), limit)
         if cached:
             return [AccessEvent(**entry) for entry in cached]
-        return self.access_events[:limit]
+        return to_models(self.access_events[:limit])
+
+    def page_access_events(self, query: PageQuery) -> Tuple[List[AccessEvent], Optional[str]]:
+        page = resolve_page("access_events", query)
+        matches = self._page_matcher(page)
+        # The feed keeps at most ACCESS_EVENT_LIMIT events, so sort it directly.
+        rows = [event for event in self.access_events if matches(event)]
+        events, cursor = finish_page(self._page_rows(rows, page), page)
+        return to_models(events), cursor
 
     def add_access_event(self, payload: AccessEventBase) -> AccessEvent:
-        with self._lock:
-            event = AccessEvent(
-                id=self._generate_id("EVT"),
-                timestamp=self._now(),
-                **payload.model_dump(),
-            )
-            self.access_events.insert(0, event)
-            self.access_events = self.access_events[:200]
-            return event
+        event = AccessEvent(
+            id=self._generate_id("EVT"),
+            timestamp=self._now(),
+            **payload.model_dump(),
+        )
+        with self._leaf_locks["access_events"]:
+            # Replace, never mutate: list_access_events slices it without a lock.
+            record = AccessEventRecord.from_model(event)
+            self.access_events = [record, *self.access_events[: ACCESS_EVENT_LIMIT - 1]]
+            self._journal("access_events", None, event, op="push")
+        return event
 
     def find_user_by_plate(self, plate_text: str) -> Tuple[Optional[User], Optional[Vehicle]]:
-        normalized = self._normalize_plate(plate_text)
-        for vehicle in self.vehicles.values():
-            if self._normalize_plate(vehicle.plate_text) == normalized:
-                return self.users.get(vehicle.user_id), vehicle
-        return None, None
+        vehicle = self._lookup("vehicles", self._vehicles_by_plate, self._normalize_plate(plate_text))
+        if vehicle is None:
+            return None, None
+        user = self.users.get(vehicle.user_id)
+        return (user.to_model() if user else None), vehicle.to_model()
 
     # ------------------------------------------------------------------
     # Gates
     # ------------------------------------------------------------------
     def list_gates(self) -> List[Gate]:
-        return list(self.gates.values())
+        return list(self._snapshot("gates"))
 
     def create_gate(self, payload: GateCreate) -> Gate:
         with self._lock:
             slug = payload.slug.lower()
-            if any(gate.slug == slug for gate in self.gates.values()):
+            if slug in self._gates_by_slug:
                 raise ValueError(f"Gate slug {slug} already exists")
             gate_id = payload.id or self._generate_id("GTE")
             gate = Gate(
@@ -430,7 +1000,7 @@ class MockDatabase:
                 parking_venue_id=payload.parking_venue_id,
                 parking_direction=payload.parking_direction,
             )
-            self.gates[gate.id] = gate
+            self._put("gates", gate)
             return gate
 
     def update_gate(self, gate_id: str, payload: GateUpdate) -> Gate:
@@ -439,7 +1009,7 @@ class MockDatabase:
                 raise KeyError(gate_id)
             current = self.gates[gate_id]
             updated_slug = payload.slug.lower() if payload.slug else current.slug
-            if updated_slug != current.slug and any(g.slug == updated_slug for g in self.gates.values()):
+            if updated_slug != current.slug and updated_slug in self._gates_by_slug:
                 raise ValueError(f"Gate slug {updated_slug} already exists")
             updated = current.model_copy(
                 update={
@@ -447,30 +1017,30 @@ class MockDatabase:
                     "slug": updated_slug,
                 }
             )
-            self.gates[gate_id] = updated
+            self._put("gates", updated)
             return updated
 
     def delete_gate(self, gate_id: str) -> None:
         with self._lock:
             if gate_id not in self.gates:
                 raise KeyError(gate_id)
-            self.gates.pop(gate_id)
+            self._drop("gates", gate_id)
 
     def get_gate(self, gate_id: str) -> Optional[Gate]:
         return self.gates.get(gate_id)
 
     def get_gate_by_slug(self, slug: str) -> Optional[Gate]:
-        target = slug.lower()
-        for gate in self.gates.values():
-            if gate.slug == target:
-                return gate
-        return None
+        return self._lookup("gates", self._gates_by_slug, slug.lower())
 
     # ------------------------------------------------------------------
     # Guest sessions
     # ------------------------------------------------------------------
     def list_guest_sessions(self) -> List[GuestSession]:
-        return list(self.guest_sessions.values())
+        return to_models(self._snapshot("guest_sessions"))
+
+    def page_guest_sessions(self, query: PageQuery) -> Tuple[List[GuestSession], Optional[str]]:
+        sessions, cursor = self._page("guest_sessions", query)
+        return to_models(sessions), cursor
 
     def find_guest_session_by_plate(self, plate_text: str, status: Optional[str] = None) -> Optional[GuestSession]:
         normalized = plate_text.upper()
@@ -479,14 +1049,15 @@ class MockDatabase:
             session = GuestSession(**cached)
             if status is None or session.status == status:
                 return session
-        for session in self.guest_sessions.values():
-            if session.plate_text.upper() == normalized and (status is None or session.status == status):
+        for record in self._lookup_all("guest_sessions", self._sessions_by_plate, normalized):
+            if status is None or record.status == status:
+                session = record.to_model()
                 self._cache_guest_session(session)
                 return session
         return None
 
     def open_guest_session(self, payload: GuestSessionCreate) -> GuestSession:
-        with self._lock:
+        with self._leaf_locks["guest_sessions"]:
             session_id = self._generate_id("GST")
             session = GuestSession(
                 id=session_id,
@@ -494,13 +1065,13 @@ class MockDatabase:
                 start_time=self._now(),
                 status="open",
             )
-            self.guest_sessions[session.id] = session
+            self._put("guest_sessions", session)
             self._cache_guest_session(session)
             return session
 
     def close_guest_session(self, session_id: str) -> GuestSession:
-        with self._lock:
-            session = self._require_guest_session(session_id)
+        with self._leaf_locks["guest_sessions"]:
+            session = self._require_guest_session(session_id).to_model()
             if session.status == "open":
                 end_time = self._now()
                 minutes = max(1, int((end_time - session.start_time).total_seconds() // 60))
@@ -511,13 +1082,13 @@ class MockDatabase:
                     "fee": round(fee, 2),
                     "status": "closed",
                 })
-                self.guest_sessions[session_id] = session
+                self._put("guest_sessions", session)
                 self._cache_guest_session(session)
             return session
 
     def pay_guest_session(self, payload: GuestPaymentRequest) -> Payment:
-        with self._lock:
-            session = self._require_guest_session(payload.session_id)
+        with self._leaf_locks["guest_sessions"]:
+            session = self._require_guest_session(payload.session_id).to_model()
             minutes = session.minutes or max(1, int((self._now() - session.start_time).total_seconds() // 60))
             fee = payload.amount or session.fee or self.compute_guest_fee(minutes)
             session = session.model_copy(
@@ -528,7 +1099,7 @@ class MockDatabase:
                     "status": "paid",
                 }
             )
-            self.guest_sessions[session.id] = session
+            self._put("guest_sessions", session)
             charge = None
             processor = "wallet" if payload.payment_source == "wallet" else "touchngo"
             reference = None
@@ -550,20 +1121,23 @@ class MockDatabase:
             return payment
 
     def list_payments(self) -> List[Payment]:
-        return list(self.payments.values())
+        return list(self._snapshot("payments"))
+
+    def page_payments(self, query: PageQuery) -> Tuple[List[Payment], Optional[str]]:
+        return self._page("payments", query)
 
     def get_guest_rate(self) -> GuestRateResponse:
         return GuestRateResponse(**self.guest_rate)
 
     def update_guest_rate(self, payload: GuestRateUpdate) -> GuestRateResponse:
-        with self._lock:
-            self.guest_rate.update(payload.model_dump())
+        with self._leaf_locks["guest_rate"]:
+            self.guest_rate = {**self.guest_rate, **payload.model_dump()}
+            self._journal("guest_rate", None, self.guest_rate)
             return self.get_guest_rate()
 
     def compute_guest_fee(self, minutes: int) -> float:
-        base = self.guest_rate["base_rate"]
-        per_minute = self.guest_rate["per_minute_rate"]
-        return base + per_minute * max(0, minutes)
+        rate = self.guest_rate
+        return rate["base_rate"] + rate["per_minute_rate"] * max(0, minutes)
 
     # ------------------------------------------------------------------
     # Client portal / mobile flows
@@ -574,10 +1148,10 @@ class MockDatabase:
         with self._lock:
             existing = self._find_user_by_email(payload.email)
             if existing:
-                user = existing
+                user = existing.to_model()
                 if payload.role != "guest" and existing.role != payload.role:
-                    user = existing.model_copy(update={"role": payload.role})
-                    self.users[user.id] = user
+                    user = user.model_copy(update={"role": payload.role})
+                    self._put("users", user)
             else:
                 user = User(
                     id=self._generate_id("USR"),
@@ -587,42 +1161,45 @@ class MockDatabase:
                     role=payload.role,
                     programme=payload.programme,
                 )
-                self.users[user.id] = user
-            registration = self._ensure_client_registration(user.id, status="pending")
-            profile = self._ensure_client_profile(user.id, default_status="pending")
-            profile = profile.model_copy(update={"status": "pending", "updated_at": self._now()})
-            self.client_profiles[user.id] = profile
-            parking_pass = next((p for p in self.passes.values() if p.user_id == user.id), None)
+                self._put("users", user)
+            with self._user_lock(user.id):
+                registration = self._ensure_client_registration(user.id, status="pending")
+                record = self._ensure_client_profile(user.id, default_status="pending")
+                record.updated_at = self._now()
+                record.status = "pending"
+                self._journal("client_profiles", user.id, record)
+                profile = record.to_model()
+            parking_pass = self._lookup("passes", self._passes_by_user, user.id)
+            pass_info = parking_pass.to_model() if parking_pass else None
             application = self._create_pass_application(user.id, payload.role, payload.plan_type, payload.vehicles)
-            existing_plates: set[str] = set()
-            for vehicle in self.vehicles.values():
-                normalized_plate = self._normalize_plate(vehicle.plate_text)
-                if normalized_plate:
-                    existing_plates.add(normalized_plate)
             for plate in payload.vehicles:
                 normalized = self._normalize_plate(plate)
-                if not normalized or normalized in existing_plates:
+                if not normalized or normalized in self._vehicles_by_plate:
                     continue
                 vehicle = Vehicle(
                     id=self._generate_id("VEH"),
                     plate_text=normalized,
                     user_id=user.id,
                 )
-                self.vehicles[vehicle.id] = vehicle
-                existing_plates.add(normalized)
-            vehicles = [vehicle for vehicle in self.vehicles.values() if vehicle.user_id == user.id]
+                self._put("vehicles", vehicle)
+                plate_lookup_cache.invalidate(normalized)
+            vehicles = to_models(self._lookup_all("vehicles", self._vehicles_by_user, user.id))
             registration = registration.model_copy(update={"status": "pending"})
-            self.client_registrations[registration.id] = registration
+            with self._user_lock(user.id):
+                self._put("client_registrations", registration)
         return ClientRegistrationResponse(
             registration=registration,
             profile=profile,
             user=user,
-            pass_info=parking_pass,
+            pass_info=pass_info,
             vehicles=vehicles,
             pass_application=application,
         )
 
     def signup_portal_user(self, payload: SignupRequest) -> AuthResponse:
+        if self._find_user_by_email(payload.email):
+            raise ValueError("Email already registered")
+        hashed = auth_service.hash_password(payload.password)  # slow; keep it outside the lock
         with self._lock:
             if self._find_user_by_email(payload.email):
                 raise ValueError("Email already registered")
@@ -634,32 +1211,28 @@ class MockDatabase:
                 role="guest",
                 programme=payload.programme,
             )
-            self.users[user.id] = user
-            self.user_credentials[user.id] = auth_service.hash_password(payload.password)
+            self._put("users", user)
+            self.user_credentials[user.id] = hashed
+            self._journal("user_credentials", user.id, hashed)
             self._ensure_client_profile(user.id, default_status="pending")
             token = auth_service.create_token({"user_id": user.id})
             return AuthResponse(token=token, user=user)
 
     def login_portal_user(self, payload: LoginRequest) -> AuthResponse:
-        identifier = payload.identifier.lower()
-        target: Optional[User] = None
-        for user in self.users.values():
-            if user.email.lower() == identifier or user.name.lower() == identifier or user.id.lower() == identifier:
-                target = user
-                break
+        target: Optional[User] = self._lookup("users", self._users_by_login, payload.identifier.lower())
         if not target:
             raise ValueError("User not found")
         hashed = self.user_credentials.get(target.id)
         if not hashed or not auth_service.verify_password(payload.password, hashed):
             raise ValueError("Invalid credentials")
         token = auth_service.create_token({"user_id": target.id})
-        return AuthResponse(token=token, user=target)
+        return AuthResponse(token=token, user=target.to_model())
 
     def get_client_summary(self, user_id: str) -> ClientSummary:
-        with self._lock:
+        with self._user_lock(user_id):
             user = self._require_user(user_id)
-            pass_info = next((p for p in self.passes.values() if p.user_id == user_id), None)
-            vehicles = [vehicle for vehicle in self.vehicles.values() if vehicle.user_id == user_id]
+            pass_info = self._lookup("passes", self._passes_by_user, user_id)
+            vehicles = self._lookup_all("vehicles", self._vehicles_by_user, user_id)
             profile = self._ensure_client_profile(
                 user_id,
                 default_status="active" if user.role != "guest" else "pending",
@@ -668,15 +1241,15 @@ class MockDatabase:
             guest_sessions = self._guest_sessions_for_user(vehicles)
             upgrades = list(self.role_upgrades.get(user_id, []))
             applications = sorted(
-                (app for app in self.pass_applications.values() if app.user_id == user_id),
+                self._lookup_all("pass_applications", self._applications_by_user, user_id),
                 key=lambda app: app.submitted_at,
                 reverse=True,
             )
             return ClientSummary(
-                user=user,
-                pass_info=pass_info,
-                vehicles=vehicles,
-                profile=profile,
+                user=user.to_model(),
+                pass_info=pass_info.to_model() if pass_info else None,
+                vehicles=to_models(vehicles),
+                profile=profile.to_model(),
                 wallet=wallet,
                 guest_sessions=guest_sessions,
                 role_upgrades=upgrades,
@@ -684,7 +1257,7 @@ class MockDatabase:
             )
 
     def wallet_top_up(self, user_id: str, payload: WalletTopUpRequest) -> ClientWalletActivity:
-        with self._lock:
+        with self._user_lock(user_id):
             self._require_user(user_id)
             charge = touchngo_gateway.charge_wallet_top_up(user_id=user_id, amount_rm=payload.amount)
             txn = self._apply_wallet_delta(
@@ -704,12 +1277,12 @@ class MockDatabase:
             return self._wallet_activity(user_id)
 
     def get_wallet_activity(self, user_id: str) -> ClientWalletActivity:
-        with self._lock:
+        with self._user_lock(user_id):
             self._require_user(user_id)
             return self._wallet_activity(user_id)
 
     def submit_role_upgrade(self, user_id: str, payload: RoleUpgradeSubmit) -> RoleUpgradeRequest:
-        with self._lock:
+        with self._user_lock(user_id):
             self._require_user(user_id)
             request = RoleUpgradeRequest(
                 id=self._generate_id("URQ"),
@@ -722,30 +1295,28 @@ class MockDatabase:
                 reviewed_at=None,
             )
             self.role_upgrades.setdefault(user_id, []).insert(0, request)
+            self._journal("role_upgrades", user_id, request, op="push")
+            self._upgrade_owners[request.id] = user_id
             profile = self._ensure_client_profile(user_id)
-            self.client_profiles[user_id] = profile.model_copy(update={"status": "pending", "updated_at": self._now()})
+            profile.updated_at = self._now()
+            profile.status = "pending"
+            self._journal("client_profiles", user_id, profile)
             return request
 
     def list_role_upgrades(self, status: Optional[str] = None) -> List[RoleUpgradeRequest]:
-        with self._lock:
-            requests = [req for bucket in self.role_upgrades.values() for req in bucket]
-            if status:
-                requests = [req for req in requests if req.status == status]
-            return sorted(requests, key=lambda req: req.submitted_at, reverse=True)
+        requests = [req for bucket in list(self.role_upgrades.values()) for req in tuple(bucket)]
+        if status:
+            requests = [req for req in requests if req.status == status]
+        return sorted(requests, key=lambda req: req.submitted_at, reverse=True)
 
     def review_role_upgrade(self, request_id: str, payload: RoleUpgradeDecision) -> RoleUpgradeRequest:
-        with self._lock:
-            target: Optional[RoleUpgradeRequest] = None
-            owner_id: Optional[str] = None
-            for user_id, requests in self.role_upgrades.items():
-                for idx, req in enumerate(requests):
-                    if req.id == request_id:
-                        target = req
-                        owner_id = user_id
-                        break
-                if target:
-                    break
-            if not target or not owner_id:
+        owner_id = self._upgrade_owners.get(request_id)
+        if not owner_id:
+            raise KeyError(request_id)
+        with self._lock, self._user_lock(owner_id):
+            candidates = self.role_upgrades.get(owner_id, [])
+            target: Optional[RoleUpgradeRequest] = next((req for req in candidates if req.id == request_id), None)
+            if not target:
                 raise KeyError(request_id)
             now = self._now()
             target = target.model_copy(
@@ -757,15 +1328,14 @@ class MockDatabase:
             )
             requests = self.role_upgrades[owner_id]
             self.role_upgrades[owner_id] = [target if req.id == request_id else req for req in requests]
+            self._journal("role_upgrades", owner_id, self.role_upgrades[owner_id])
             if payload.status == "approved":
                 user = self.users.get(owner_id)
                 if user:
-                    upgraded = user.model_copy(update={"role": target.target_role})
-                    self.users[owner_id] = upgraded
-                for idx, existing in enumerate(self.passes.values()):
-                    if existing.user_id == owner_id:
-                        self.passes[existing.id] = existing.model_copy(update={"role": target.target_role})
-                        break
+                    self._put("users", user.replace(role=target.target_role))
+                existing = self._lookup("passes", self._passes_by_user, owner_id)
+                if existing:
+                    self._put("passes", existing.replace(role=target.target_role))
             message = (
                 f"Role upgrade request {target.target_role} {payload.status.upper()}"
                 if not payload.note
@@ -775,27 +1345,28 @@ class MockDatabase:
             return target
 
     def get_parking_overview(self) -> ParkingOverview:
-        with self._lock:
-            venues: List[ParkingVenueStatus] = []
-            for venue in self.parking_venues.values():
-                percent = round((venue.occupied / venue.capacity) * 100, 1) if venue.capacity else 0.0
-                venues.append(venue.model_copy(update={"percent": percent}))
-            return ParkingOverview(venues=venues)
+        venues: List[ParkingVenueStatus] = []
+        for venue in self._snapshot("parking_venues"):
+            percent = round((venue.occupied / venue.capacity) * 100, 1) if venue.capacity else 0.0
+            venues.append(venue.replace(percent=percent).to_model())
+        return ParkingOverview(venues=venues)
 
     def list_parking_venues(self) -> List[ParkingVenueStatus]:
-        return list(self.parking_venues.values())
+        return to_models(self._snapshot("parking_venues"))
 
     def create_parking_venue(self, payload: ParkingVenueCreate) -> ParkingVenueStatus:
-        with self._lock:
+        with self._leaf_locks["parking_venues"]:
             venue_id = payload.id or self._generate_id("VEN")
             if venue_id in self.parking_venues:
                 raise ValueError(f"Venue {venue_id} already exists")
             venue = self._build_parking_venue(venue_id, payload.name, payload.capacity, payload.occupied)
-            self.parking_venues[venue_id] = venue
+            self.parking_venues[venue_id] = ParkingVenueRecord.from_model(venue)
+            self._touch("parking_venues")
+            self._journal("parking_venues", venue_id, venue)
             return venue
 
     def update_parking_venue(self, venue_id: str, payload: ParkingVenueUpdate) -> ParkingVenueStatus:
-        with self._lock:
+        with self._leaf_locks["parking_venues"]:
             venue = self.parking_venues.get(venue_id)
             if not venue:
                 raise KeyError(venue_id)
@@ -803,35 +1374,38 @@ class MockDatabase:
             capacity = payload.capacity if payload.capacity is not None else venue.capacity
             occupied = payload.occupied if payload.occupied is not None else venue.occupied
             updated = self._build_parking_venue(venue_id, name, capacity, occupied)
-            self.parking_venues[venue_id] = updated
+            self.parking_venues[venue_id] = ParkingVenueRecord.from_model(updated)
+            self._touch("parking_venues")
+            self._journal("parking_venues", venue_id, updated)
             return updated
 
     def delete_parking_venue(self, venue_id: str) -> None:
-        with self._lock:
+        with self._lock, self._leaf_locks["parking_venues"]:
             if venue_id not in self.parking_venues:
                 raise KeyError(venue_id)
             self.parking_venues.pop(venue_id, None)
+            self._touch("parking_venues")
+            self._journal("parking_venues", venue_id, op="del")
             for gate_id, gate in list(self.gates.items()):
                 if gate.parking_venue_id == venue_id:
-                    self.gates[gate_id] = gate.model_copy(update={"parking_venue_id": None, "parking_direction": None})
+                    self._put("gates", gate.model_copy(update={"parking_venue_id": None, "parking_direction": None}))
 
     def record_parking_event(self, payload: ParkingEventRequest) -> ParkingVenueStatus:
-        with self._lock:
+        with self._leaf_locks["parking_venues"]:
             venue = self.parking_venues.get(payload.venue_id)
             if not venue:
                 raise KeyError(payload.venue_id)
             delta = 1 if payload.direction == "entry" else -1
             occupied = max(0, min(venue.capacity, venue.occupied + delta))
-            percent = round((occupied / venue.capacity) * 100, 1) if venue.capacity else 0.0
-            updated = venue.model_copy(update={"occupied": occupied, "percent": percent})
-            self.parking_venues[venue.id] = updated
-            return updated
+            venue.occupied = occupied
+            venue.percent = round((occupied / venue.capacity) * 100, 1) if venue.capacity else 0.0
+            self._journal("parking_venues", venue.id, venue)
+            return venue.to_model()
 
     def lookup_guest_session(self, session_id: Optional[str] = None, plate_text: Optional[str] = None) -> GuestSessionLookupResponse:
         if not session_id and not plate_text:
             raise KeyError("guest_session_lookup_requires_identifier")
-        with self._lock:
-            return self._resolve_guest_session(session_id=session_id, plate_text=plate_text)
+        return self._resolve_guest_session(session_id=session_id, plate_text=plate_text)
 
     def client_pay_guest_session(self, payload: ClientGuestPaymentRequest) -> Payment:
         if not payload.session_id:
@@ -839,17 +1413,16 @@ class MockDatabase:
         amount_to_pay: Optional[float] = None
         if payload.payment_source == "wallet" and not payload.user_id:
             raise ValueError("user_id required for wallet payments")
-        with self._lock:
-            lookup = self._resolve_guest_session(session_id=payload.session_id, plate_text=None)
-            amount_to_pay = round(payload.amount or lookup.amount_due, 2)
-            if payload.payment_source == "wallet" and payload.user_id:
-                self._apply_wallet_delta(
-                    payload.user_id,
-                    delta=-amount_to_pay,
-                    txn_type="guest_payment",
-                    description=f"Guest session {payload.session_id}",
-                    source="wallet",
-                )
+        lookup = self._resolve_guest_session(session_id=payload.session_id, plate_text=None)
+        amount_to_pay = round(payload.amount or lookup.amount_due, 2)
+        if payload.payment_source == "wallet" and payload.user_id:
+            self._apply_wallet_delta(
+                payload.user_id,
+                delta=-amount_to_pay,
+                txn_type="guest_payment",
+                description=f"Guest session {payload.session_id}",
+                source="wallet",
+            )
         return self.pay_guest_session(
             GuestPaymentRequest(
                 session_id=payload.session_id,
@@ -861,7 +1434,7 @@ class MockDatabase:
     # ------------------------------------------------------------------
     # Utilities
     # ------------------------------------------------------------------
-    def _require_guest_session(self, session_id: str) -> GuestSession:
+    def _require_guest_session(self, session_id: str) -> GuestSessionRecord:
         if session_id not in self.guest_sessions:
             raise KeyError(session_id)
         return self.guest_sessions[session_id]
@@ -873,50 +1446,62 @@ class MockDatabase:
             redis_cache.set_json(key, session.model_dump(mode="json"), ttl=ttl)
         else:
             redis_cache.delete(key)
+            plate_lookup_cache.invalidate(session.plate_text)
 
-    def _require_user(self, user_id: str) -> User:
+    def _require_user(self, user_id: str) -> UserRecord:
         user = self.users.get(user_id)
         if not user:
             raise KeyError(user_id)
         return user
 
-    def _find_user_by_email(self, email: str) -> Optional[User]:
-        target = email.lower()
-        for user in self.users.values():
-            if user.email.lower() == target:
-                return user
-        return None
+    def _find_user_by_email(self, email: str) -> Optional[UserRecord]:
+        return self._lookup("users", self._users_by_email, email.lower())
 
     def _ensure_client_registration(self, user_id: str, status: str = "pending") -> ClientRegistration:
-        for registration in self.client_registrations.values():
-            if registration.user_id == user_id:
-                return registration
+        existing = self._lookup("client_registrations", self._registrations_by_user, user_id)
+        if existing:
+            return existing
+        with self._user_lock(user_id):
+            return self._lookup("client_registrations", self._registrations_by_user, user_id) or self._new_registration(
+                user_id, status
+            )
+
+    def _new_registration(self, user_id: str, status: str) -> ClientRegistration:
         registration = ClientRegistration(
             id=self._generate_id("REG"),
             user_id=user_id,
             status=status,
             submitted_at=self._now(),
         )
-        self.client_registrations[registration.id] = registration
+        self._put("client_registrations", registration)
         return registration
 
-    def _ensure_client_profile(self, user_id: str, default_status: str = "pending") -> ClientProfile:
+    def _ensure_client_profile(self, user_id: str, default_status: str = "pending") -> ClientProfileRecord:
         profile = self.client_profiles.get(user_id)
         if profile:
             return profile
+        with self._user_lock(user_id):
+            return self.client_profiles.get(user_id) or self._new_client_profile(user_id, default_status)
+
+    def _new_client_profile(self, user_id: str, default_status: str) -> ClientProfileRecord:
         registration = self._ensure_client_registration(user_id, status=default_status)
         now = self._now()
-        profile = ClientProfile(
-            user_id=user_id,
-            registration_id=registration.id,
-            status=default_status,
-            guest_pin=f"{randint(1000, 9999)}",
-            wallet_balance=0.0,
-            created_at=now,
-            updated_at=now,
+        profile = ClientProfileRecord.from_model(
+            ClientProfile(
+                user_id=user_id,
+                registration_id=registration.id,
+                status=default_status,
+                guest_pin=f"{randint(1000, 9999)}",
+                wallet_balance=0.0,
+                created_at=now,
+                updated_at=now,
+            )
         )
         self.client_profiles[user_id] = profile
-        self.wallet_transactions.setdefault(user_id, [])
+        self._journal("client_profiles", user_id, profile)
+        if user_id not in self.wallet_transactions:
+            self.wallet_transactions[user_id] = []
+            self._journal("wallet_transactions", user_id, [])
         return profile
 
     def _wallet_snapshot(self, user_id: str) -> ClientWallet:
@@ -932,7 +1517,7 @@ class MockDatabase:
 
     def _wallet_activity(self, user_id: str) -> ClientWalletActivity:
         wallet = self._wallet_snapshot(user_id)
-        transactions = list(self.wallet_transactions.get(user_id, []))[:20]
+        transactions = self.wallet_transactions.get(user_id, [])[:20]
         return ClientWalletActivity(wallet=wallet, transactions=transactions)
 
     def _record_payment(
@@ -955,7 +1540,8 @@ class MockDatabase:
             pass_id=pass_id,
             reference=reference,
         )
-        self.payments[payment.id] = payment
+        with self._leaf_locks["payments"]:
+            self._put("payments", payment)
         return payment
 
     def _apply_wallet_delta(
@@ -967,33 +1553,36 @@ class MockDatabase:
         description: str,
         source: str,
     ) -> WalletTransaction:
-        profile = self._ensure_client_profile(user_id)
-        new_balance = round(profile.wallet_balance + delta, 2)
-        if new_balance < -1e-6:
-            raise ValueError("Insufficient wallet balance")
-        profile = profile.model_copy(update={"wallet_balance": new_balance, "updated_at": self._now()})
-        self.client_profiles[user_id] = profile
-        transaction = WalletTransaction(
-            id=self._generate_id("TXN"),
-            user_id=user_id,
-            amount=round(delta, 2),
-            type=txn_type,  # type: ignore[arg-type]
-            description=description,
-            timestamp=self._now(),
-            source=source,
-        )
-        self.wallet_transactions.setdefault(user_id, []).insert(0, transaction)
-        return transaction
+        with self._user_lock(user_id):
+            profile = self._ensure_client_profile(user_id)
+            new_balance = round(profile.wallet_balance + delta, 2)
+            if new_balance < -1e-6:
+                raise ValueError("Insufficient wallet balance")
+            profile.updated_at = self._now()
+            profile.wallet_balance = new_balance
+            self._journal("client_profiles", user_id, profile)
+            transaction = WalletTransaction(
+                id=self._generate_id("TXN"),
+                user_id=user_id,
+                amount=round(delta, 2),
+                type=txn_type,  # type: ignore[arg-type]
+                description=description,
+                timestamp=self._now(),
+                source=source,
+            )
+            self.wallet_transactions.setdefault(user_id, []).insert(0, transaction)
+            self._journal("wallet_transactions", user_id, transaction, op="push")
+            return transaction
 
     def pay_pass_invoice(self, user_id: str, pass_id: str) -> Pass:
-        with self._lock:
+        with self._lock, self._user_lock(user_id):
             if pass_id not in self.passes:
                 raise KeyError(pass_id)
             parking_pass = self.passes[pass_id]
             if parking_pass.user_id != user_id:
                 raise ValueError("Pass does not belong to user")
             if parking_pass.is_paid:
-                return parking_pass
+                return parking_pass.to_model()
             price = parking_pass.price_rm
             txn = self._apply_wallet_delta(
                 user_id,
@@ -1002,8 +1591,10 @@ class MockDatabase:
                 description=f"Pass {parking_pass.plan_type}",
                 source="wallet",
             )
-            paid_pass = parking_pass.model_copy(update={"is_paid": True, "paid_at": self._now()})
-            self.passes[pass_id] = paid_pass
+            # paid_at first: a reader that sees is_paid also sees when.
+            parking_pass.paid_at = self._now()
+            parking_pass.is_paid = True
+            self._journal("passes", pass_id, parking_pass)
             self._record_payment(
                 amount=price,
                 processor="wallet",
@@ -1011,22 +1602,20 @@ class MockDatabase:
                 pass_id=pass_id,
             )
             self._create_notification(user_id, f"Pass payment received: RM {price:.2f}")
-            return paid_pass
+            return parking_pass.to_model()
 
-    def _guest_sessions_for_user(self, vehicles: List[Vehicle]) -> List[GuestSession]:
+    def _guest_sessions_for_user(self, vehicles: List[VehicleRecord]) -> List[GuestSession]:
         plates = {vehicle.plate_text.upper() for vehicle in vehicles}
-        if not plates:
-            return []
-        sessions: List[GuestSession] = []
-        for session in self.guest_sessions.values():
-            if session.plate_text.upper() in plates:
-                sessions.append(session)
-        return sorted(sessions, key=lambda s: s.start_time, reverse=True)
+        sessions: List[GuestSessionRecord] = []
+        for plate in plates:
+            sessions.extend(self._lookup_all("guest_sessions", self._sessions_by_plate, plate))
+        return to_models(sorted(sessions, key=lambda s: s.start_time, reverse=True))
 
     def _resolve_guest_session(self, session_id: Optional[str], plate_text: Optional[str]) -> GuestSessionLookupResponse:
         session: Optional[GuestSession] = None
         if session_id:
-            session = self.guest_sessions.get(session_id)
+            record = self.guest_sessions.get(session_id)
+            session = record.to_model() if record else None
         if not session and plate_text:
             session = self.find_guest_session_by_plate(plate_text, status=None)
         if not session:
@@ -1037,17 +1626,19 @@ class MockDatabase:
         return GuestSessionLookupResponse(session=session, amount_due=round(fee, 2))
 
     def list_notifications(self, user_id: str) -> List[Notification]:
-        notes = self.notifications.get(user_id, [])
+        notes = tuple(self.notifications.get(user_id, ()))
         return sorted(notes, key=lambda note: note.created_at, reverse=True)
 
     def acknowledge_notification(self, user_id: str, notification_id: str) -> Notification:
-        notes = self.notifications.get(user_id, [])
-        for idx, note in enumerate(notes):
-            if note.id == notification_id:
-                updated = note.model_copy(update={"is_read": True})
-                notes[idx] = updated
-                return updated
-        raise KeyError(notification_id)
+        with self._user_lock(user_id):
+            notes = self.notifications.get(user_id, [])
+            for idx, note in enumerate(notes):
+                if note.id == notification_id:
+                    updated = note.model_copy(update={"is_read": True})
+                    notes[idx] = updated
+                    self._journal("notifications", user_id, notes)
+                    return updated
+            raise KeyError(notification_id)
 
     def _create_notification(self, user_id: str, message: str) -> Notification:
         note = Notification(
@@ -1057,13 +1648,26 @@ class MockDatabase:
             created_at=self._now(),
             is_read=False,
         )
-        self.notifications.setdefault(user_id, []).insert(0, note)
+        with self._user_lock(user_id):
+            self.notifications.setdefault(user_id, []).insert(0, note)
+            self._journal("notifications", user_id, note, op="push")
         return note
 
 
 if settings.use_supabase:
+    from .async_store import AsyncSupabaseStore
     from .supabase_store import SupabaseStore
 
     db = SupabaseStore()
+    adb = AsyncSupabaseStore()
+elif settings.sqlite_path:
+    from .async_store import AsyncMockStore
+    from .sqlite_store import SqliteStore
+
+    db = SqliteStore(settings.sqlite_path)
+    adb = AsyncMockStore(db, workers=max(1, settings.sqlite_async_workers))
 else:
-    db = MockDatabase()
+    from .async_store import AsyncMockStore
+
+    db = MockDatabase(settings.mock_data_dir)
+    adb = AsyncMockStore(db)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import replace
+from typing import Any, Callable, Iterator, List, Literal, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from .pagination import MAX_PAGE_SIZE, PageQuery
+
+ExportFormat = Literal["csv", "ndjson"]
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+Fetch = Callable[[PageQuery], Tuple[List[BaseModel], Optional[str]]]
+
+
+def export_rows(fetch: Fetch, query: PageQuery, model: Type[BaseModel], fmt: ExportFormat) -> Iterator[bytes]:
+    """Encode every row ``fetch`` pages through, one page per yielded chunk.
+
+    Walks the store's keyset pages ``MAX_PAGE_SIZE`` rows at a time, so only
+    one page is ever held whatever the export size. The first page is
+    fetched before this returns: a bad sort, filter or cursor raises
+    ``ValueError`` here, while the caller can still answer with an error.
+    """
+    query = replace(query, limit=MAX_PAGE_SIZE)
+    first = fetch(query)
+    return _encode_pages(fetch, query, first, list(model.model_fields), fmt)
+
+
+def _encode_pages(
+    fetch: Fetch,
+    query: PageQuery,
+    first: Tuple[List[BaseModel], Optional[str]],
+    columns: List[str],
+    fmt: ExportFormat,
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    if fmt == "csv":
+        writer.writeheader()
+    rows, cursor = first
+    while True:
+        for row in rows:
+            if fmt == "csv":
+                writer.writerow(row.model_dump(mode="json"))
+            else:
+                buffer.write(row.model_dump_json())
+                buffer.write("\n")
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        if cursor is None:
+            return
+        rows, cursor = fetch(replace(query, cursor=cursor))
+
+
+__all__ = ["ExportFormat", "MEDIA_TYPES", "export_rows"]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.schemas import FaceCacheMetrics, UserFace
+
+RankedProfiles = List[Tuple[UserFace, float]]
+
+
+def image_digest(image_base64: str) -> str:
+    return hashlib.blake2b(image_base64.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FaceEmbeddingCache:
+    """Bounded LRU of image digest -> embedding and -> ranked gallery profiles.
+
+    Guard consoles re-submit the same snapshot on retries; a digest hit skips
+    decoding, detection and recognition. Ranked profiles are tagged with the
+    gallery version they were computed against and ignored (and evicted) once
+    the gallery changes. Owner details are not cached - they are resolved per
+    request.
+    """
+
+    def __init__(self, max_entries: int, cache_results: bool = True) -> None:
+        self._max_entries = max(0, max_entries)
+        self._cache_results = cache_results
+        self._lock = Lock()
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._results: "OrderedDict[Tuple[str, int], Tuple[int, RankedProfiles]]" = OrderedDict()
+        self._embedding_hits = 0
+        self._embedding_misses = 0
+        self._result_hits = 0
+        self._result_misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def get_embedding(self, digest: str) -> Optional[np.ndarray]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            embedding = self._embeddings.get(digest)
+            if embedding is None:
+                self._embedding_misses += 1
+                return None
+            self._embeddings.move_to_end(digest)
+            self._embedding_hits += 1
+            return embedding
+
+    def put_embedding(self, digest: str, embedding: np.ndarray) -> None:
+        if not self.enabled:
+            return
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._lock:
+            self._embeddings[digest] = embedding
+            self._embeddings.move_to_end(digest)
+            while len(self._embeddings) > self._max_entries:
+                self._embeddings.popitem(last=False)
+
+    def get_matches(self, digest: str, top_k: int, version: int) -> Optional[RankedProfiles]:
+        if not self.enabled or not self._cache_results:
+            return None
+        key = (digest, top_k)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is None or cached[0] != version:
+                if cached is not None:
+                    del self._results[key]
+                self._result_misses += 1
+                return None
+            self._results.move_to_end(key)
+            self._result_hits += 1
+            return cached[1]
+
+    def put_matches(self, digest: str, top_k: int, version: int, ranked: RankedProfiles) -> None:
+        if not self.enabled or not self._cache_results:
+            return
+        key = (digest, top_k)
+        with self._lock:
+            self._results[key] = (version, ranked)
+            self._results.move_to_end(key)
+            while len(self._results) > self._max_entries:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._embeddings.clear()
+            self._results.clear()
+
+    def metrics(self, version: int) -> FaceCacheMetrics:
+        with self._lock:
+            embedding_lookups = self._embedding_hits + self._embedding_misses
+            result_lookups = self._result_hits + self._result_misses
+            return FaceCacheMetrics(
+                max_entries=self._max_entries,
+                embeddings=len(self._embeddings),
+                results=len(self._results),
+                embedding_hits=self._embedding_hits,
+                embedding_misses=self._embedding_misses,
+                embedding_hit_rate=round(self._embedding_hits / embedding_lookups, 4) if embedding_lookups else 0.0,
+                result_hits=self._result_hits,
+                result_misses=self._result_misses,
+                result_hit_rate=round(self._result_hits / result_lookups, 4) if result_lookups else 0.0,
+                gallery_version=version,
+            )
+
+
+face_embedding_cache = FaceEmbeddingCache(settings.face_cache_entries, settings.face_cache_results)
+
+__all__ = ["FaceEmbeddingCache", "face_embedding_cache", "image_digest"]
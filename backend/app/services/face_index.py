@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+INDEX_FILE = "ivf_index.npz"
+_DELETED = -1
+_TRAIN_SAMPLES_PER_LIST = 64
+_KMEANS_ITERATIONS = 10
+_ASSIGN_CHUNK = 8192
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, scores.shape[0])
+    if k < scores.shape[0]:
+        candidates = np.argpartition(scores, scores.shape[0] - k)[scores.shape[0] - k :]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+def _group(rows: np.ndarray, labels: np.ndarray, nlist: int) -> List[np.ndarray]:
+    """Split ``rows`` into one array per list label (negative labels dropped)."""
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(nlist + 1))
+    return [rows[order[bounds[label] : bounds[label + 1]]] for label in range(nlist)]
+
+
+@dataclass(frozen=True)
+class IVFLists:
+    """Published index state: read without locks, replaced as a whole by writers."""
+
+    centroids: np.ndarray
+    lists: Tuple[np.ndarray, ...]
+    # Store generation the row numbers refer to; compaction renumbers rows.
+    generation: int
+
+    def search(
+        self, matrix: np.ndarray, size: int, query: np.ndarray, top_k: int, nprobe: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(rows, scores)`` for the best ``top_k`` of ``matrix[:size]``, best first."""
+        probes = _top_k(self.centroids @ query, nprobe)
+        rows = np.sort(np.concatenate([self.lists[label] for label in probes]))  # sequential memmap reads
+        # Lists may already hold rows enrolled after the caller's snapshot.
+        rows = rows[: np.searchsorted(rows, size)]
+        if not rows.shape[0]:
+            return rows, np.zeros(0, dtype=np.float32)
+        scores = matrix[rows] @ query
+        ranked = _top_k(scores, top_k)
+        return rows[ranked], scores[ranked]
+
+
+class IVFIndex:
+    """Inverted-file index over the rows of a ``FaceEmbeddingStore``.
+
+    Rows are clustered around ``nlist`` spherical k-means centroids and a query
+    only scores the rows of its ``nprobe`` closest lists. Vectors are not
+    copied: each list holds row numbers into the store's matrix, so the index
+    is just the centroids plus one int32 assignment per row.
+
+    The index trains itself once the gallery reaches ``min_rows`` and retrains
+    whenever the gallery doubles, to keep lists balanced. Rows enrolled after
+    the last save are reassigned on load, so saves only need to be periodic.
+
+    Searches read the published ``IVFLists``; writers build the next one off
+    to the side (centroids, lists and generation together) and swap it in
+    with a single assignment, so a reader never sees a half-built index.
+    """
+
+    def __init__(self, directory: str, nlist: int = 0, nprobe: int = 16, min_rows: int = 5000) -> None:
+        self._path = os.path.join(directory, INDEX_FILE)
+        self._nlist = nlist
+        self.nprobe = max(1, nprobe)
+        self.min_rows = max(1, min_rows)
+        self._state: Optional[IVFLists] = None
+        self._assign = np.zeros(0, dtype=np.int32)  # row -> list label; writers only
+        self._trained_rows = 0
+        self._saved_rows = 0
+        # Store generation rows are assigned for; published with the next state.
+        self.generation = 0
+
+    @property
+    def trained(self) -> bool:
+        return self._state is not None
+
+    def snapshot(self, generation: int) -> Optional[IVFLists]:
+        """The published lists if their row numbers belong to store ``generation``."""
+        state = self._state
+        if state is None or state.generation != generation:
+            return None
+        return state
+
+    @property
+    def covered(self) -> int:
+        return int(self._assign.shape[0])
+
+    # ------------------------------------------------------------------
+    # Maintenance (callers hold the store's write lock)
+    # ------------------------------------------------------------------
+    def sync(self, matrix: np.ndarray, size: int, deleted: Iterable[int]) -> None:
+        """Bring the index in line with ``matrix[:size]`` after the store loads."""
+        if size < self.min_rows:
+            return
+        if not self.trained and not self._load(size):
+            self.train(matrix, size, deleted)
+            return
+        if size >= 2 * self._trained_rows:
+            self.train(matrix, size, deleted)
+            return
+        if self.covered < size:
+            self.add(matrix, self.covered, size - self.covered)
+        self.remove(deleted)
+
+    def rebuild(self, matrix: np.ndarray, size: int, deleted: Iterable[int]) -> None:
+        """Reassign every row after the store renumbered them, keeping the centroids.
+
+        The previous state stays published (readers skip it, its generation
+        is stale) until the reassigned one replaces it.
+        """
+        state = self._state
+        if state is None or size < self.min_rows:
+            self._state = None
+            self._assign = np.zeros(0, dtype=np.int32)
+            self.sync(matrix, size, deleted)
+            return
+        labels = self._labels(state.centroids, matrix, 0, size)
+        lists = _group(np.arange(size), labels, len(state.lists))
+        self._assign = labels
+        self._publish(state.centroids, lists)
+        self._saved_rows = 0
+        self.remove(deleted)
+        self.save()
+
+    def train(self, matrix: np.ndarray, size: int, deleted: Iterable[int]) -> None:
+        deleted_rows = np.fromiter(deleted, dtype=np.int64)
+        live = np.setdiff1d(np.arange(size), deleted_rows, assume_unique=True)
+        if not live.shape[0]:
+            return
+        nlist = self._nlist or int(2 * np.sqrt(live.shape[0]))
+        nlist = max(1, min(nlist, live.shape[0]))
+        rng = np.random.default_rng(size)
+        sample_size = min(live.shape[0], nlist * _TRAIN_SAMPLES_PER_LIST)
+        sample = np.asarray(matrix[np.sort(rng.choice(live, sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=nlist)
+            sums = np.zeros_like(centroids)
+            filled = counts > 0
+            sums[filled] = np.add.reduceat(sample[order], np.cumsum(counts)[filled] - counts[filled], axis=0)
+            empty = ~filled
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+            centroids = sums / (np.linalg.norm(sums, axis=1, keepdims=True) + 1e-8)
+        centroids = centroids.astype(np.float32)
+        labels = self._labels(centroids, matrix, 0, size)
+        labels[deleted_rows] = _DELETED
+        self._assign = labels
+        self._trained_rows = size
+        self._publish(centroids, _group(np.arange(size), labels, nlist))
+        logger.info("Trained face IVF index: {} rows, {} lists", size, nlist)
+        self.save()
+
+    def add(self, matrix: np.ndarray, start: int, count: int) -> None:
+        state = self._state
+        if state is None or not count:
+            return
+        labels = self._labels(state.centroids, matrix, start, count)
+        groups = _group(np.arange(start, start + count), labels, len(state.lists))
+        lists = [
+            np.concatenate([current, extra]) if extra.shape[0] else current
+            for current, extra in zip(state.lists, groups)
+        ]
+        self._publish(state.centroids, lists)
+        self._assign = np.concatenate([self._assign[:start], labels])
+        if start + count - self._saved_rows >= max(1024, self._trained_rows // 4):
+            self.save()
+
+    def remove(self, rows: Iterable[int]) -> None:
+        state = self._state
+        if state is None:
+            return
+        lists = list(state.lists)
+        changed = False
+        for row in rows:
+            if row >= self.covered or self._assign[row] == _DELETED:
+                continue
+            label = self._assign[row]
+            lists[label] = lists[label][lists[label] != row]
+            self._assign[row] = _DELETED
+            changed = True
+        if changed:
+            self._publish(state.centroids, lists)
+
+    @staticmethod
+    def _labels(centroids: np.ndarray, matrix: np.ndarray, start: int, count: int) -> np.ndarray:
+        labels = np.empty(count, dtype=np.int32)
+        for offset in range(0, count, _ASSIGN_CHUNK):
+            chunk = np.asarray(matrix[start + offset : start + min(count, offset + _ASSIGN_CHUNK)])
+            labels[offset : offset + chunk.shape[0]] = np.argmax(chunk @ centroids.T, axis=1)
+        return labels
+
+    def _publish(self, centroids: np.ndarray, lists: Iterable[np.ndarray]) -> None:
+        self._state = IVFLists(centroids=centroids, lists=tuple(lists), generation=self.generation)
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    def search(
+        self, matrix: np.ndarray, size: int, query: np.ndarray, top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """``IVFLists.search`` on the current state, whatever generation it indexes."""
+        state = self._state
+        if state is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return state.search(matrix, size, query, top_k, self.nprobe)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self) -> None:
+        state = self._state
+        if state is None:
+            return
+        # Workers also save from their reload path, outside the writer flock.
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez(
+                handle,
+                centroids=state.centroids,
+                assign=self._assign,
+                trained_rows=np.int64(self._trained_rows),
+                generation=np.int64(state.generation),
+            )
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self._path)
+        self._saved_rows = self.covered
+
+    def _load(self, size: int) -> bool:
+        try:
+            with np.load(self._path) as data:
+                centroids = data["centroids"].astype(np.float32)
+                assign = data["assign"].astype(np.int32)
+                trained_rows = int(data["trained_rows"])
+                generation = int(data["generation"]) if "generation" in data else 0
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as exc:
+            if not isinstance(exc, FileNotFoundError):
+                logger.warning("Ignoring unreadable face index {}: {}", self._path, exc)
+            return False
+        if generation != self.generation or assign.shape[0] > size or (assign.shape[0] and assign.max() >= centroids.shape[0]):
+            logger.warning("Face index {} does not match the gallery, retraining", self._path)
+            return False
+        self._assign = assign
+        self._publish(centroids, _group(np.arange(assign.shape[0]), assign, centroids.shape[0]))
+        self._trained_rows = trained_rows
+        self._saved_rows = assign.shape[0]
+        return True
+
+
+__all__ = ["IVFIndex", "IVFLists", "INDEX_FILE"]
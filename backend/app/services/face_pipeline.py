@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+from insightface.app import FaceAnalysis
+from insightface.utils import face_align
+from loguru import logger
+from onnxruntime import get_available_providers
+
+REQUIRED_MODULES = ("detection", "recognition")
+
+
+def build_face_app(pack: str, allowed_modules: Sequence[str], det_size: int) -> FaceAnalysis:
+    """Load an InsightFace model pack with only the modules verification needs."""
+    modules = list(dict.fromkeys([*allowed_modules, *REQUIRED_MODULES]))
+    if len(modules) != len(set(allowed_modules)):
+        logger.warning("Face modules {} extended to {} (detection + recognition are required)", allowed_modules, modules)
+    providers = get_available_providers()
+    if "CUDAExecutionProvider" in providers:
+        ctx_id = 0
+        logger.info("Initializing InsightFace {} on CUDA provider", pack)
+    else:
+        ctx_id = -1
+        logger.info("CUDA provider unavailable, falling back to CPU for face embeddings ({})", pack)
+    app = FaceAnalysis(name=pack, allowed_modules=modules, providers=providers)
+    app.prepare(ctx_id=ctx_id, det_size=(det_size, det_size))
+    return app
+
+
+def align_best_face(app: FaceAnalysis, frame: np.ndarray, max_side: int) -> Optional[np.ndarray]:
+    """Detect on a downscaled copy of ``frame`` and return the aligned crop of the best face.
+
+    Landmarks are mapped back to full resolution so the recogniser still sees
+    a crop cut from the original pixels. Returns ``None`` when no face is found.
+    """
+    height, width = frame.shape[:2]
+    scale = min(1.0, max_side / max(height, width)) if max_side > 0 else 1.0
+    small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else frame
+    bboxes, kpss = app.det_model.detect(small, max_num=0, metric="default")
+    if bboxes.shape[0] == 0 or kpss is None:
+        return None
+    best = int(np.argmax(bboxes[:, 4]))
+    recognizer = app.models["recognition"]
+    return face_align.norm_crop(frame, landmark=kpss[best] / scale, image_size=recognizer.input_size[0])
+
+
+def embed_crops(app: FaceAnalysis, crops: List[np.ndarray]) -> np.ndarray:
+    """Run the recogniser once over aligned crops and return L2-normalised rows."""
+    features = np.asarray(app.models["recognition"].get_feat(crops), dtype=np.float32)
+    return features / (np.linalg.norm(features, axis=1, keepdims=True) + 1e-8)
+
+
+__all__ = ["align_best_face", "build_face_app", "embed_crops", "REQUIRED_MODULES"]
@@ -1,37 +1,60 @@
 from __future__ import annotations
 
+import asyncio
 import base64
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 from insightface.app import FaceAnalysis
 from loguru import logger
-from onnxruntime import get_available_providers
 
 from app.core.config import settings
-from app.schemas import FaceEnrollRequest, FaceEnrollResponse, FaceMatch, FaceVerifyRequest, FaceVerifyResponse, UserFace
+from app.schemas import (
+    FaceCacheMetrics,
+    FaceCompactionReport,
+    FaceEnrollRequest,
+    FaceEnrollResponse,
+    FaceMatch,
+    FaceProfilePage,
+    FaceVerifyBatchItem,
+    FaceVerifyBatchRequest,
+    FaceVerifyBatchResponse,
+    FaceVerifyRequest,
+    FaceVerifyResponse,
+    User,
+    UserFace,
+)
 
+from .face_cache import face_embedding_cache, image_digest
+from .face_index import IVFIndex
+from .face_pipeline import align_best_face, build_face_app, embed_crops
 from .face_store import FaceEmbeddingStore
 from .datastore import db
 
 
 class FaceRecognitionService:
     def __init__(self) -> None:
-        self._store = FaceEmbeddingStore(settings.face_store_path)
+        self._store = FaceEmbeddingStore(
+            settings.face_store_dir,
+            legacy_json_path=settings.face_store_path,
+            index=self._init_index(),
+            reload_interval=settings.face_store_reload_seconds,
+        )
         self._face_app = self._init_model()
 
+    def _init_index(self) -> Optional[IVFIndex]:
+        if settings.face_index != "ivf":
+            return None
+        return IVFIndex(
+            settings.face_store_dir,
+            nlist=settings.face_index_nlist,
+            nprobe=settings.face_index_nprobe,
+            min_rows=settings.face_index_min_size,
+        )
+
     def _init_model(self) -> FaceAnalysis:
-        providers = get_available_providers()
-        if "CUDAExecutionProvider" in providers:
-            ctx_id = 0
-            logger.info("Initializing InsightFace on CUDA provider")
-        else:
-            ctx_id = -1
-            logger.info("CUDA provider unavailable, falling back to CPU for face embeddings")
-        app = FaceAnalysis(name="buffalo_l", providers=providers)
-        app.prepare(ctx_id=ctx_id, det_size=(640, 640))
-        return app
+        return build_face_app(settings.face_model_pack, settings.face_allowed_modules, settings.face_det_size)
 
     def _decode_image(self, image_base64: str) -> np.ndarray:
         try:
@@ -45,7 +68,14 @@ class FaceRecognitionService:
         return frame
 
     def _extract_embedding(self, image_base64: str) -> np.ndarray:
-        frame = self._decode_image(image_base64)
+        return self._embed_frame(self._decode_image(image_base64))
+
+    def _embed_frame(self, frame: np.ndarray) -> np.ndarray:
+        if settings.face_fast_path:
+            crop = align_best_face(self._face_app, frame, settings.face_det_max_side)
+            if crop is None:
+                raise ValueError("No face detected")
+            return embed_crops(self._face_app, [crop])[0]
         faces = self._face_app.get(frame)
         if not faces:
             raise ValueError("No face detected")
@@ -56,32 +86,157 @@ class FaceRecognitionService:
             raise ValueError("Failed to compute embedding")
         return embedding.astype(np.float32)
 
+    def _extract_embeddings(self, images: Sequence[str]) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Detect the best face per image, then embed every crop in one recognition pass.
+
+        With ``face_fast_path`` off each image goes through ``FaceAnalysis.get``
+        instead, as in ``_embed_frame``. Returns the embeddings of the images
+        that produced a face (in order) and a per-image error message
+        (``None`` where a face was embedded).
+        """
+        crops: List[np.ndarray] = []
+        embeddings: List[np.ndarray] = []
+        errors: List[Optional[str]] = []
+        fast_path = settings.face_fast_path
+        for image in images:
+            try:
+                frame = self._decode_image(image)
+                if fast_path:
+                    crop = align_best_face(self._face_app, frame, settings.face_det_max_side)
+                    if crop is None:
+                        raise ValueError("No face detected")
+                    crops.append(crop)
+                else:
+                    embeddings.append(self._embed_frame(frame))
+                errors.append(None)
+            except ValueError as exc:
+                errors.append(str(exc))
+        if crops:
+            return embed_crops(self._face_app, crops), errors
+        if embeddings:
+            return np.stack(embeddings), errors
+        return np.zeros((0, 0), dtype=np.float32), errors
+
+    def _build_matches(
+        self, candidates: Sequence[Sequence[Tuple[UserFace, float]]], threshold: float
+    ) -> List[List[FaceMatch]]:
+        """Turn ranked profiles into matches, resolving every owner in one lookup."""
+        accepted = [[(profile, score) for profile, score in ranked if score >= threshold] for ranked in candidates]
+        users: Dict[str, User] = db.get_users_by_ids({profile.user_id for ranked in accepted for profile, _ in ranked})
+        results: List[List[FaceMatch]] = []
+        for ranked in accepted:
+            matches: List[FaceMatch] = []
+            for profile, score in ranked:
+                user = users.get(profile.user_id)
+                matches.append(
+                    FaceMatch(
+                        user_id=profile.user_id,
+                        score=score,
+                        owner_name=getattr(user, "name", None),
+                        owner_phone=getattr(user, "phone", None),
+                        owner_affiliation=getattr(user, "programme", None),
+                    )
+                )
+            results.append(matches)
+        return results
+
+    def _cached_embedding(self, image_base64: str, digest: str) -> np.ndarray:
+        embedding = face_embedding_cache.get_embedding(digest)
+        if embedding is None:
+            embedding = self._extract_embedding(image_base64)
+            face_embedding_cache.put_embedding(digest, embedding)
+        return embedding
+
     def enroll(self, payload: FaceEnrollRequest) -> FaceEnrollResponse:
-        embedding = self._extract_embedding(payload.image_base64)
+        embedding = self._cached_embedding(payload.image_base64, image_digest(payload.image_base64))
         profile = self._store.add_profile(payload.user_id, embedding)
         return FaceEnrollResponse(message="Face enrolled", profile=profile)
 
     def verify(self, payload: FaceVerifyRequest) -> FaceVerifyResponse:
-        embedding = self._extract_embedding(payload.image_base64)
-        candidates = self._store.find_matches(embedding, top_k=payload.top_k)
-        matches: List[FaceMatch] = []
-        for profile, score in candidates:
-            if score < payload.threshold:
-                continue
-            user = db.get_user(profile.user_id) if hasattr(db, "get_user") else None  # type: ignore[attr-defined]
-            matches.append(
-                FaceMatch(
-                    user_id=profile.user_id,
-                    score=score,
-                    owner_name=getattr(user, "name", None),
-                    owner_phone=getattr(user, "phone", None),
-                    owner_affiliation=getattr(user, "programme", None),
-                )
-            )
-        return FaceVerifyResponse(matches=matches)
+        digest = image_digest(payload.image_base64)
+        # Read the version before searching: a concurrent change then only makes the entry stale.
+        version = self._store.version
+        candidates = face_embedding_cache.get_matches(digest, payload.top_k, version)
+        if candidates is None:
+            embedding = self._cached_embedding(payload.image_base64, digest)
+            candidates = self._store.find_matches(embedding, top_k=payload.top_k)
+            face_embedding_cache.put_matches(digest, payload.top_k, version, candidates)
+        return FaceVerifyResponse(matches=self._build_matches([candidates], payload.threshold)[0])
+
+    def verify_batch(self, payload: FaceVerifyBatchRequest) -> FaceVerifyBatchResponse:
+        digests = [image_digest(image) for image in payload.images_base64]
+        version = self._store.version
+        candidates: List[Optional[List[Tuple[UserFace, float]]]] = [
+            face_embedding_cache.get_matches(digest, payload.top_k, version) for digest in digests
+        ]
+        errors: List[Optional[str]] = [None] * len(digests)
+        embedded: Dict[int, np.ndarray] = {}
+        for idx, digest in enumerate(digests):
+            if candidates[idx] is None:
+                embedding = face_embedding_cache.get_embedding(digest)
+                if embedding is not None:
+                    embedded[idx] = embedding
+        pending = [idx for idx, found in enumerate(candidates) if found is None and idx not in embedded]
+        if pending:
+            embeddings, pending_errors = self._extract_embeddings([payload.images_base64[idx] for idx in pending])
+            rows = iter(embeddings)
+            for idx, error in zip(pending, pending_errors):
+                if error is None:
+                    embedded[idx] = next(rows)
+                    face_embedding_cache.put_embedding(digests[idx], embedded[idx])
+                else:
+                    errors[idx] = error
+        if embedded:
+            order = sorted(embedded)
+            ranked = self._store.find_matches_batch(np.stack([embedded[idx] for idx in order]), top_k=payload.top_k)
+            for idx, found in zip(order, ranked):
+                candidates[idx] = found
+                face_embedding_cache.put_matches(digests[idx], payload.top_k, version, found)
+        matches = self._build_matches([found or [] for found in candidates], payload.threshold)
+        return FaceVerifyBatchResponse(
+            results=[
+                FaceVerifyBatchItem(index=idx, matches=found, error=error)
+                for idx, (found, error) in enumerate(zip(matches, errors))
+            ]
+        )
+
+    def rank_frame(self, frame: np.ndarray, top_k: int = 3) -> List[Tuple[UserFace, float]]:
+        """Rank gallery profiles for the best face in an already decoded frame.
+
+        Used by the fused gate decision so the frame is decoded once for plate
+        and face. Raises ``ValueError`` when no face is found.
+        """
+        return self._store.find_matches(self._embed_frame(frame), top_k=top_k)
+
+    def list_profiles(
+        self, user_id: Optional[str] = None, offset: int = 0, limit: int = 50, include_embeddings: bool = False
+    ) -> FaceProfilePage:
+        items, total = self._store.page_profiles(
+            user_id=user_id, offset=offset, limit=limit, include_embeddings=include_embeddings
+        )
+        return FaceProfilePage(items=items, total=total, offset=offset, limit=limit)
+
+    def export_embeddings(self, user_id: Optional[str] = None, dtype: str = "float32") -> Tuple[bytes, str]:
+        """Binary gallery export plus the tag of the committed gallery state it was taken from."""
+        return self._store.export_embeddings(user_id=user_id, dtype=dtype)
+
+    def delete_profile(self, profile_id: str) -> None:
+        self._store.remove_profile(profile_id)
+
+    def cache_metrics(self) -> FaceCacheMetrics:
+        return face_embedding_cache.metrics(self._store.version)
+
+    def compact(self) -> FaceCompactionReport:
+        return self._store.compact(settings.face_gallery_mode, max_exemplars=settings.face_max_exemplars)
 
-    def list_profiles(self) -> List[UserFace]:
-        return self._store.list_profiles()
+    async def run_compaction(self, interval: float) -> None:
+        """Background loop compacting the gallery every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.compact)
+            except (OSError, ValueError) as exc:
+                logger.error("Face gallery compaction failed: {}", exc)
 
 
 face_recognition_service = FaceRecognitionService()
@@ -2,81 +2,665 @@ from __future__ import annotations
 
 import json
 import os
+import struct
+from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from threading import Lock
-from typing import List, Sequence
+from time import monotonic, perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from uuid import uuid4
 
 import numpy as np
+from loguru import logger
 
-from app.schemas import UserFace
+from app.schemas import FaceCompactionReport, UserFace
+
+from .face_index import IVFIndex
+
+try:  # pragma: no cover - POSIX only; elsewhere writers are only serialised in-process
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+FORMAT_VERSION = 1
+VECTORS_FILE = "vectors.f32"
+PROFILES_FILE = "profiles.jsonl"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "store.lock"
+# Export layout: magic, rows, dim, dtype code, metadata length, metadata JSON, rows.
+EXPORT_MAGIC = b"FACEEXP1"
+EXPORT_HEADER = struct.Struct("<8sIIBI")
+EXPORT_DTYPES = {"float32": 4, "float16": 2}
+GALLERY_MODES = ("all", "centroid", "exemplars")
+# Candidates fetched per requested match so duplicates of one user can be dropped.
+_DEDUPE_FANOUT = 4
 
 
 @dataclass
 class FaceProfile:
     id: str
     user_id: str
-    embedding: List[float]
     captured_at: str
+    samples: int = 1  # enrolments folded into this row by compaction
 
-    def to_schema(self) -> UserFace:
+    def to_schema(self, embedding: Optional[np.ndarray]) -> UserFace:
         return UserFace(
             id=self.id,
             user_id=self.user_id,
-            embedding=self.embedding,
+            embedding=embedding.tolist() if embedding is not None else None,
             captured_at=datetime.fromisoformat(self.captured_at),
         )
 
 
+@dataclass(frozen=True)
+class _GalleryView:
+    """What lock-free readers see; replaced as a whole on every change."""
+
+    size: int
+    matrix: np.ndarray
+    records: List[bytes]
+    deleted_rows: np.ndarray
+    generation: int = 0
+
+    def profile(self, row: int) -> FaceProfile:
+        return FaceProfile(**json.loads(self.records[row]))
+
+    @property
+    def tag(self) -> str:
+        """``generation.rows.deleted`` of the committed manifest: identical on every worker."""
+        return f"{self.generation}.{self.size}.{self.deleted_rows.shape[0]}"
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.array(matrix, dtype=np.float32, order="C")
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+    return matrix
+
+
+def _write_json_atomic(path: str, payload: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _file_stamp(stat: os.stat_result) -> Tuple[int, int, int]:
+    # The manifest is replaced, never rewritten, so a new inode means a new commit.
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _generation_paths(directory: str, generation: int) -> Tuple[str, str]:
+    if not generation:
+        return os.path.join(directory, VECTORS_FILE), os.path.join(directory, PROFILES_FILE)
+    return (
+        os.path.join(directory, f"vectors.{generation}.f32"),
+        os.path.join(directory, f"profiles.{generation}.jsonl"),
+    )
+
+
+def _diverse_exemplars(rows: np.ndarray, limit: int) -> List[int]:
+    """Farthest-point sample of ``limit`` rows, seeded with the most central one."""
+    centroid = rows.sum(axis=0)
+    chosen = [int(np.argmax(rows @ centroid))]
+    closest = rows @ rows[chosen[0]]
+    while len(chosen) < limit:
+        pick = int(np.argmin(closest))
+        chosen.append(pick)
+        closest = np.maximum(closest, rows @ rows[pick])
+    return sorted(chosen)
+
+
 class FaceEmbeddingStore:
-    """Tiny JSON-backed store for face embeddings."""
+    """Binary, memory-mapped store for face embeddings.
+
+    The store directory holds three files:
 
-    def __init__(self, path: str) -> None:
-        self._path = path
+    * ``vectors.f32`` - raw L2-normalised float32 rows, opened with ``np.memmap``
+      and grown geometrically, so appends write only the new rows and worker
+      processes share the same page-cache pages.
+    * ``profiles.jsonl`` - one metadata line (id, user, capture time) per row,
+      decoded lazily when a row is returned.
+    * ``manifest.json`` - generation, dimension, committed row count and
+      deleted rows, replaced atomically after every change. Rows or metadata
+      past the committed count (a crash mid-append) are ignored and overwritten.
+
+    Compaction writes a fresh pair of generation-numbered data files and then
+    swaps the manifest, so a crash leaves either the old or the new gallery.
+
+    Readers never lock: they use the current ``_GalleryView``, which writers
+    replace wholesale. Writers are serialised across threads and uvicorn
+    workers (``store.lock``, ``flock``) and always start from the latest
+    committed manifest. Other workers notice a new manifest (checked at most
+    every ``reload_interval`` seconds) and map only the rows appended since
+    their last look; a new generation is loaded in full.
+
+    Verification is a single matrix-vector product over the mapped rows, or an
+    ``IVFIndex`` probe when one is attached and the gallery is large enough.
+    Results hold at most one row per user.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        legacy_json_path: Optional[str] = None,
+        index: Optional[IVFIndex] = None,
+        reload_interval: float = 1.0,
+    ) -> None:
+        self._dir = directory
+        self._manifest_path = os.path.join(directory, MANIFEST_FILE)
+        self._lock_path = os.path.join(directory, LOCK_FILE)
         self._lock = Lock()
-        self._profiles: List[FaceProfile] = []
+        self._reload_interval = max(0.0, reload_interval)
+        self._next_check = 0.0
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._generation = 0
+        self._vectors_path, self._profiles_path = _generation_paths(directory, 0)
+        self._profiles_offset = 0
+        self._dim = 0
+        self._deleted: Set[int] = set()
+        self._row_by_id: Optional[Dict[str, int]] = None
+        self._view = _GalleryView(
+            size=0,
+            matrix=np.zeros((0, 0), dtype=np.float32),
+            records=[],
+            deleted_rows=np.zeros(0, dtype=np.int64),
+        )
+        self._index = index
+        self._version = 0
+        os.makedirs(directory, exist_ok=True)
         self._load()
+        if legacy_json_path and not self._view.size:
+            migrate_json_store(legacy_json_path, self)
 
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
     def _load(self) -> None:
-        if not os.path.exists(self._path):
-            os.makedirs(os.path.dirname(self._path), exist_ok=True)
-            self._persist()
+        try:
+            manifest, stamp = self._read_manifest()
+        except FileNotFoundError:
+            with self._writing():
+                if self._stamp is None:
+                    open(self._profiles_path, "a", encoding="utf-8").close()
+                    self._write_manifest()
+            return
+        self._apply_manifest(manifest, stamp)
+
+    def _read_manifest(self) -> Tuple[dict, Tuple[int, int, int]]:
+        with open(self._manifest_path, "r", encoding="utf-8") as handle:
+            stamp = _file_stamp(os.fstat(handle.fileno()))
+            manifest = json.load(handle)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported face store format {manifest.get('format')} in {self._dir}")
+        return manifest, stamp
+
+    def _read_records(self, path: str, offset: int, count: int) -> Tuple[List[bytes], int]:
+        """Read ``count`` committed metadata lines from ``offset``; later bytes are uncommitted."""
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            lines = handle.read().split(b"\n")
+        # The last element is whatever follows the final newline.
+        if len(lines) - 1 < count:
+            raise ValueError(f"Face store {self._dir} has {len(lines) - 1} new profiles for {count} rows")
+        records = lines[:count]
+        return records, offset + sum(len(record) + 1 for record in records)
+
+    def _apply_manifest(self, manifest: dict, stamp: Tuple[int, int, int]) -> None:
+        """Bring this process up to a committed manifest (caller holds the lock or is starting up)."""
+        rows, dim = int(manifest["rows"]), int(manifest["dim"])
+        generation = int(manifest.get("generation", 0))
+        deleted = set(manifest.get("deleted", []))
+        view = self._view
+        first_load = self._stamp is None
+        if first_load or generation != self._generation or not view.size or rows < view.size:
+            # First open, or another worker compacted the gallery: load the generation in full.
+            self._generation = generation
+            self._vectors_path, self._profiles_path = _generation_paths(self._dir, generation)
+            records, self._profiles_offset = self._read_records(self._profiles_path, 0, rows)
+            self._dim = dim
+            self._row_by_id = None
+            matrix = self._map_vectors(max(rows, 1)) if dim else view.matrix
+            self._deleted = deleted
+            self._publish(rows, matrix, records)
+            self._stamp = stamp
+            if self._index is not None:
+                self._index.generation = generation
+                if first_load:
+                    self._index.sync(matrix, rows, deleted)
+                else:
+                    self._index.rebuild(matrix, rows, deleted)
             return
+
+        records = view.records
+        if rows > view.size:
+            appended, self._profiles_offset = self._read_records(
+                self._profiles_path, self._profiles_offset, rows - view.size
+            )
+            # Readers never look past their view's size, so extending in place is safe.
+            records.extend(appended)
+            if self._row_by_id is not None:
+                self._row_by_id.update(
+                    (json.loads(record)["id"], view.size + offset) for offset, record in enumerate(appended)
+                )
+        matrix = view.matrix if view.matrix.shape[0] >= rows else self._map_vectors(rows)
+        removed = deleted - self._deleted
+        self._deleted = deleted
+        self._publish(rows, matrix, records)
+        self._stamp = stamp
+        if self._index is not None:
+            self._index.sync(matrix, rows, removed)
+
+    def _refresh(self) -> None:
         try:
-            with open(self._path, "r", encoding="utf-8") as handle:
-                raw = json.load(handle)
-                self._profiles = [FaceProfile(**entry) for entry in raw]
-        except (json.JSONDecodeError, OSError, TypeError):
-            self._profiles = []
+            manifest, stamp = self._read_manifest()
+        except FileNotFoundError:
+            return
+        if stamp != self._stamp:
+            self._apply_manifest(manifest, stamp)
+
+    def _maybe_reload(self) -> None:
+        """Pick up commits made by other worker processes (throttled stat of the manifest)."""
+        now = monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self._reload_interval
+        try:
+            stamp = _file_stamp(os.stat(self._manifest_path))
+        except OSError:
+            return
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            try:
+                self._refresh()
+            except (OSError, ValueError) as exc:
+                logger.warning("Face store reload from {} failed, keeping current gallery: {}", self._dir, exc)
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Serialise writers across threads and worker processes, starting from the latest commit."""
+        with self._lock:
+            with open(self._lock_path, "a+b") as handle:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                self._refresh()
+                yield
+
+    def _map_vectors(self, min_rows: int, path: Optional[str] = None) -> np.ndarray:
+        """Map a vector file with room for at least ``min_rows`` rows."""
+        path = path or self._vectors_path
+        row_bytes = self._dim * 4
+        current = os.path.getsize(path) if os.path.exists(path) else 0
+        capacity = current // row_bytes
+        if capacity < min_rows:
+            capacity = max(16, 2 * min_rows)
+            with open(path, "ab") as handle:
+                handle.truncate(capacity * row_bytes)
+        return np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self._dim))
+
+    def _write_manifest(self) -> None:
+        _write_json_atomic(
+            self._manifest_path,
+            {
+                "format": FORMAT_VERSION,
+                "generation": self._generation,
+                "dim": self._dim,
+                "rows": self._view.size,
+                "deleted": sorted(self._deleted),
+            },
+        )
+        self._stamp = _file_stamp(os.stat(self._manifest_path))
+
+    def _publish(self, size: int, matrix: np.ndarray, records: List[bytes]) -> None:
+        deleted_rows = np.fromiter(sorted(self._deleted), dtype=np.int64, count=len(self._deleted))
+        self._view = _GalleryView(
+            size=size, matrix=matrix, records=records, deleted_rows=deleted_rows, generation=self._generation
+        )
+        self._version += 1
 
-    def _persist(self) -> None:
-        data = [asdict(profile) for profile in self._profiles]
-        with open(self._path, "w", encoding="utf-8") as handle:
-            json.dump(data, handle, indent=2)
+    def _append(self, rows: np.ndarray, profiles: List[FaceProfile]) -> None:
+        """Write rows + metadata, then commit them by replacing the manifest."""
+        view = self._view
+        size, count = view.size, rows.shape[0]
+        if not self._dim:
+            self._dim = rows.shape[1]
+        elif rows.shape[1] != self._dim:
+            raise ValueError(f"Embedding dimension {rows.shape[1]} does not match gallery ({self._dim})")
+        matrix = view.matrix
+        if size + count > matrix.shape[0]:
+            matrix = self._map_vectors(size + count)
+        matrix[size : size + count] = rows
+        matrix.flush()
+        records = [json.dumps(asdict(profile)).encode("utf-8") for profile in profiles]
+        payload = b"".join(record + b"\n" for record in records)
+        # Write at the committed end, overwriting anything a crashed writer left behind.
+        with open(self._profiles_path, "r+b") as handle:
+            handle.seek(self._profiles_offset)
+            handle.write(payload)
+            handle.truncate()
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._profiles_offset += len(payload)
+        view.records.extend(records)
+        if self._row_by_id is not None:
+            self._row_by_id.update((profile.id, size + offset) for offset, profile in enumerate(profiles))
+        self._publish(size + count, matrix, view.records)
+        self._write_manifest()
+        if self._index is not None:
+            self._index.sync(matrix, size + count, ())
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @property
+    def version(self) -> int:
+        """Bumped on every gallery change, including other workers'; tags cached match results."""
+        self._maybe_reload()
+        return self._version
 
     def list_profiles(self) -> List[UserFace]:
-        return [profile.to_schema() for profile in self._profiles]
+        self._maybe_reload()
+        view = self._view
+        deleted = set(view.deleted_rows.tolist())
+        return [view.profile(idx).to_schema(view.matrix[idx]) for idx in range(view.size) if idx not in deleted]
+
+    def page_profiles(
+        self,
+        user_id: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+        include_embeddings: bool = False,
+    ) -> Tuple[List[UserFace], int]:
+        """Newest-first page of live profiles, optionally for one user, plus the matching total.
+
+        Only the rows on the page are decoded; embeddings are attached on request.
+        """
+        self._maybe_reload()
+        view = self._view
+        rows = self._live_rows(view, user_id)[::-1]
+        page = rows[offset : offset + limit]
+        items = [view.profile(row).to_schema(view.matrix[row] if include_embeddings else None) for row in page]
+        return items, len(rows)
+
+    def export_embeddings(self, user_id: Optional[str] = None, dtype: str = "float32") -> Tuple[bytes, str]:
+        """Pack live rows for bulk sync to edge devices, plus the tag of the gallery state packed.
+
+        Layout (little endian): ``EXPORT_HEADER`` (magic ``FACEEXP1``, rows,
+        dim, dtype code 4 = float32 / 2 = float16, metadata length), then a
+        JSON list of ``[profile_id, user_id]`` pairs, then the rows.
+        """
+        if dtype not in EXPORT_DTYPES:
+            raise ValueError(f"Unknown export dtype {dtype}; expected one of {list(EXPORT_DTYPES)}")
+        self._maybe_reload()
+        view = self._view
+        rows = self._live_rows(view, user_id)
+        profiles = [view.profile(row) for row in rows]
+        meta = json.dumps([[profile.id, profile.user_id] for profile in profiles], separators=(",", ":")).encode("utf-8")
+        vectors = np.asarray(view.matrix[rows] if rows else np.zeros((0, self._dim)), dtype=f"<f{EXPORT_DTYPES[dtype]}")
+        header = EXPORT_HEADER.pack(EXPORT_MAGIC, len(rows), self._dim, EXPORT_DTYPES[dtype], len(meta))
+        return header + meta + vectors.tobytes(), view.tag
+
+    @staticmethod
+    def _live_rows(view: _GalleryView, user_id: Optional[str]) -> List[int]:
+        deleted = set(view.deleted_rows.tolist())
+        if user_id is None:
+            return [row for row in range(view.size) if row not in deleted]
+        # Records are written by json.dumps, so the quoted key/value pair matches without decoding.
+        needle = json.dumps({"user_id": user_id})[1:-1].encode("utf-8")
+        return [row for row in range(view.size) if row not in deleted and needle in view.records[row]]
 
     def add_profile(self, user_id: str, embedding: Sequence[float]) -> UserFace:
-        with self._lock:
-            profile = FaceProfile(
-                id=f"FACE-{uuid4().hex[:8].upper()}",
-                user_id=user_id,
-                embedding=[float(value) for value in embedding],
-                captured_at=datetime.now(timezone.utc).isoformat(),
+        return self.add_profiles([(user_id, embedding)])[0]
+
+    def add_profiles(self, entries: Sequence[tuple[str, Sequence[float]]]) -> List[UserFace]:
+        if not entries:
+            return []
+        with self._writing():
+            captured_at = datetime.now(timezone.utc).isoformat()
+            profiles = [
+                FaceProfile(id=f"FACE-{uuid4().hex[:8].upper()}", user_id=user_id, captured_at=captured_at)
+                for user_id, _ in entries
+            ]
+            rows = _normalize_rows(np.array([embedding for _, embedding in entries], dtype=np.float32))
+            self._append(rows, profiles)
+            return [profile.to_schema(row) for profile, row in zip(profiles, rows)]
+
+    def remove_profile(self, profile_id: str) -> None:
+        """Tombstone one profile; its row stays on disk until the next compaction."""
+        with self._writing():
+            view = self._view
+            if self._row_by_id is None:
+                self._row_by_id = {view.profile(idx).id: idx for idx in range(view.size)}
+            row = self._row_by_id.get(profile_id)
+            if row is None or row in self._deleted:
+                raise KeyError(profile_id)
+            self._deleted.add(row)
+            self._publish(view.size, view.matrix, view.records)
+            self._write_manifest()
+            if self._index is not None:
+                self._index.remove([row])
+
+    def compact(self, mode: str, max_exemplars: int = 5) -> FaceCompactionReport:
+        """Rewrite the gallery with a bounded number of rows per user.
+
+        ``centroid`` folds each user's rows into one sample-weighted mean
+        template; ``exemplars`` keeps at most ``max_exemplars`` mutually
+        diverse rows per user; ``all`` only drops deleted rows. The new data
+        files are a new generation, committed by the manifest swap.
+        """
+        if mode not in GALLERY_MODES:
+            raise ValueError(f"Unknown gallery mode {mode}; expected one of {list(GALLERY_MODES)}")
+        started = perf_counter()
+        with self._writing():
+            view = self._view
+            deleted = set(self._deleted)
+            by_user: Dict[str, List[int]] = defaultdict(list)
+            profiles: Dict[int, FaceProfile] = {}
+            for row in range(view.size):
+                if row in deleted:
+                    continue
+                profile = view.profile(row)
+                profiles[row] = profile
+                by_user[profile.user_id].append(row)
+
+            vectors: List[np.ndarray] = []
+            kept: List[FaceProfile] = []
+            for user_id, rows in by_user.items():
+                block = np.asarray(view.matrix[rows])
+                if mode == "centroid" and len(rows) > 1:
+                    weights = np.array([profiles[row].samples for row in rows], dtype=np.float32)
+                    vectors.append((weights[:, None] * block).sum(axis=0, keepdims=True))
+                    kept.append(
+                        FaceProfile(
+                            id=f"FACE-{uuid4().hex[:8].upper()}",
+                            user_id=user_id,
+                            captured_at=max(profiles[row].captured_at for row in rows),
+                            samples=int(weights.sum()),
+                        )
+                    )
+                elif mode == "exemplars" and len(rows) > max_exemplars:
+                    chosen = _diverse_exemplars(block, max(1, max_exemplars))
+                    vectors.append(block[chosen])
+                    kept.extend(profiles[rows[idx]] for idx in chosen)
+                else:
+                    vectors.append(block)
+                    kept.extend(profiles[row] for row in rows)
+
+            rows_before = view.size - len(deleted)
+            if len(kept) < view.size:
+                self._swap_generation(_normalize_rows(np.concatenate(vectors)) if kept else None, kept)
+        report = FaceCompactionReport(
+            mode=mode,
+            users=len(by_user),
+            rows_before=rows_before,
+            rows_after=len(kept),
+            duration_ms=round((perf_counter() - started) * 1000, 2),
+        )
+        if report.rows_after < view.size:
+            logger.info(
+                "Compacted face gallery ({}): {} users, {} -> {} rows in {}ms",
+                mode,
+                report.users,
+                report.rows_before,
+                report.rows_after,
+                report.duration_ms,
             )
-            self._profiles.append(profile)
-            self._persist()
-            return profile.to_schema()
+        return report
+
+    def _swap_generation(self, vectors: Optional[np.ndarray], profiles: List[FaceProfile]) -> None:
+        old_paths = (self._vectors_path, self._profiles_path)
+        generation = self._generation + 1
+        vectors_path, profiles_path = _generation_paths(self._dir, generation)
+        count = len(profiles)
+        matrix = self._view.matrix
+        if vectors is not None:
+            matrix = self._map_vectors(count, vectors_path)
+            matrix[:count] = vectors
+            matrix.flush()
+        records = [json.dumps(asdict(profile)).encode("utf-8") for profile in profiles]
+        payload = b"".join(record + b"\n" for record in records)
+        with open(profiles_path, "wb") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._profiles_offset = len(payload)
+        self._generation = generation
+        self._vectors_path, self._profiles_path = vectors_path, profiles_path
+        self._deleted = set()
+        self._row_by_id = None
+        self._publish(count, matrix, records)
+        self._write_manifest()
+        # Readers holding the old view keep their mapping after the unlink.
+        for path in old_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        if self._index is not None:
+            self._index.generation = generation
+            self._index.rebuild(matrix, count, ())
 
     def find_matches(self, embedding: np.ndarray, top_k: int = 3) -> List[tuple[UserFace, float]]:
-        if not self._profiles:
-            return []
-        targets = np.array([profile.embedding for profile in self._profiles], dtype=np.float32)
-        embedding = embedding.astype(np.float32)
-        embedding /= np.linalg.norm(embedding) + 1e-8
-        targets /= np.linalg.norm(targets, axis=1, keepdims=True) + 1e-8
-        scores = np.dot(targets, embedding)
-        ranked_indices = np.argsort(scores)[::-1][:top_k]
-        return [(self._profiles[idx].to_schema(), float(scores[idx])) for idx in ranked_indices]
+        return self.find_matches_batch(np.asarray(embedding).reshape(1, -1), top_k=top_k)[0]
+
+    def find_matches_batch(self, embeddings: np.ndarray, top_k: int = 3) -> List[List[tuple[UserFace, float]]]:
+        """Rank the gallery for each row of ``embeddings`` (one probe per row).
+
+        Each result lists up to ``top_k`` distinct users, best row per user
+        first. A probe whose best rows belong to too few users (one user with
+        many close enrolments) is searched again with twice the rows until
+        enough users turn up or the search runs out of rows.
+        """
+        self._maybe_reload()
+        view, index = self._view, self._index
+        if not view.size:
+            return [[] for _ in range(len(embeddings))]
+        queries = _normalize_rows(embeddings)
+        fetch = top_k * _DEDUPE_FANOUT
+        lists = None
+        if index is not None and view.size >= index.min_rows:
+            # After a compaction or reload the view is published before the index is
+            # reassigned; until then its row numbers point at other profiles.
+            lists = index.snapshot(view.generation)
+        nprobe = index.nprobe if index is not None else 0
+
+        def search(query: np.ndarray, count: int) -> tuple[np.ndarray, np.ndarray]:
+            if lists is not None:
+                return lists.search(view.matrix, view.size, query, count, nprobe)
+            return self._exact_search(view, query.reshape(1, -1), count)[0]
+
+        if lists is not None:
+            results = [search(query, fetch) for query in queries]
+        else:
+            results = self._exact_search(view, queries, fetch)  # one GEMM for the whole batch
+        ranked: List[List[tuple[UserFace, float]]] = []
+        for query, (rows, scores) in zip(queries, results):
+            count = fetch
+            matches = self._distinct_users(view, rows, scores, top_k)
+            while len(matches) < top_k and rows.shape[0] >= count:
+                count *= 2
+                rows, scores = search(query, count)
+                matches = self._distinct_users(view, rows, scores, top_k)
+            ranked.append(matches)
+        return ranked
+
+    @staticmethod
+    def _distinct_users(
+        view: _GalleryView, rows: np.ndarray, scores: np.ndarray, top_k: int
+    ) -> List[tuple[UserFace, float]]:
+        seen: Set[str] = set()
+        matches: List[tuple[UserFace, float]] = []
+        for row, score in zip(rows, scores):
+            profile = view.profile(row)
+            if profile.user_id in seen:
+                continue
+            seen.add(profile.user_id)
+            matches.append((profile.to_schema(view.matrix[row]), float(score)))
+            if len(matches) == top_k:
+                break
+        return matches
+
+    def exact_search(self, query: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Brute-force top-k over every live row for a normalised ``query``."""
+        self._maybe_reload()
+        return self._exact_search(self._view, query.reshape(1, -1), top_k)[0]
+
+    @staticmethod
+    def _exact_search(view: _GalleryView, queries: np.ndarray, top_k: int) -> List[tuple[np.ndarray, np.ndarray]]:
+        size = view.size
+        # One GEMM scores every probe; columns are probes.
+        scores = view.matrix[:size] @ queries.T
+        deleted_rows = view.deleted_rows
+        if deleted_rows.shape[0]:
+            scores[deleted_rows] = -np.inf
+        top_k = min(top_k, size - deleted_rows.shape[0])
+        if top_k <= 0:
+            return [(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)) for _ in range(queries.shape[0])]
+        if top_k < size:
+            candidates = np.argpartition(scores, size - top_k, axis=0)[size - top_k :]
+        else:
+            candidates = np.broadcast_to(np.arange(size)[:, None], scores.shape)
+        results = []
+        for column in range(queries.shape[0]):
+            rows = candidates[:, column]
+            column_scores = scores[rows, column]
+            order = np.argsort(column_scores)[::-1]
+            results.append((rows[order], column_scores[order]))
+        return results
+
+
+def migrate_json_store(json_path: str, store: FaceEmbeddingStore) -> int:
+    """Import a legacy ``face_store.json`` into ``store`` and retire the file.
+
+    The JSON file is renamed to ``<name>.migrated`` so the import runs once.
+    Returns the number of profiles imported.
+    """
+    if not os.path.exists(json_path):
+        return 0
+    # Every worker may race here on first start; the writer lock lets one import.
+    with store._writing():
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r", encoding="utf-8") as handle:
+                text = handle.read()
+            raw = json.loads(text) if text.strip() else []
+        except (json.JSONDecodeError, OSError) as exc:
+            logger.warning("Skipping face store migration from {}: {}", json_path, exc)
+            return 0
+        entries = [entry for entry in raw if entry.get("embedding")]
+        if entries:
+            rows = _normalize_rows(np.array([entry["embedding"] for entry in entries], dtype=np.float32))
+            profiles = [
+                FaceProfile(id=entry["id"], user_id=entry["user_id"], captured_at=entry["captured_at"])
+                for entry in entries
+            ]
+            store._append(rows, profiles)
+        os.replace(json_path, f"{json_path}.migrated")
+    logger.info("Migrated {} face profile(s) from {} to {}", len(entries), json_path, store._dir)
+    return len(entries)
+
+
+__all__ = ["EXPORT_HEADER", "EXPORT_MAGIC", "FaceEmbeddingStore", "FaceProfile", "GALLERY_MODES", "migrate_json_store"]
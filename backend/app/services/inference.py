@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import asyncio
 import random
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 
+import numpy as np
 from loguru import logger
 
 from app.core.config import settings
-from app.core.constants import GATE_MIN_ROLE, ROLE_WEIGHTS
+from app.core.constants import GATE_MIN_ROLE
 from app.schemas import (
     AccessDecision,
     AccessEventBase,
@@ -17,11 +19,22 @@ from app.schemas import (
     InferenceRequest,
     InferenceResponse,
     ParkingEventRequest,
+    FaceMatch,
+    Pass,
+    User,
+    UserFace,
 )
 
+from .access_policy import AccessFacts, access_policy
 from .cache import CacheKeys, redis_cache
-from .datastore import db
-from .vision import VisionDetection, vision_pipeline
+from .datastore import adb, db
+from .face_recognition import face_recognition_service
+from .plate_cache import normalize_plate, plate_lookup_cache
+from .singleflight import SingleFlight
+from .vision import VisionDetection, decode_base64_frame, vision_pipeline
+
+# Distinct users ranked for the driver's face; the plate owner must be among them.
+_FACE_TOP_K = 3
 
 
 @dataclass
@@ -30,6 +43,12 @@ class PlateDetection:
     confidence: float
 
 
+@dataclass
+class FaceDetection:
+    found: bool
+    candidates: List[Tuple[UserFace, float]]
+
+
 class InferenceService:
     """Encapsulates the YOLO → OCR pipeline (mocked for laptop demo)."""
 
@@ -37,10 +56,15 @@ class InferenceService:
         if mock_mode is None and settings.mock_inference:
             logger.warning("MOCK_INFERENCE flag ignored; forcing real pipeline mode")
         self.mock_mode = False if mock_mode is None else mock_mode
+        self._vision_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.vision_workers),
+            thread_name_prefix="vision",
+        )
+        self._guest_flights = SingleFlight()
 
     async def infer(self, request: InferenceRequest) -> InferenceResponse:
-        detection = await self._detect_plate_async(request)
-        decision = await asyncio.to_thread(self._decide, detection, request.gate)
+        detection, face = await self._analyse_async(request)
+        decision = await self._decide(detection, request.gate, face)
         event_payload = AccessEventBase(
             plate_text=decision.plate_text,
             confidence=decision.confidence,
@@ -50,23 +74,43 @@ class InferenceService:
             gate=decision.gate,
             snapshot_url=None,
         )
-        event = await asyncio.to_thread(db.add_access_event, event_payload)
+        event = await adb.add_access_event(event_payload)
         redis_cache.push_json(CacheKeys.access_events(), event.model_dump(mode="json"), max_length=100)
         redis_cache.set_json(CacheKeys.inference_snapshot(decision.gate), decision.model_dump(mode="json"))
-        await asyncio.to_thread(self._update_parking_state, decision)
+        await self._update_parking_state(decision)
         return InferenceResponse(decision=decision, event=event)
 
-    async def _detect_plate_async(self, request: InferenceRequest) -> PlateDetection:
+    async def _analyse_async(self, request: InferenceRequest) -> Tuple[PlateDetection, Optional[FaceDetection]]:
+        """Run plate vision and, when asked for, face matching side by side.
+
+        Without a separate driver image the face is taken from the gate frame,
+        which is then decoded once and shared by both models.
+        """
+        face_source = request.driver_image_base64 or (request.image_base64 if request.face_check else None)
+        if not face_source:
+            return await self._detect_plate_async(request), None
+        loop = asyncio.get_running_loop()
+        frame = None
+        if not request.driver_image_base64:
+            frame = await loop.run_in_executor(self._vision_executor, decode_base64_frame, face_source)
+        detection, face = await asyncio.gather(
+            self._detect_plate_async(request, frame),
+            loop.run_in_executor(self._vision_executor, self._match_face, face_source, frame),
+        )
+        return detection, face
+
+    async def _detect_plate_async(self, request: InferenceRequest, frame: Optional[np.ndarray] = None) -> PlateDetection:
         if self.mock_mode:
-            return self._detect_plate(request)
-        return await asyncio.to_thread(self._detect_plate, request)
+            return self._detect_plate(request, frame)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._vision_executor, self._detect_plate, request, frame)
 
-    def _detect_plate(self, request: InferenceRequest) -> PlateDetection:
+    def _detect_plate(self, request: InferenceRequest, frame: Optional[np.ndarray] = None) -> PlateDetection:
         if request.plate_override:
             return PlateDetection(plate_text=request.plate_override.upper(), confidence=0.99)
 
         if request.image_base64 and not self.mock_mode:
-            vision_result = self._real_inference(request.image_base64)
+            vision_result = self._real_inference(request.image_base64, frame)
             if vision_result:
                 return vision_result
 
@@ -80,140 +124,146 @@ class InferenceService:
         logger.warning("Vision pipeline returned no detection; marking UNKNOWN plate")
         return PlateDetection(plate_text="UNKNOWN", confidence=0.0)
 
-    def _real_inference(self, frame_base64: str) -> Optional[PlateDetection]:
+    def _real_inference(self, frame_base64: str, frame: Optional[np.ndarray] = None) -> Optional[PlateDetection]:
         if not vision_pipeline.available():
             return None
-        result: Optional[VisionDetection] = vision_pipeline.detect_from_base64(frame_base64)
+        result: Optional[VisionDetection] = vision_pipeline.detect_from_base64(frame_base64, frame)
         if result:
             return PlateDetection(plate_text=result.plate_text, confidence=result.confidence)
         return None
 
-    def _decide(self, detection: PlateDetection, gate: str) -> AccessDecision:
-        gate_slug, target_role = self._resolve_gate(gate)
-        user, _ = db.find_user_by_plate(detection.plate_text)
-        required_weight = ROLE_WEIGHTS[target_role]
-
-        owner_fields: dict[str, Optional[str | datetime]] = {
-            "owner_name": None,
-            "owner_phone": None,
-            "owner_affiliation": None,
-            "pass_valid_to": None,
-        }
-
-        if not user:
-            if required_weight > ROLE_WEIGHTS["guest"]:
-                return AccessDecision(
-                    plate_text=detection.plate_text,
-                    confidence=detection.confidence,
-                    decision="DENY",
-                    role="guest",
-                    reason=f"Unregistered plate - {gate_slug} requires {target_role}+",
-                    gate=gate_slug,
-                    **owner_fields,
-                )
-            self._ensure_guest_session(detection.plate_text)
-            return AccessDecision(
-                plate_text=detection.plate_text,
-                confidence=detection.confidence,
-                decision="GUEST",
-                role="guest",
-                reason="Unregistered plate, guest flow started",
-                gate=gate_slug,
-                **owner_fields,
-            )
+    def _match_face(self, image_base64: str, frame: Optional[np.ndarray]) -> FaceDetection:
+        if frame is None:
+            frame = decode_base64_frame(image_base64)
+        if frame is None:
+            return FaceDetection(found=False, candidates=[])
+        try:
+            return FaceDetection(found=True, candidates=face_recognition_service.rank_frame(frame, top_k=_FACE_TOP_K))
+        except ValueError:
+            return FaceDetection(found=False, candidates=[])
 
-        owner_fields.update(
-            {
-                "owner_name": user.name,
-                "owner_phone": user.phone,
-                "owner_affiliation": user.programme,
-            }
+    async def _decide(
+        self, detection: PlateDetection, gate: str, face: Optional[FaceDetection] = None
+    ) -> AccessDecision:
+        gate_slug, target_role = await self._resolve_gate(gate)
+        user = await self._lookup_owner(detection.plate_text)
+        latest_pass = await adb.get_latest_pass(user.id) if user else None
+        face_state, face_match = await self._cross_check_face(face, user)
+        facts = AccessFacts(
+            registered=user is not None,
+            pass_state=self._pass_state(latest_pass),
+            role=user.role if user else "guest",
+            required_role=target_role,
+            face=face_state,
         )
-
-        latest_pass = db.get_latest_pass(user.id)
-        if latest_pass and not latest_pass.is_paid:
-            return AccessDecision(
-                plate_text=detection.plate_text,
-                confidence=detection.confidence,
-                decision="DENY",
-                role=user.role,
-                reason="Pass unpaid - settle wallet invoice",
-                gate=gate_slug,
-                **owner_fields,
-            )
-        if latest_pass:
-            owner_fields["pass_valid_to"] = latest_pass.valid_to
-
-        if latest_pass is None:
-            return AccessDecision(
-                plate_text=detection.plate_text,
-                confidence=detection.confidence,
-                decision="DENY",
-                role=user.role,
-                reason="No pass on file",
-                gate=gate_slug,
-                **owner_fields,
-            )
-
-        if latest_pass.valid_to <= datetime.now(timezone.utc):
-            expiry = latest_pass.valid_to.date().isoformat()
-            return AccessDecision(
-                plate_text=detection.plate_text,
-                confidence=detection.confidence,
-                decision="DENY",
-                role=user.role,
-                reason=f"Pass expired ({expiry})",
-                gate=gate_slug,
-                **owner_fields,
-            )
-
-        role_weight = ROLE_WEIGHTS.get(user.role, 0)
-        if role_weight >= required_weight:
-            return AccessDecision(
-                plate_text=detection.plate_text,
-                confidence=detection.confidence,
-                decision="ALLOW",
-                role=user.role,
-                reason=f"{user.role.title()} role >= {target_role} gate threshold",
-                gate=gate_slug,
-                **owner_fields,
-            )
-
+        outcome = access_policy.evaluate(
+            gate_slug,
+            facts,
+            pass_expiry=latest_pass.valid_to.date().isoformat() if latest_pass else None,
+        )
+        if "open_guest_session" in outcome.actions:
+            await self._ensure_guest_session(detection.plate_text)
         return AccessDecision(
             plate_text=detection.plate_text,
             confidence=detection.confidence,
-            decision="DENY",
-            role=user.role,
-            reason=f"{user.role.title()} role below {gate_slug} requirement",
+            decision=outcome.decision,
+            role=facts.role,
+            reason=outcome.reason,
             gate=gate_slug,
-            **owner_fields,
+            owner_name=user.name if user else None,
+            owner_phone=user.phone if user else None,
+            owner_affiliation=user.programme if user else None,
+            pass_valid_to=latest_pass.valid_to if latest_pass and latest_pass.is_paid else None,
+            face_state=face_state,
+            face_match=face_match,
         )
 
-    def _resolve_gate(self, gate: Optional[str]) -> tuple[str, str]:
+    @staticmethod
+    async def _cross_check_face(
+        face: Optional[FaceDetection], owner: Optional[User]
+    ) -> Tuple[str, Optional[FaceMatch]]:
+        """Compare the driver's face with the plate owner.
+
+        ``mismatch`` means the face confidently belongs to a different enrolled
+        user; a face nobody matches (e.g. the owner never enrolled) is ``unknown``.
+        """
+        if face is None:
+            return "unchecked", None
+        if not face.found:
+            return "absent", None
+        accepted = [(profile, score) for profile, score in face.candidates if score >= settings.face_match_threshold]
+        if not accepted:
+            return "unknown", None
+        if owner is not None:
+            for profile, score in accepted:
+                if profile.user_id == owner.id:
+                    return "match", _face_match(profile.user_id, score, owner)
+        profile, score = accepted[0]
+        other = await adb.get_user(profile.user_id)
+        return ("mismatch" if owner is not None else "unknown"), _face_match(profile.user_id, score, other)
+
+    @staticmethod
+    def _pass_state(latest_pass: Optional[Pass]) -> str:
+        if latest_pass is None:
+            return "missing"
+        if not latest_pass.is_paid:
+            return "unpaid"
+        if latest_pass.valid_to <= datetime.now(timezone.utc):
+            return "expired"
+        return "valid"
+
+    async def _resolve_gate(self, gate: Optional[str]) -> tuple[str, str]:
         slug = (gate or "outer").lower()
-        gate_obj = db.get_gate_by_slug(slug)
+        gate_obj = await adb.get_gate_by_slug(slug)
         if gate_obj and gate_obj.is_active:
             return gate_obj.slug, gate_obj.min_role
         return slug, GATE_MIN_ROLE.get(slug, "guest")
 
-    def _ensure_guest_session(self, plate_text: str) -> None:
-        existing = db.find_guest_session_by_plate(plate_text, status="open")
-        if existing:
+    async def _lookup_owner(self, plate_text: str) -> Optional[User]:
+        if plate_lookup_cache.is_unregistered(plate_text):
+            return None
+        user, _ = await adb.find_user_by_plate(plate_text)
+        if not user:
+            plate_lookup_cache.mark_unregistered(plate_text)
+        return user
+
+    async def _ensure_guest_session(self, plate_text: str) -> None:
+        if plate_lookup_cache.has_open_session(plate_text):
             return
-        db.open_guest_session(payload=GuestSessionCreate(plate_text=plate_text))
+        # Frames of the same car arrive in bursts; share one check-then-create.
+        await self._guest_flights.do(
+            normalize_plate(plate_text),
+            lambda: self._open_guest_session_once(plate_text),
+        )
+
+    async def _open_guest_session_once(self, plate_text: str) -> None:
+        existing = await adb.find_guest_session_by_plate(plate_text, status="open")
+        if not existing:
+            await adb.open_guest_session(payload=GuestSessionCreate(plate_text=plate_text))
+        plate_lookup_cache.mark_open_session(plate_text)
 
-    def _update_parking_state(self, decision: AccessDecision) -> None:
+    async def _update_parking_state(self, decision: AccessDecision) -> None:
         if decision.decision not in ("ALLOW", "GUEST"):
             return
-        gate = db.get_gate_by_slug(decision.gate)
+        gate = await adb.get_gate_by_slug(decision.gate)
         if not gate or not gate.parking_venue_id or not gate.parking_direction:
             return
         try:
-            db.record_parking_event(
+            await adb.record_parking_event(
                 ParkingEventRequest(venue_id=gate.parking_venue_id, direction=gate.parking_direction)
             )
         except Exception as exc:  # pragma: no cover - defensive logging only
             logger.warning("Failed to update parking for gate {}: {}", gate.slug, exc)
 
 
+def _face_match(user_id: str, score: float, user: Optional[User]) -> FaceMatch:
+    return FaceMatch(
+        user_id=user_id,
+        score=score,
+        owner_name=getattr(user, "name", None),
+        owner_phone=getattr(user, "phone", None),
+        owner_affiliation=getattr(user, "programme", None),
+    )
+
+
 inference_service = InferenceService()
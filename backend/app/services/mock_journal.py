@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from pathlib import Path
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, ContextManager, Dict, IO, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+from .mock_records import Record
+
+SNAPSHOT_FILE = "snapshot.bin"
+SNAPSHOT_MAGIC = b"SGSNAP1\n"
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".jsonl"
+
+# One WAL line: [seq, op, collection, key, payload].
+#   set  - table[key] = payload (key None replaces the whole collection)
+#   del  - table.pop(key)
+#   push - table[key].insert(0, payload) (key None prepends to a list collection)
+WalRecord = Tuple[int, str, str, Optional[str], Any]
+
+
+def encode(value: Any) -> Any:
+    if isinstance(value, Record):
+        value = value.to_model()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [encode(item) for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _fsync_dir(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class MockJournal:
+    """Write-ahead log plus periodic snapshots for ``MockDatabase``.
+
+    Every mutation is appended as a JSON line to the current WAL segment and
+    flushed to the OS straight away, so a process crash loses nothing. Lines
+    are fsynced in batches by a background thread every ``fsync_ms`` (``0``
+    fsyncs each append), bounding what a power loss can take.
+
+    ``checkpoint`` captures the collections under the caller's lock, starts a
+    new segment at the same instant, pickles the capture into ``snapshot.bin``
+    (write-then-rename) and only then deletes the segments it covers.
+    Recovery loads the snapshot and replays every WAL record with a higher
+    sequence number; a torn final line is truncated away.
+    """
+
+    def __init__(self, directory: str, fsync_ms: int = 50) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._fsync_interval = max(0, fsync_ms) / 1000
+        self._lock = Lock()
+        self._checkpoint_lock = Lock()
+        self._seq = 0
+        self._file: Optional[IO[str]] = None
+        self._dirty = False
+        self._appended = 0
+        self._stop = Event()
+        self._flusher: Optional[Thread] = None
+
+    @property
+    def appended(self) -> int:
+        """Records appended since the last checkpoint."""
+        return self._appended
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+    def recover(self) -> Tuple[Optional[Dict[str, Any]], List[WalRecord]]:
+        """Return the latest snapshot state (or ``None``) and the WAL records after it."""
+        snapshot_seq, state = self._read_snapshot()
+        records: List[WalRecord] = []
+        last_seq = snapshot_seq
+        segments = self._segments()
+        for position, segment in enumerate(segments):
+            good_bytes, torn = self._read_segment(segment, records, snapshot_seq)
+            if torn:
+                # A crash mid-append: keep the intact prefix so the next
+                # recovery does not stop here and drop newer segments.
+                logger.error("Torn WAL record in {}; truncating at byte {}", segment.name, good_bytes)
+                with segment.open("r+b") as handle:
+                    handle.truncate(good_bytes)
+                for stale in segments[position + 1 :]:
+                    stale.unlink(missing_ok=True)
+                break
+        if records:
+            last_seq = records[-1][0]
+        self._seq = last_seq
+        return state, records
+
+    def _read_snapshot(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        path = self._dir / SNAPSHOT_FILE
+        if not path.exists():
+            return 0, None
+        with path.open("rb") as handle:
+            if handle.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a SmartGate snapshot")
+            payload = pickle.load(handle)
+        return int(payload["seq"]), payload["state"]
+
+    def _segments(self) -> List[Path]:
+        return sorted(self._dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    @staticmethod
+    def _read_segment(path: Path, records: List[WalRecord], after: int) -> Tuple[int, bool]:
+        """Append the records of ``path`` newer than ``after``; return (intact bytes, torn)."""
+        good_bytes = 0
+        with path.open("rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    return good_bytes, True
+                try:
+                    seq, op, collection, key, payload = json.loads(line)
+                except ValueError:
+                    return good_bytes, True
+                good_bytes += len(line)
+                if seq > after:
+                    records.append((int(seq), op, collection, key, payload))
+        return good_bytes, False
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def open(self) -> None:
+        """Start a fresh segment after ``recover`` and launch the fsync thread."""
+        with self._lock:
+            self._start_segment()
+        if self._fsync_interval > 0 and self._flusher is None:
+            self._flusher = Thread(target=self._flush_loop, name="mock-wal-fsync", daemon=True)
+            self._flusher.start()
+
+    def append(self, op: str, collection: str, key: Optional[str], payload: Any = None) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._seq += 1
+            self._file.write(json.dumps([self._seq, op, collection, key, encode(payload)], separators=(",", ":")))
+            self._file.write("\n")
+            self._file.flush()
+            self._appended += 1
+            if self._fsync_interval == 0:
+                os.fsync(self._file.fileno())
+            else:
+                self._dirty = True
+
+    def checkpoint(self, capture: Callable[[], Dict[str, Any]], guard: ContextManager[Any]) -> None:
+        """Snapshot ``capture()`` and drop the WAL segments it supersedes.
+
+        ``guard`` is the store lock: holding it while capturing and switching
+        segments makes the snapshot cover exactly the records before the cut.
+        Pickling and the file writes happen outside it.
+        """
+        with self._checkpoint_lock:
+            started = monotonic()
+            with guard:
+                state = capture()
+                with self._lock:
+                    seq = self._seq
+                    current = self._start_segment()
+                    covered = [segment for segment in self._segments() if segment != current]
+                    self._appended = 0
+            path = self._dir / SNAPSHOT_FILE
+            tmp = path.with_suffix(".tmp")
+            with tmp.open("wb") as handle:
+                handle.write(SNAPSHOT_MAGIC)
+                pickle.dump({"seq": seq, "state": state}, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp, path)
+            _fsync_dir(self._dir)
+            for segment in covered:
+                segment.unlink(missing_ok=True)
+        logger.info("Mock store snapshot at seq {} written in {:.0f} ms", seq, (monotonic() - started) * 1000)
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._file is not None and self._dirty:
+                os.fsync(self._file.fileno())
+                self._dirty = False
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def _start_segment(self) -> Path:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        path = self._dir / f"{SEGMENT_PREFIX}{self._seq + 1:012d}{SEGMENT_SUFFIX}"
+        self._file = path.open("a", encoding="utf-8")
+        self._dirty = False
+        _fsync_dir(self._dir)
+        return path
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self._fsync_interval):
+            self.sync()
+
+
+__all__ = ["MockJournal", "WalRecord", "encode"]
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from pydantic_core import to_jsonable_python
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def _parse_datetime(value: Any) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def _parse_text(value: Any) -> str:
+    return str(value)
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """Sort keys (field -> cursor value parser) and filters one collection accepts.
+
+    ``range_field`` is the timestamp a ``since`` / ``until`` window applies to.
+    """
+
+    sorts: Dict[str, Callable[[Any], Any]]
+    default_sort: str
+    default_descending: bool
+    filters: Tuple[str, ...]
+    range_field: Optional[str] = None
+
+
+# Every sort is keyset-paginated on (field, id); the stores index each pair.
+PAGE_SPECS: Dict[str, PageSpec] = {
+    "users": PageSpec(
+        sorts={"name": _parse_text, "email": _parse_text, "id": _parse_text},
+        default_sort="name",
+        default_descending=False,
+        filters=("role",),
+    ),
+    "vehicles": PageSpec(
+        sorts={"plate_text": _parse_text, "id": _parse_text},
+        default_sort="plate_text",
+        default_descending=False,
+        filters=("user_id",),
+    ),
+    "passes": PageSpec(
+        sorts={"valid_to": _parse_datetime, "valid_from": _parse_datetime, "id": _parse_text},
+        default_sort="valid_to",
+        default_descending=True,
+        filters=("user_id", "role", "is_paid"),
+    ),
+    "guest_sessions": PageSpec(
+        sorts={"start_time": _parse_datetime, "id": _parse_text},
+        default_sort="start_time",
+        default_descending=True,
+        filters=("status", "plate_text"),
+    ),
+    "payments": PageSpec(
+        sorts={"timestamp": _parse_datetime, "id": _parse_text},
+        default_sort="timestamp",
+        default_descending=True,
+        filters=("processor", "session_id", "pass_id"),
+        range_field="timestamp",
+    ),
+    "pass_applications": PageSpec(
+        sorts={"submitted_at": _parse_datetime, "id": _parse_text},
+        default_sort="submitted_at",
+        default_descending=True,
+        filters=("status", "user_id"),
+    ),
+    "access_events": PageSpec(
+        sorts={"timestamp": _parse_datetime, "id": _parse_text},
+        default_sort="timestamp",
+        default_descending=True,
+        filters=("gate", "decision"),
+        range_field="timestamp",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class PageQuery:
+    """One page request: ``limit`` rows after ``cursor`` in ``sort`` order, matching ``filters``.
+
+    ``sort`` / ``descending`` default to the collection's natural order;
+    ``None`` filter values are ignored. ``since`` (inclusive) and ``until``
+    (exclusive) bound the collection's ``range_field``; naive values are UTC.
+    """
+
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+    sort: Optional[str] = None
+    descending: Optional[bool] = None
+    filters: Dict[str, Any] = field(default_factory=dict)
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class ResolvedPage:
+    sort: str
+    descending: bool
+    limit: int
+    filters: Dict[str, Any]
+    # (sort value, id) of the last row already returned, typed for comparison.
+    after: Optional[Tuple[Any, str]]
+    # The same position as it was serialised (JSON / ISO-8601 text), for SQL.
+    after_raw: Optional[Tuple[Any, str]]
+    # ``range_field`` window as aware UTC datetimes; unused when both are None.
+    range_field: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    def in_window(self, value: datetime) -> bool:
+        return (self.since is None or value >= self.since) and (self.until is None or value < self.until)
+
+    def range_raw(self) -> Tuple[Optional[str], Optional[str]]:
+        """The window as ISO-8601 text comparable with stored timestamps.
+
+        Microseconds are always written out: pydantic stores ``...:00Z`` or
+        ``...:00.250000Z``, and ``...:00.000000Z`` sorts before both as text,
+        so whole-second bounds compare like the instants themselves.
+        """
+        return tuple(  # type: ignore[return-value]
+            bound.strftime("%Y-%m-%dT%H:%M:%S.%fZ") if bound is not None else None
+            for bound in (self.since, self.until)
+        )
+
+
+def resolve_page(collection: str, query: PageQuery) -> ResolvedPage:
+    """Validate ``query`` against the collection's spec; raises ``ValueError``."""
+    spec = PAGE_SPECS[collection]
+    sort = query.sort or spec.default_sort
+    if sort not in spec.sorts:
+        raise ValueError(f"Cannot sort {collection} by {sort}")
+    descending = spec.default_descending if query.descending is None else query.descending
+    unknown = set(query.filters) - set(spec.filters)
+    if unknown:
+        raise ValueError(f"Cannot filter {collection} by {', '.join(sorted(unknown))}")
+    filters = {name: value for name, value in query.filters.items() if value is not None}
+    limit = max(1, min(query.limit, MAX_PAGE_SIZE))
+    after = after_raw = None
+    if query.cursor:
+        try:
+            cursor_sort, cursor_desc, value, last_id = json.loads(base64.urlsafe_b64decode(query.cursor.encode()))
+            after = (spec.sorts[sort](value), str(last_id))
+        except (ValueError, TypeError, KeyError) as exc:
+            raise ValueError("Malformed cursor") from exc
+        if cursor_sort != sort or bool(cursor_desc) != descending:
+            raise ValueError("Cursor was issued for a different sort order")
+        after_raw = (value, str(last_id))
+    since, until = (_as_utc(bound) for bound in (query.since, query.until))
+    if (since or until) and spec.range_field is None:
+        raise ValueError(f"Cannot filter {collection} by date")
+    return ResolvedPage(sort, descending, limit, filters, after, after_raw, spec.range_field, since, until)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def encode_cursor(sort: str, descending: bool, value: Any, record_id: str) -> str:
+    payload = json.dumps([sort, descending, to_jsonable_python(value), record_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def finish_page(rows: Sequence[T], page: ResolvedPage) -> Tuple[List[T], Optional[str]]:
+    """Trim a ``limit + 1`` fetch to the page and build the cursor for the next one."""
+    items = list(rows[: page.limit])
+    if len(rows) <= page.limit or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(page.sort, page.descending, getattr(last, page.sort), getattr(last, "id"))
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "PAGE_SPECS",
+    "PageQuery",
+    "PageSpec",
+    "ResolvedPage",
+    "encode_cursor",
+    "finish_page",
+    "resolve_page",
+]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic
+from typing import Dict
+
+from app.core.config import settings
+
+
+def normalize_plate(plate_text: str) -> str:
+    cleaned = "".join(ch if (ch.isalnum() or ch.isspace()) else " " for ch in plate_text.upper())
+    return " ".join(cleaned.split())
+
+
+class PlateLookupCache:
+    """Short-lived negative cache for plates that keep appearing at a barrier.
+
+    Remembers "no vehicle registered for this plate" and "an open guest session
+    already exists" so repeated frames of a waiting guest skip the store.
+    Entries are dropped whenever a vehicle with the plate is written or the
+    plate's guest session changes state; the TTL bounds staleness across
+    worker processes, which do not see each other's invalidations.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 4096) -> None:
+        self._ttl = max(0.0, ttl_seconds)
+        self._max_entries = max_entries
+        self._lock = Lock()
+        self._unregistered: Dict[str, float] = {}
+        self._open_sessions: Dict[str, float] = {}
+
+    def is_unregistered(self, plate_text: str) -> bool:
+        return self._fresh(self._unregistered, normalize_plate(plate_text))
+
+    def mark_unregistered(self, plate_text: str) -> None:
+        self._mark(self._unregistered, normalize_plate(plate_text))
+
+    def has_open_session(self, plate_text: str) -> bool:
+        return self._fresh(self._open_sessions, normalize_plate(plate_text))
+
+    def mark_open_session(self, plate_text: str) -> None:
+        self._mark(self._open_sessions, normalize_plate(plate_text))
+
+    def invalidate(self, plate_text: str) -> None:
+        key = normalize_plate(plate_text)
+        with self._lock:
+            self._unregistered.pop(key, None)
+            self._open_sessions.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._unregistered.clear()
+            self._open_sessions.clear()
+
+    def _fresh(self, bucket: Dict[str, float], key: str) -> bool:
+        expires_at = bucket.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < monotonic():
+            with self._lock:
+                if bucket.get(key) == expires_at:
+                    bucket.pop(key, None)
+            return False
+        return True
+
+    def _mark(self, bucket: Dict[str, float], key: str) -> None:
+        if not self._ttl or not key:
+            return
+        now = monotonic()
+        with self._lock:
+            if len(bucket) >= self._max_entries:
+                for stale in [plate for plate, expires_at in bucket.items() if expires_at < now]:
+                    bucket.pop(stale, None)
+            bucket[key] = now + self._ttl
+
+
+plate_lookup_cache = PlateLookupCache(settings.plate_negative_cache_ttl)
+
+__all__ = ["plate_lookup_cache", "PlateLookupCache", "normalize_plate"]
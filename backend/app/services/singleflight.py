@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one in-flight task.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task and receive its result or exception.
+    The shared task is shielded so one caller being cancelled does not abort
+    the work for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Future[Any]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: str, task: asyncio.Future[Any]) -> None:
+        if self._calls.get(key) is task:
+            self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every waiter was cancelled
+
+
+__all__ = ["SingleFlight"]
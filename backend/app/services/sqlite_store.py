@@ -0,0 +1,1645 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from random import randint
+from threading import Lock, local
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar
+from uuid import uuid4
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.passes import compute_validity_window
+from app.data import seed
+from app.schemas import (
+    AccessEvent,
+    AccessEventBase,
+    AuthResponse,
+    ClientGuestPaymentRequest,
+    ClientProfile,
+    ClientRegistration,
+    ClientRegistrationRequest,
+    ClientRegistrationResponse,
+    ClientSummary,
+    ClientWallet,
+    ClientWalletActivity,
+    Gate,
+    GateCreate,
+    GateUpdate,
+    GuestPaymentRequest,
+    GuestRateResponse,
+    GuestRateUpdate,
+    GuestSession,
+    GuestSessionCreate,
+    GuestSessionLookupResponse,
+    LoginRequest,
+    Notification,
+    ParkingEventRequest,
+    ParkingOverview,
+    ParkingVenueCreate,
+    ParkingVenueStatus,
+    ParkingVenueUpdate,
+    Pass,
+    PassApplication,
+    PassApplicationDecision,
+    PassCreate,
+    PassUpdate,
+    Payment,
+    RoleUpgradeDecision,
+    RoleUpgradeRequest,
+    RoleUpgradeSubmit,
+    SignupRequest,
+    User,
+    UserCreate,
+    UserUpdate,
+    Vehicle,
+    VehicleCreate,
+    VehicleUpdate,
+    WalletTopUpRequest,
+    WalletTransaction,
+)
+
+from .auth import auth_service
+from .cache import CacheKeys, redis_cache
+from .pagination import PageQuery, ResolvedPage, finish_page, resolve_page
+from .plate_cache import plate_lookup_cache
+from .summary_cache import SUMMARY_COLLECTIONS, client_summary_cache
+from .touchngo import touchngo_gateway
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Tables and indexes follow db/migrations (SQLite types: timestamps are ISO-8601
+# text, booleans integers, jsonb / text[] JSON text). Additions: the base
+# tables that predate 002, ``vehicles.plate_key`` (normalised plate, the gate
+# lookup key) and ``client_registrations`` / ``client_profiles``, which
+# SupabaseStore only keeps in memory. The ``(sort column, id)`` indexes back
+# the keyset pages (``pagination.PAGE_SPECS``), as in migration 005.
+SCHEMA = """
+create table if not exists users (
+    id text primary key,
+    name text not null,
+    email text not null,
+    phone text not null,
+    role text not null default 'student',
+    programme text not null,
+    wallet_balance real not null default 0
+);
+create index if not exists users_email_idx on users (lower(email));
+create index if not exists users_name_idx on users (lower(name));
+create index if not exists users_id_nocase_idx on users (lower(id));
+create index if not exists users_name_page_idx on users (name, id);
+create index if not exists users_email_page_idx on users (email, id);
+
+create table if not exists vehicles (
+    id text primary key,
+    plate_text text not null,
+    plate_key text not null,
+    user_id text not null references users (id) on delete cascade
+);
+create index if not exists vehicles_plate_idx on vehicles (plate_key);
+create index if not exists vehicles_user_idx on vehicles (user_id);
+create index if not exists vehicles_plate_page_idx on vehicles (plate_text, id);
+
+create table if not exists passes (
+    id text primary key,
+    user_id text not null references users (id) on delete cascade,
+    role text not null,
+    plan_type text not null,
+    valid_from text not null,
+    valid_to text not null,
+    price_rm real not null,
+    is_paid integer not null default 0,
+    paid_at text null
+);
+create index if not exists passes_user_idx on passes (user_id, valid_to);
+create index if not exists passes_valid_to_page_idx on passes (valid_to, id);
+create index if not exists passes_valid_from_page_idx on passes (valid_from, id);
+
+create table if not exists access_events (
+    id text primary key,
+    plate_text text not null,
+    confidence real not null,
+    decision text not null,
+    gate text not null,
+    role text not null,
+    reason text not null,
+    snapshot_url text null,
+    timestamp text not null
+);
+create index if not exists access_events_timestamp_idx on access_events (timestamp);
+create index if not exists access_events_timestamp_page_idx on access_events (timestamp, id);
+create index if not exists access_events_gate_page_idx on access_events (gate, timestamp, id);
+
+create table if not exists guest_sessions (
+    id text primary key,
+    plate_text text not null,
+    start_time text not null,
+    end_time text null,
+    minutes integer null,
+    fee real null,
+    status text not null default 'open'
+);
+create index if not exists guest_sessions_plate_idx on guest_sessions (plate_text, status, start_time);
+create index if not exists guest_sessions_start_page_idx on guest_sessions (start_time, id);
+
+create table if not exists payments (
+    id text primary key,
+    amount real not null,
+    status text not null,
+    processor text not null,
+    timestamp text not null,
+    currency text not null,
+    session_id text null,
+    pass_id text null,
+    reference text null
+);
+create index if not exists payments_timestamp_idx on payments (timestamp);
+create index if not exists payments_timestamp_page_idx on payments (timestamp, id);
+
+create table if not exists guest_rates (
+    id text primary key,
+    base_rate real not null,
+    per_minute_rate real not null
+);
+
+create table if not exists user_credentials (
+    user_id text primary key references users (id) on delete cascade,
+    password_hash text not null,
+    created_at text not null default current_timestamp
+);
+
+create table if not exists wallet_transactions (
+    id text primary key,
+    user_id text not null references users (id) on delete cascade,
+    amount real not null,
+    type text not null default 'adjustment',
+    description text not null default 'adjustment',
+    source text not null default 'system',
+    created_at text not null
+);
+create index if not exists wallet_transactions_user_idx on wallet_transactions (user_id, created_at);
+
+create table if not exists role_upgrade_requests (
+    id text primary key,
+    user_id text not null references users (id) on delete cascade,
+    target_role text not null,
+    reason text not null,
+    attachments text not null default '[]',
+    status text not null default 'pending',
+    submitted_at text not null,
+    reviewed_at text null,
+    reviewer_id text null
+);
+create index if not exists role_upgrade_requests_user_idx on role_upgrade_requests (user_id);
+
+create table if not exists notifications (
+    id text primary key,
+    user_id text not null references users (id) on delete cascade,
+    message text not null,
+    created_at text not null,
+    is_read integer not null default 0
+);
+create index if not exists notifications_user_idx on notifications (user_id, is_read);
+
+create table if not exists pass_applications (
+    id text primary key,
+    user_id text not null references users (id) on delete cascade,
+    role text not null,
+    plan_type text not null,
+    vehicles text not null default '[]',
+    status text not null default 'pending' check (status in ('pending','approved','rejected')),
+    reviewer_id text null,
+    review_note text null,
+    submitted_at text not null,
+    reviewed_at text null
+);
+create index if not exists pass_applications_user_idx on pass_applications (user_id);
+create index if not exists pass_applications_status_idx on pass_applications (status);
+create index if not exists pass_applications_submitted_page_idx on pass_applications (submitted_at, id);
+
+create table if not exists parking_venues (
+    id text primary key,
+    name text not null,
+    capacity integer not null default 0,
+    occupied integer not null default 0
+);
+
+create table if not exists gates (
+    id text primary key,
+    name text not null,
+    slug text not null unique,
+    min_role text not null default 'guest',
+    location text null,
+    is_active integer not null default 1,
+    parking_venue_id text null references parking_venues (id),
+    parking_direction text null check (parking_direction in ('entry','exit'))
+);
+create index if not exists gates_parking_venue_idx on gates (parking_venue_id);
+
+create table if not exists parking_events (
+    id text primary key,
+    venue_id text not null references parking_venues (id) on delete cascade,
+    direction text not null check (direction in ('entry','exit')),
+    delta integer not null,
+    created_at text not null default current_timestamp
+);
+create index if not exists parking_events_venue_idx on parking_events (venue_id);
+
+create table if not exists client_registrations (
+    id text primary key,
+    user_id text not null references users (id) on delete cascade,
+    status text not null default 'pending',
+    submitted_at text not null
+);
+create index if not exists client_registrations_user_idx on client_registrations (user_id);
+
+create table if not exists client_profiles (
+    user_id text primary key references users (id) on delete cascade,
+    registration_id text not null,
+    status text not null default 'pending',
+    guest_pin text not null,
+    wallet_balance real not null default 0,
+    created_at text not null,
+    updated_at text not null
+);
+"""
+
+JSON_COLUMNS = frozenset({"attachments", "vehicles"})
+
+
+class SqliteStore:
+    """Embedded SQLite data layer mirroring the MockDatabase API.
+
+    Local and durable like ``MockDatabase`` with ``MOCK_DATA_DIR``, but
+    indexed on disk so the working set does not have to fit in memory. The
+    database runs in WAL mode (readers never block the writer) with
+    ``synchronous=NORMAL``. Each thread gets its own connection, whose
+    statement cache keeps the fixed, parameterised queries below prepared.
+    Multi-statement mutations run in one ``BEGIN IMMEDIATE`` transaction.
+    """
+
+    RATE_SINGLETON_ID = "default"
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = local()
+        self._pool_lock = Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._upsert_sql: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._guest_cache_ttl = 4 * 60 * 60  # 4 hours, covers long visitor stays
+        conn = self._conn()
+        conn.execute("pragma journal_mode = wal")
+        conn.executescript(SCHEMA)
+        if self._one("select 1 from users limit 1") is None:
+            self.seed()
+
+    # ------------------------------------------------------------------
+    # Connections / SQL helpers
+    # ------------------------------------------------------------------
+    def _conn(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=settings.sqlite_statement_cache,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("pragma foreign_keys = on")
+            conn.execute("pragma synchronous = normal")
+            conn.execute(f"pragma busy_timeout = {int(settings.sqlite_busy_timeout_ms)}")
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in one write transaction; nested calls join the outer one."""
+        conn = self._conn()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        conn.execute("begin immediate")
+        self._local.depth = 1
+        self._local.summary_writes = []
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        else:
+            conn.execute("commit")
+            self._flush_summary_writes(self._local.summary_writes)
+        finally:
+            self._local.depth = 0
+            self._local.summary_writes = []
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return self._conn().execute(sql, params).fetchall()
+
+    def _one(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        return self._conn().execute(sql, params).fetchone()
+
+    def _exec(self, sql: str, params: Sequence[Any] = ()) -> int:
+        return self._conn().execute(sql, params).rowcount
+
+    def _upsert(self, table: str, row: Dict[str, Any], key: str = "id") -> None:
+        columns = tuple(row)
+        sql = self._upsert_sql.get((table, columns))
+        if sql is None:
+            updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != key)
+            sql = (
+                f"insert into {table} ({', '.join(columns)}) values ({', '.join('?' * len(columns))}) "
+                f"on conflict ({key}) do update set {updates}"
+            )
+            self._upsert_sql[(table, columns)] = sql
+        values = [json.dumps(value) if isinstance(value, (list, dict)) else value for value in row.values()]
+        self._conn().execute(sql, values)
+        self._summary_touched(table, row)
+
+    def _save(self, table: str, record: BaseModel, key: str = "id", **extra: Any) -> None:
+        self._upsert(table, {**record.model_dump(mode="json"), **extra}, key=key)
+
+    def _summary_touched(self, table: str, row: Dict[str, Any]) -> None:
+        if table not in SUMMARY_COLLECTIONS:
+            return
+        if table == "guest_sessions":
+            self._summary_write(plate_text=row.get("plate_text"))
+        else:
+            self._summary_write(row.get("id") if table == "users" else row.get("user_id"))
+
+    def _summary_write(self, user_id: Optional[str] = None, plate_text: Optional[str] = None) -> None:
+        """Drop the cached client summary once this write is committed.
+
+        Invalidating before the commit would let a concurrent poll re-cache
+        the old rows, so writes inside a transaction are queued until then.
+        """
+        if self._local.depth:
+            self._local.summary_writes.append((user_id, plate_text))
+        else:
+            self._flush_summary_writes([(user_id, plate_text)])
+
+    @staticmethod
+    def _flush_summary_writes(writes: List[Tuple[Optional[str], Optional[str]]]) -> None:
+        if not writes:
+            return
+        client_summary_cache.invalidate_many({user_id for user_id, _ in writes})
+        for plate_text in {plate_text for _, plate_text in writes if plate_text}:
+            client_summary_cache.invalidate_plate(plate_text)
+
+    def _insert_many(self, table: str, rows: Sequence[Dict[str, Any]], replace: bool = False) -> None:
+        """Insert rows sharing one column set with a single prepared statement.
+
+        ``replace`` overwrites on a key clash, as ``_save`` does.
+        """
+        if not rows:
+            return
+        columns = tuple(rows[0])
+        verb = "insert or replace" if replace else "insert"
+        sql = f"{verb} into {table} ({', '.join(columns)}) values ({', '.join('?' * len(columns))})"
+        self._conn().executemany(
+            sql,
+            (
+                [json.dumps(value) if isinstance(value, (list, dict)) else value for value in row.values()]
+                for row in rows
+            ),
+        )
+        for row in rows:
+            self._summary_touched(table, row)
+
+    def _existing(self, sql: str, keys: Iterable[Any]) -> set:
+        """Values of ``keys`` already present; ``sql`` ends with ``in`` and selects one column."""
+        keys = list(set(keys))
+        if not keys:
+            return set()
+        return {row[0] for row in self._query(f"{sql} ({', '.join('?' * len(keys))})", keys)}
+
+    @staticmethod
+    def _model(model: Type[ModelT], row: sqlite3.Row) -> ModelT:
+        data = dict(row)
+        if model is User:
+            # Validated on the way in; EmailStr re-validation would dominate the gate lookup.
+            return model.model_construct(**{field: data[field] for field in User.model_fields})
+        for column in JSON_COLUMNS.intersection(data):
+            data[column] = json.loads(data[column])
+        return model(**data)
+
+    def _models(self, model: Type[ModelT], sql: str, params: Sequence[Any] = ()) -> List[ModelT]:
+        return [self._model(model, row) for row in self._query(sql, params)]
+
+    def _first(self, model: Type[ModelT], sql: str, params: Sequence[Any] = ()) -> Optional[ModelT]:
+        row = self._one(sql, params)
+        return self._model(model, row) if row is not None else None
+
+    def _page(
+        self, collection: str, query: PageQuery, select: Optional[str] = None, alias: str = ""
+    ) -> Tuple[List[sqlite3.Row], ResolvedPage]:
+        """Fetch ``limit + 1`` rows of a keyset page; ``finish_page`` trims them.
+
+        ``(sort, id) > (?, ?)`` (``<`` descending) walks the ``(sort, id)``
+        index from the cursor, so every page costs the same however deep it is.
+        """
+        page = resolve_page(collection, query)
+        prefix = f"{alias}." if alias else ""
+        clauses = [f"{prefix}{name} = ?" for name in page.filters]
+        params: List[Any] = list(page.filters.values())
+        if page.after_raw is not None:
+            clauses.append(f"({prefix}{page.sort}, {prefix}id) {'<' if page.descending else '>'} (?, ?)")
+            params.extend(page.after_raw)
+        for op, bound in zip((">=", "<"), page.range_raw()):
+            if bound is not None:
+                clauses.append(f"{prefix}{page.range_field} {op} ?")
+                params.append(bound)
+        direction = "desc" if page.descending else "asc"
+        sql = select or f"select * from {collection}"
+        if clauses:
+            sql += f" where {' and '.join(clauses)}"
+        sql += f" order by {prefix}{page.sort} {direction}, {prefix}id {direction} limit ?"
+        params.append(page.limit + 1)
+        return self._query(sql, params), page
+
+    def _page_models(
+        self, collection: str, model: Type[ModelT], query: PageQuery
+    ) -> Tuple[List[ModelT], Optional[str]]:
+        rows, page = self._page(collection, query)
+        return finish_page([self._model(model, row) for row in rows], page)
+
+    def close(self) -> None:
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = local()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _generate_id(self, prefix: str) -> str:
+        return f"{prefix}-{uuid4().hex[:6].upper()}"
+
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    @staticmethod
+    def _normalize_plate(plate_text: str) -> str:
+        cleaned = "".join(ch if (ch.isalnum() or ch.isspace()) else " " for ch in plate_text.upper())
+        return " ".join(cleaned.split())
+
+    def _save_vehicle(self, vehicle: Vehicle) -> None:
+        self._save("vehicles", vehicle, plate_key=self._normalize_plate(vehicle.plate_text))
+
+    def _save_transaction(self, transaction: WalletTransaction) -> None:
+        row = transaction.model_dump(mode="json")
+        row["created_at"] = row.pop("timestamp")
+        self._upsert("wallet_transactions", row)
+
+    @staticmethod
+    def _transaction_from_row(row: sqlite3.Row) -> WalletTransaction:
+        data = dict(row)
+        data["timestamp"] = data.pop("created_at")
+        return WalletTransaction(**data)
+
+    @staticmethod
+    def _venue_from_row(row: sqlite3.Row) -> ParkingVenueStatus:
+        capacity, occupied = row["capacity"], row["occupied"]
+        percent = round((occupied / capacity) * 100, 1) if capacity else 0.0
+        return ParkingVenueStatus(id=row["id"], name=row["name"], capacity=capacity, occupied=occupied, percent=percent)
+
+    def _create_pass_application(self, user_id: str, role: str, plan_type: str, vehicles: List[str]) -> PassApplication:
+        normalized_vehicles: List[str] = []
+        for plate in vehicles:
+            normalized = self._normalize_plate(plate)
+            if normalized and normalized not in normalized_vehicles:
+                normalized_vehicles.append(normalized)
+        application = PassApplication(
+            id=self._generate_id("APP"),
+            user_id=user_id,
+            role=role,
+            plan_type=plan_type,
+            vehicles=normalized_vehicles,
+            status="pending",
+            submitted_at=self._now(),
+        )
+        self._save("pass_applications", application)
+        self._create_notification(user_id, "Pass application submitted. Await admin review.")
+        return application
+
+    # ------------------------------------------------------------------
+    # Seeds
+    # ------------------------------------------------------------------
+    def seed(self) -> None:
+        with self._transaction():
+            logger.info("Seeding SmartGate demo data into {}", self._path)
+            users = seed.seed_users()
+            for user in users:
+                self._save("users", user, wallet_balance=user.wallet_balance or 0)
+            for vehicle in seed.seed_vehicles():
+                self._save_vehicle(vehicle)
+            for parking_pass in seed.seed_passes():
+                self._save("passes", parking_pass)
+            for event in seed.seed_events():
+                self._save("access_events", event)
+            for session in seed.seed_guest_sessions():
+                self._save("guest_sessions", session)
+            for payment in seed.seed_payments():
+                self._save("payments", payment)
+            for venue in seed.seed_parking_venues():
+                self._upsert("parking_venues", venue.model_dump(mode="json", exclude={"percent"}))
+            for gate in seed.seed_gates():
+                self._save("gates", gate)
+            self._upsert(
+                "guest_rates",
+                {
+                    "id": self.RATE_SINGLETON_ID,
+                    "base_rate": settings.base_guest_rate,
+                    "per_minute_rate": settings.per_minute_guest_rate,
+                },
+            )
+            self._seed_client_profiles(users)
+            hashed = auth_service.hash_password("password")
+            for user in users:
+                self._upsert("user_credentials", {"user_id": user.id, "password_hash": hashed}, key="user_id")
+
+    def _seed_client_profiles(self, users: List[User]) -> None:
+        now = self._now()
+        for idx, user in enumerate(users, start=1):
+            registration_id = self._generate_id("REG")
+            status = "active" if user.role != "guest" else "pending"
+            balance = round(35.0 - 5 * idx if status == "active" else 10.0, 2)
+            self._save(
+                "client_registrations",
+                ClientRegistration(id=registration_id, user_id=user.id, status=status, submitted_at=now),
+            )
+            profile = ClientProfile(
+                user_id=user.id,
+                registration_id=registration_id,
+                status=status,
+                guest_pin=f"{randint(1000, 9999)}",
+                wallet_balance=balance,
+                created_at=now,
+                updated_at=now,
+            )
+            self._save("client_profiles", profile, key="user_id")
+            self._save_transaction(
+                WalletTransaction(
+                    id=self._generate_id("TXN"),
+                    user_id=user.id,
+                    amount=balance,
+                    type="top_up",
+                    description="Seed credit",
+                    timestamp=now,
+                    source="seed",
+                )
+            )
+
+    # ------------------------------------------------------------------
+    # Users CRUD
+    # ------------------------------------------------------------------
+    def list_users(self) -> List[User]:
+        self._ensure_all_client_profiles()
+        rows = self._query(
+            "select u.id, u.name, u.email, u.phone, u.role, u.programme, p.wallet_balance "
+            "from users u left join client_profiles p on p.user_id = u.id"
+        )
+        return [self._user_with_wallet_balance(row) for row in rows]
+
+    def page_users(self, query: PageQuery) -> Tuple[List[User], Optional[str]]:
+        rows, page = self._page(
+            "users",
+            query,
+            select=(
+                "select u.id, u.name, u.email, u.phone, u.role, u.programme, p.wallet_balance, p.user_id as profile_id "
+                "from users u left join client_profiles p on p.user_id = u.id"
+            ),
+            alias="u",
+        )
+        # Only this page's users get their missing profiles, not the whole table.
+        for row in rows[: page.limit]:
+            if row["profile_id"] is None:
+                self._ensure_client_profile(row["id"])
+        return finish_page([self._user_with_wallet_balance(row) for row in rows], page)
+
+    def _user_with_wallet_balance(self, row: sqlite3.Row) -> User:
+        return self._model(User, row).model_copy(update={"wallet_balance": round(row["wallet_balance"] or 0.0, 2)})
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        return self._first(User, "select * from users where id = ?", (user_id,))
+
+    def get_users_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        ids = sorted(set(user_ids))
+        if not ids:
+            return {}
+        users = self._models(User, f"select * from users where id in ({', '.join('?' * len(ids))})", ids)
+        return {user.id: user for user in users}
+
+    def create_user(self, payload: UserCreate) -> User:
+        with self._transaction():
+            user = User(id=payload.id or self._generate_id("USR"), **payload.model_dump(exclude={"id"}))
+            self._save("users", user, wallet_balance=user.wallet_balance or 0)
+            self._upsert(
+                "user_credentials",
+                {"user_id": user.id, "password_hash": auth_service.hash_password("password")},
+                key="user_id",
+            )
+            return user
+
+    def update_user(self, user_id: str, payload: UserUpdate) -> User:
+        with self._transaction():
+            user = self._require_user(user_id)
+            updated = user.model_copy(update=payload.model_dump(exclude_unset=True))
+            self._save("users", updated, wallet_balance=updated.wallet_balance or 0)
+            return updated
+
+    def delete_user(self, user_id: str) -> None:
+        # Vehicles, passes and the portal rows go with the user (on delete cascade).
+        with self._transaction():
+            if not self._exec("delete from users where id = ?", (user_id,)):
+                raise KeyError(user_id)
+            self._summary_write(user_id)
+
+    # ------------------------------------------------------------------
+    # Vehicles CRUD
+    # ------------------------------------------------------------------
+    def list_vehicles(self) -> List[Vehicle]:
+        return self._models(Vehicle, "select * from vehicles")
+
+    def page_vehicles(self, query: PageQuery) -> Tuple[List[Vehicle], Optional[str]]:
+        return self._page_models("vehicles", Vehicle, query)
+
+    def create_vehicle(self, payload: VehicleCreate) -> Vehicle:
+        with self._transaction():
+            self._require_user(payload.user_id)
+            vehicle = Vehicle(id=payload.id or self._generate_id("VEH"), **payload.model_dump(exclude={"id"}))
+            self._save_vehicle(vehicle)
+        plate_lookup_cache.invalidate(vehicle.plate_text)
+        return vehicle
+
+    def update_vehicle(self, vehicle_id: str, payload: VehicleUpdate) -> Vehicle:
+        with self._transaction():
+            current = self._first(Vehicle, "select * from vehicles where id = ?", (vehicle_id,))
+            if current is None:
+                raise KeyError(vehicle_id)
+            if payload.user_id:
+                self._require_user(payload.user_id)
+            updated = current.model_copy(update=payload.model_dump(exclude_unset=True))
+            self._save_vehicle(updated)
+            self._summary_write(current.user_id)  # the previous owner, if it moved
+        plate_lookup_cache.invalidate(updated.plate_text)
+        return updated
+
+    def delete_vehicle(self, vehicle_id: str) -> None:
+        with self._transaction():
+            owner = self._one("select user_id from vehicles where id = ?", (vehicle_id,))
+            if not self._exec("delete from vehicles where id = ?", (vehicle_id,)):
+                raise KeyError(vehicle_id)
+            self._summary_write(owner["user_id"] if owner else None)
+
+    # ------------------------------------------------------------------
+    # Passes CRUD
+    # ------------------------------------------------------------------
+    def list_passes(self) -> List[Pass]:
+        return self._models(Pass, "select * from passes")
+
+    def page_passes(self, query: PageQuery) -> Tuple[List[Pass], Optional[str]]:
+        return self._page_models("passes", Pass, query)
+
+    def create_pass(self, payload: PassCreate) -> Pass:
+        with self._transaction():
+            self._require_user(payload.user_id)
+            starts_at = payload.starts_at or self._now()
+            valid_from, valid_to, plan = compute_validity_window(payload.plan_type, starts_at=starts_at)
+            parking_pass = Pass(
+                id=payload.id or self._generate_id("PASS"),
+                user_id=payload.user_id,
+                role=payload.role,
+                plan_type=plan.plan_type,
+                valid_from=valid_from,
+                valid_to=valid_to,
+                price_rm=plan.price_rm,
+                is_paid=False,
+                paid_at=None,
+            )
+            self._save("passes", parking_pass)
+            self._create_notification(
+                payload.user_id,
+                f"{plan.label} pass issued. Pay RM {plan.price_rm:.2f} via wallet.",
+            )
+            return parking_pass
+
+    def update_pass(self, pass_id: str, payload: PassUpdate) -> Pass:
+        with self._transaction():
+            current = self._first(Pass, "select * from passes where id = ?", (pass_id,))
+            if current is None:
+                raise KeyError(pass_id)
+            fields = payload.model_dump(exclude_unset=True)
+            plan_type = fields.pop("plan_type", None)
+            starts_at = fields.pop("starts_at", None)
+            if plan_type or starts_at:
+                valid_from, valid_to, plan = compute_validity_window(
+                    plan_type or current.plan_type, starts_at=starts_at or current.valid_from
+                )
+                fields.update(
+                    {
+                        "plan_type": plan.plan_type,
+                        "valid_from": valid_from,
+                        "valid_to": valid_to,
+                        "price_rm": plan.price_rm,
+                        "is_paid": False,
+                        "paid_at": None,
+                    }
+                )
+                self._create_notification(
+                    current.user_id,
+                    f"{plan.label} pass updated. Pay RM {plan.price_rm:.2f} via wallet.",
+                )
+            updated = current.model_copy(update=fields)
+            self._save("passes", updated)
+            return updated
+
+    def delete_pass(self, pass_id: str) -> None:
+        with self._transaction():
+            owner = self._one("select user_id from passes where id = ?", (pass_id,))
+            if not self._exec("delete from passes where id = ?", (pass_id,)):
+                raise KeyError(pass_id)
+            self._summary_write(owner["user_id"] if owner else None)
+
+    def get_latest_pass(self, user_id: str) -> Optional[Pass]:
+        return self._first(Pass, "select * from passes where user_id = ? order by valid_to desc limit 1", (user_id,))
+
+    def list_pass_applications(self, status: Optional[str] = None) -> List[PassApplication]:
+        if status:
+            return self._models(
+                PassApplication,
+                "select * from pass_applications where status = ? order by submitted_at desc",
+                (status,),
+            )
+        return self._models(PassApplication, "select * from pass_applications order by submitted_at desc")
+
+    def page_pass_applications(self, query: PageQuery) -> Tuple[List[PassApplication], Optional[str]]:
+        return self._page_models("pass_applications", PassApplication, query)
+
+    def review_pass_application(self, app_id: str, payload: PassApplicationDecision) -> PassApplication:
+        with self._transaction():
+            application = self._first(PassApplication, "select * from pass_applications where id = ?", (app_id,))
+            if application is None:
+                raise KeyError(app_id)
+            if application.status != "pending":
+                return application
+            now = self._now()
+            updated = application.model_copy(
+                update={
+                    "status": payload.status,
+                    "reviewer_id": payload.reviewer_id,
+                    "review_note": payload.note,
+                    "reviewed_at": now,
+                }
+            )
+            self._save("pass_applications", updated)
+            if payload.status == "approved":
+                self.create_pass(
+                    PassCreate(
+                        user_id=application.user_id,
+                        role=application.role,
+                        plan_type=application.plan_type,
+                        starts_at=now,
+                    )
+                )
+            else:
+                self._create_notification(application.user_id, payload.note or "Pass application rejected")
+            return updated
+
+    # ------------------------------------------------------------------
+    # Bulk import
+    # ------------------------------------------------------------------
+    # One transaction per chunk: a couple of ``in (...)`` lookups for
+    # conflicts, then one prepared insert per table. Returns one error
+    # message (or ``None`` for created) per payload, in order.
+    def bulk_create_users(self, payloads: Sequence[UserCreate], password_hashes: Sequence[str]) -> List[Optional[str]]:
+        users = [
+            User(id=payload.id or self._generate_id("USR"), **payload.model_dump(exclude={"id"}))
+            for payload in payloads
+        ]
+        errors: List[Optional[str]] = []
+        rows: List[Dict[str, Any]] = []
+        credentials: List[Dict[str, Any]] = []
+        with self._transaction():
+            taken_ids = self._existing("select id from users where id in", (user.id for user in users))
+            taken_emails = self._existing(
+                "select lower(email) from users where lower(email) in", (user.email.lower() for user in users)
+            )
+            for payload, user, hashed in zip(payloads, users, password_hashes):
+                email = user.email.lower()
+                while not payload.id and user.id in taken_ids:
+                    user = user.model_copy(update={"id": self._generate_id("USR")})
+                if user.id in taken_ids:
+                    errors.append(f"User {user.id} already exists")
+                elif email in taken_emails:
+                    errors.append(f"Email {user.email} already registered")
+                else:
+                    taken_ids.add(user.id)
+                    taken_emails.add(email)
+                    rows.append({**user.model_dump(mode="json"), "wallet_balance": user.wallet_balance or 0})
+                    credentials.append({"user_id": user.id, "password_hash": hashed})
+                    errors.append(None)
+            self._insert_many("users", rows)
+            self._insert_many("user_credentials", credentials)
+        return errors
+
+    def bulk_create_vehicles(self, payloads: Sequence[VehicleCreate]) -> List[Optional[str]]:
+        vehicles = [
+            Vehicle(id=payload.id or self._generate_id("VEH"), **payload.model_dump(exclude={"id"}))
+            for payload in payloads
+        ]
+        errors: List[Optional[str]] = []
+        rows: List[Dict[str, Any]] = []
+        with self._transaction():
+            users = self._existing("select id from users where id in", (vehicle.user_id for vehicle in vehicles))
+            taken_ids = self._existing("select id from vehicles where id in", (vehicle.id for vehicle in vehicles))
+            taken_plates = self._existing(
+                "select plate_key from vehicles where plate_key in",
+                (self._normalize_plate(vehicle.plate_text) for vehicle in vehicles),
+            )
+            for payload, vehicle in zip(payloads, vehicles):
+                plate = self._normalize_plate(vehicle.plate_text)
+                while not payload.id and vehicle.id in taken_ids:
+                    vehicle = vehicle.model_copy(update={"id": self._generate_id("VEH")})
+                if vehicle.user_id not in users:
+                    errors.append(f"Unknown user_id {vehicle.user_id}")
+                elif vehicle.id in taken_ids:
+                    errors.append(f"Vehicle {vehicle.id} already exists")
+                elif plate in taken_plates:
+                    errors.append(f"Plate {plate} already registered")
+                else:
+                    taken_ids.add(vehicle.id)
+                    taken_plates.add(plate)
+                    rows.append({**vehicle.model_dump(mode="json"), "plate_key": plate})
+                    errors.append(None)
+            self._insert_many("vehicles", rows)
+        for row in rows:
+            plate_lookup_cache.invalidate(row["plate_text"])
+        return errors
+
+    def bulk_create_passes(self, payloads: Sequence[PassCreate]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = []
+        passes: List[Dict[str, Any]] = []
+        notes: List[Dict[str, Any]] = []
+        now = self._now()
+        pass_ids = [payload.id or self._generate_id("PASS") for payload in payloads]
+        with self._transaction():
+            users = self._existing("select id from users where id in", (payload.user_id for payload in payloads))
+            taken_ids = self._existing("select id from passes where id in", pass_ids)
+            for payload, pass_id in zip(payloads, pass_ids):
+                while not payload.id and pass_id in taken_ids:
+                    pass_id = self._generate_id("PASS")
+                if payload.user_id not in users:
+                    errors.append(f"Unknown user_id {payload.user_id}")
+                    continue
+                if payload.id and payload.id in taken_ids:
+                    errors.append(f"Pass {payload.id} already exists")
+                    continue
+                starts_at = payload.starts_at or now
+                valid_from, valid_to, plan = compute_validity_window(payload.plan_type, starts_at=starts_at)
+                parking_pass = Pass(
+                    id=pass_id,
+                    user_id=payload.user_id,
+                    role=payload.role,
+                    plan_type=plan.plan_type,
+                    valid_from=valid_from,
+                    valid_to=valid_to,
+                    price_rm=plan.price_rm,
+                    is_paid=False,
+                    paid_at=None,
+                )
+                taken_ids.add(pass_id)
+                passes.append(parking_pass.model_dump(mode="json"))
+                note = Notification(
+                    id=self._generate_id("NTF"),
+                    user_id=payload.user_id,
+                    message=f"{plan.label} pass issued. Pay RM {plan.price_rm:.2f} via wallet.",
+                    created_at=now,
+                    is_read=False,
+                )
+                notes.append(note.model_dump(mode="json"))
+                errors.append(None)
+            self._insert_many("passes", passes)
+            self._insert_many("notifications", notes, replace=True)
+        return errors
+
+    # ------------------------------------------------------------------
+    # Access events
+    # ------------------------------------------------------------------
+    def list_access_events(self, limit: int = 50) -> List[AccessEvent]:
+        cached = redis_cache.list_json(CacheKeys.access_events(), limit)
+        if cached:
+            return [AccessEvent(**entry) for entry in cached]
+        return self._models(AccessEvent, "select * from access_events order by timestamp desc limit ?", (limit,))
+
+    def page_access_events(self, query: PageQuery) -> Tuple[List[AccessEvent], Optional[str]]:
+        return self._page_models("access_events", AccessEvent, query)
+
+    def add_access_event(self, payload: AccessEventBase) -> AccessEvent:
+        event = AccessEvent(id=self._generate_id("EVT"), timestamp=self._now(), **payload.model_dump())
+        with self._transaction():
+            self._save("access_events", event)
+        return event
+
+    def find_user_by_plate(self, plate_text: str) -> Tuple[Optional[User], Optional[Vehicle]]:
+        row = self._one(
+            "select v.id as vehicle_id, v.plate_text, v.user_id, u.* from vehicles v "
+            "left join users u on u.id = v.user_id where v.plate_key = ? limit 1",
+            (self._normalize_plate(plate_text),),
+        )
+        if row is None:
+            return None, None
+        vehicle = Vehicle(id=row["vehicle_id"], plate_text=row["plate_text"], user_id=row["user_id"])
+        return (self._model(User, row) if row["id"] is not None else None), vehicle
+
+    # ------------------------------------------------------------------
+    # Gates
+    # ------------------------------------------------------------------
+    def list_gates(self) -> List[Gate]:
+        return self._models(Gate, "select * from gates")
+
+    def create_gate(self, payload: GateCreate) -> Gate:
+        with self._transaction():
+            slug = payload.slug.lower()
+            if self._one("select 1 from gates where slug = ?", (slug,)):
+                raise ValueError(f"Gate slug {slug} already exists")
+            gate = Gate(
+                id=payload.id or self._generate_id("GTE"),
+                name=payload.name,
+                slug=slug,
+                min_role=payload.min_role,
+                location=payload.location,
+                is_active=payload.is_active,
+                parking_venue_id=payload.parking_venue_id,
+                parking_direction=payload.parking_direction,
+            )
+            self._save("gates", gate)
+            return gate
+
+    def update_gate(self, gate_id: str, payload: GateUpdate) -> Gate:
+        with self._transaction():
+            current = self.get_gate(gate_id)
+            if current is None:
+                raise KeyError(gate_id)
+            updated_slug = payload.slug.lower() if payload.slug else current.slug
+            if updated_slug != current.slug and self._one("select 1 from gates where slug = ?", (updated_slug,)):
+                raise ValueError(f"Gate slug {updated_slug} already exists")
+            updated = current.model_copy(update={**payload.model_dump(exclude_unset=True), "slug": updated_slug})
+            self._save("gates", updated)
+            return updated
+
+    def delete_gate(self, gate_id: str) -> None:
+        with self._transaction():
+            if not self._exec("delete from gates where id = ?", (gate_id,)):
+                raise KeyError(gate_id)
+
+    def get_gate(self, gate_id: str) -> Optional[Gate]:
+        return self._first(Gate, "select * from gates where id = ?", (gate_id,))
+
+    def get_gate_by_slug(self, slug: str) -> Optional[Gate]:
+        return self._first(Gate, "select * from gates where slug = ?", (slug.lower(),))
+
+    # ------------------------------------------------------------------
+    # Guest sessions
+    # ------------------------------------------------------------------
+    def list_guest_sessions(self) -> List[GuestSession]:
+        return self._models(GuestSession, "select * from guest_sessions")
+
+    def page_guest_sessions(self, query: PageQuery) -> Tuple[List[GuestSession], Optional[str]]:
+        return self._page_models("guest_sessions", GuestSession, query)
+
+    def find_guest_session_by_plate(self, plate_text: str, status: Optional[str] = None) -> Optional[GuestSession]:
+        normalized = plate_text.upper()
+        cached = redis_cache.get_json(CacheKeys.guest_session(normalized))
+        if cached:
+            session = GuestSession(**cached)
+            if status is None or session.status == status:
+                return session
+        if status:
+            session = self._first(
+                GuestSession,
+                "select * from guest_sessions where plate_text = ? and status = ? order by start_time desc limit 1",
+                (normalized, status),
+            )
+        else:
+            session = self._first(
+                GuestSession,
+                "select * from guest_sessions where plate_text = ? order by start_time desc limit 1",
+                (normalized,),
+            )
+        if session is not None:
+            self._cache_guest_session(session)
+        return session
+
+    def open_guest_session(self, payload: GuestSessionCreate) -> GuestSession:
+        session = GuestSession(
+            id=self._generate_id("GST"),
+            plate_text=payload.plate_text.upper(),
+            start_time=self._now(),
+            status="open",
+        )
+        with self._transaction():
+            self._save("guest_sessions", session)
+        self._cache_guest_session(session)
+        return session
+
+    def close_guest_session(self, session_id: str) -> GuestSession:
+        with self._transaction():
+            session = self._require_guest_session(session_id)
+            if session.status == "open":
+                end_time = self._now()
+                minutes = max(1, int((end_time - session.start_time).total_seconds() // 60))
+                session = session.model_copy(
+                    update={
+                        "end_time": end_time,
+                        "minutes": minutes,
+                        "fee": round(self.compute_guest_fee(minutes), 2),
+                        "status": "closed",
+                    }
+                )
+                self._save("guest_sessions", session)
+        self._cache_guest_session(session)
+        return session
+
+    def pay_guest_session(self, payload: GuestPaymentRequest) -> Payment:
+        with self._transaction():
+            session = self._require_guest_session(payload.session_id)
+            minutes = session.minutes or max(1, int((self._now() - session.start_time).total_seconds() // 60))
+            fee = payload.amount or session.fee or self.compute_guest_fee(minutes)
+            session = session.model_copy(
+                update={
+                    "end_time": session.end_time or self._now(),
+                    "minutes": session.minutes or minutes,
+                    "fee": round(fee, 2),
+                    "status": "paid",
+                }
+            )
+            self._save("guest_sessions", session)
+            processor = "wallet" if payload.payment_source == "wallet" else "touchngo"
+            reference = None
+            if payload.payment_source != "wallet":
+                charge = touchngo_gateway.charge_guest(
+                    session_id=session.id,
+                    amount_rm=fee,
+                    plate_text=session.plate_text,
+                )
+                processor = charge.processor
+                reference = charge.transaction_id
+            payment = self._record_payment(amount=fee, processor=processor, reference=reference, session_id=session.id)
+        self._cache_guest_session(session)
+        return payment
+
+    def list_payments(self) -> List[Payment]:
+        return self._models(Payment, "select * from payments")
+
+    def page_payments(self, query: PageQuery) -> Tuple[List[Payment], Optional[str]]:
+        return self._page_models("payments", Payment, query)
+
+    def get_guest_rate(self) -> GuestRateResponse:
+        row = self._one("select base_rate, per_minute_rate from guest_rates where id = ?", (self.RATE_SINGLETON_ID,))
+        if row is None:
+            return GuestRateResponse(base_rate=settings.base_guest_rate, per_minute_rate=settings.per_minute_guest_rate)
+        return GuestRateResponse(**dict(row))
+
+    def update_guest_rate(self, payload: GuestRateUpdate) -> GuestRateResponse:
+        with self._transaction():
+            self._upsert("guest_rates", {"id": self.RATE_SINGLETON_ID, **payload.model_dump()})
+            return self.get_guest_rate()
+
+    def compute_guest_fee(self, minutes: int) -> float:
+        rate = self.get_guest_rate()
+        return rate.base_rate + rate.per_minute_rate * max(0, minutes)
+
+    # ------------------------------------------------------------------
+    # Client portal / mobile flows
+    # ------------------------------------------------------------------
+    def register_client(self, payload: ClientRegistrationRequest) -> ClientRegistrationResponse:
+        if payload.role == "guest":
+            raise ValueError("Guest role cannot receive parking passes")
+        invalidated: List[str] = []
+        with self._transaction():
+            existing = self._find_user_by_email(payload.email)
+            if existing:
+                user = existing
+                if existing.role != payload.role:
+                    user = existing.model_copy(update={"role": payload.role})
+                    self._save("users", user, wallet_balance=user.wallet_balance or 0)
+            else:
+                user = User(
+                    id=self._generate_id("USR"),
+                    name=payload.name,
+                    email=payload.email,
+                    phone=payload.phone,
+                    role=payload.role,
+                    programme=payload.programme,
+                )
+                self._save("users", user, wallet_balance=0)
+            registration = self._ensure_client_registration(user.id, status="pending")
+            profile = self._ensure_client_profile(user.id, default_status="pending")
+            profile = profile.model_copy(update={"status": "pending", "updated_at": self._now()})
+            self._save("client_profiles", profile, key="user_id")
+            parking_pass = self._first(Pass, "select * from passes where user_id = ? limit 1", (user.id,))
+            application = self._create_pass_application(user.id, payload.role, payload.plan_type, payload.vehicles)
+            for plate in payload.vehicles:
+                normalized = self._normalize_plate(plate)
+                if not normalized or self._one("select 1 from vehicles where plate_key = ?", (normalized,)):
+                    continue
+                self._save_vehicle(Vehicle(id=self._generate_id("VEH"), plate_text=normalized, user_id=user.id))
+                invalidated.append(normalized)
+            vehicles = self._models(Vehicle, "select * from vehicles where user_id = ?", (user.id,))
+            registration = registration.model_copy(update={"status": "pending"})
+            self._save("client_registrations", registration)
+        for plate in invalidated:
+            plate_lookup_cache.invalidate(plate)
+        return ClientRegistrationResponse(
+            registration=registration,
+            profile=profile,
+            user=user,
+            pass_info=parking_pass,
+            vehicles=vehicles,
+            pass_application=application,
+        )
+
+    def signup_portal_user(self, payload: SignupRequest) -> AuthResponse:
+        with self._transaction():
+            if self._find_user_by_email(payload.email):
+                raise ValueError("Email already registered")
+            user = User(
+                id=self._generate_id("USR"),
+                name=payload.name,
+                email=payload.email,
+                phone=payload.phone,
+                role="guest",
+                programme=payload.programme,
+            )
+            self._save("users", user, wallet_balance=0)
+            self._upsert(
+                "user_credentials",
+                {"user_id": user.id, "password_hash": auth_service.hash_password(payload.password)},
+                key="user_id",
+            )
+            self._ensure_client_profile(user.id, default_status="pending")
+        token = auth_service.create_token({"user_id": user.id})
+        return AuthResponse(token=token, user=user)
+
+    def login_portal_user(self, payload: LoginRequest) -> AuthResponse:
+        identifier = payload.identifier.lower()
+        row = self._one(
+            "select u.*, c.password_hash from users u left join user_credentials c on c.user_id = u.id "
+            "where lower(u.email) = ? or lower(u.name) = ? or lower(u.id) = ? limit 1",
+            (identifier, identifier, identifier),
+        )
+        if row is None:
+            raise ValueError("User not found")
+        hashed = row["password_hash"]
+        if not hashed or not auth_service.verify_password(payload.password, hashed):
+            raise ValueError("Invalid credentials")
+        target = self._model(User, row)
+        token = auth_service.create_token({"user_id": target.id})
+        return AuthResponse(token=token, user=target)
+
+    def get_client_summary(self, user_id: str) -> ClientSummary:
+        with self._transaction():
+            user = self._require_user(user_id)
+            pass_info = self._first(Pass, "select * from passes where user_id = ? limit 1", (user_id,))
+            vehicles = self._models(Vehicle, "select * from vehicles where user_id = ?", (user_id,))
+            profile = self._ensure_client_profile(
+                user_id,
+                default_status="active" if user.role != "guest" else "pending",
+            )
+            wallet = self._wallet_snapshot(user_id)
+            guest_sessions = self._guest_sessions_for_user(vehicles)
+            upgrades = self._models(
+                RoleUpgradeRequest,
+                "select * from role_upgrade_requests where user_id = ? order by submitted_at desc",
+                (user_id,),
+            )
+            applications = self._models(
+                PassApplication,
+                "select * from pass_applications where user_id = ? order by submitted_at desc",
+                (user_id,),
+            )
+        return ClientSummary(
+            user=user,
+            pass_info=pass_info,
+            vehicles=vehicles,
+            profile=profile,
+            wallet=wallet,
+            guest_sessions=guest_sessions,
+            role_upgrades=upgrades,
+            pass_applications=applications,
+        )
+
+    def wallet_top_up(self, user_id: str, payload: WalletTopUpRequest) -> ClientWalletActivity:
+        with self._transaction():
+            self._require_user(user_id)
+            charge = touchngo_gateway.charge_wallet_top_up(user_id=user_id, amount_rm=payload.amount)
+            self._apply_wallet_delta(
+                user_id,
+                delta=payload.amount,
+                txn_type="top_up",
+                description=f"Wallet top-up ({payload.source})",
+                source=payload.source,
+            )
+            self._record_payment(
+                amount=payload.amount,
+                processor=charge.processor,
+                reference=charge.transaction_id,
+                session_id=None,
+                pass_id=None,
+            )
+            return self._wallet_activity(user_id)
+
+    def get_wallet_activity(self, user_id: str) -> ClientWalletActivity:
+        with self._transaction():
+            self._require_user(user_id)
+            return self._wallet_activity(user_id)
+
+    def submit_role_upgrade(self, user_id: str, payload: RoleUpgradeSubmit) -> RoleUpgradeRequest:
+        with self._transaction():
+            self._require_user(user_id)
+            request = RoleUpgradeRequest(
+                id=self._generate_id("URQ"),
+                user_id=user_id,
+                target_role=payload.target_role,
+                reason=payload.reason,
+                attachments=payload.attachments,
+                status="pending",
+                submitted_at=self._now(),
+                reviewed_at=None,
+            )
+            self._save("role_upgrade_requests", request)
+            profile = self._ensure_client_profile(user_id)
+            self._save(
+                "client_profiles",
+                profile.model_copy(update={"status": "pending", "updated_at": self._now()}),
+                key="user_id",
+            )
+            return request
+
+    def list_role_upgrades(self, status: Optional[str] = None) -> List[RoleUpgradeRequest]:
+        if status:
+            return self._models(
+                RoleUpgradeRequest,
+                "select * from role_upgrade_requests where status = ? order by submitted_at desc",
+                (status,),
+            )
+        return self._models(RoleUpgradeRequest, "select * from role_upgrade_requests order by submitted_at desc")
+
+    def review_role_upgrade(self, request_id: str, payload: RoleUpgradeDecision) -> RoleUpgradeRequest:
+        with self._transaction():
+            target = self._first(RoleUpgradeRequest, "select * from role_upgrade_requests where id = ?", (request_id,))
+            if target is None:
+                raise KeyError(request_id)
+            owner_id = target.user_id
+            target = target.model_copy(
+                update={
+                    "status": payload.status,
+                    "reviewed_at": self._now(),
+                    "reviewer_id": payload.reviewer_id,
+                }
+            )
+            self._save("role_upgrade_requests", target)
+            if payload.status == "approved":
+                self._exec("update users set role = ? where id = ?", (target.target_role, owner_id))
+                self._summary_write(owner_id)
+                existing = self._first(Pass, "select * from passes where user_id = ? limit 1", (owner_id,))
+                if existing:
+                    self._exec("update passes set role = ? where id = ?", (target.target_role, existing.id))
+            message = (
+                f"Role upgrade request {target.target_role} {payload.status.upper()}"
+                if not payload.note
+                else f"{payload.note}"
+            )
+            self._create_notification(owner_id, message)
+            return target
+
+    def get_parking_overview(self) -> ParkingOverview:
+        return ParkingOverview(venues=self.list_parking_venues())
+
+    def list_parking_venues(self) -> List[ParkingVenueStatus]:
+        return [self._venue_from_row(row) for row in self._query("select * from parking_venues")]
+
+    def _get_parking_venue(self, venue_id: str) -> Optional[ParkingVenueStatus]:
+        row = self._one("select * from parking_venues where id = ?", (venue_id,))
+        return self._venue_from_row(row) if row is not None else None
+
+    def create_parking_venue(self, payload: ParkingVenueCreate) -> ParkingVenueStatus:
+        with self._transaction():
+            venue_id = payload.id or self._generate_id("VEN")
+            if self._get_parking_venue(venue_id):
+                raise ValueError(f"Venue {venue_id} already exists")
+            capacity = max(0, payload.capacity)
+            occupied = max(0, min(capacity, payload.occupied))
+            self._upsert(
+                "parking_venues",
+                {"id": venue_id, "name": payload.name, "capacity": capacity, "occupied": occupied},
+            )
+            return self._get_parking_venue(venue_id)  # type: ignore[return-value]
+
+    def update_parking_venue(self, venue_id: str, payload: ParkingVenueUpdate) -> ParkingVenueStatus:
+        with self._transaction():
+            venue = self._get_parking_venue(venue_id)
+            if venue is None:
+                raise KeyError(venue_id)
+            capacity = max(0, payload.capacity if payload.capacity is not None else venue.capacity)
+            occupied = payload.occupied if payload.occupied is not None else venue.occupied
+            self._upsert(
+                "parking_venues",
+                {
+                    "id": venue_id,
+                    "name": payload.name if payload.name is not None else venue.name,
+                    "capacity": capacity,
+                    "occupied": max(0, min(capacity, occupied)),
+                },
+            )
+            return self._get_parking_venue(venue_id)  # type: ignore[return-value]
+
+    def delete_parking_venue(self, venue_id: str) -> None:
+        with self._transaction():
+            self._exec(
+                "update gates set parking_venue_id = null, parking_direction = null where parking_venue_id = ?",
+                (venue_id,),
+            )
+            if not self._exec("delete from parking_venues where id = ?", (venue_id,)):
+                raise KeyError(venue_id)
+
+    def record_parking_event(self, payload: ParkingEventRequest) -> ParkingVenueStatus:
+        delta = 1 if payload.direction == "entry" else -1
+        with self._transaction():
+            updated = self._exec(
+                "update parking_venues set occupied = max(0, min(capacity, occupied + ?)) where id = ?",
+                (delta, payload.venue_id),
+            )
+            if not updated:
+                raise KeyError(payload.venue_id)
+            self._upsert(
+                "parking_events",
+                {
+                    "id": self._generate_id("PEV"),
+                    "venue_id": payload.venue_id,
+                    "direction": payload.direction,
+                    "delta": delta,
+                    "created_at": self._now().isoformat(),
+                },
+            )
+            return self._get_parking_venue(payload.venue_id)  # type: ignore[return-value]
+
+    def lookup_guest_session(self, session_id: Optional[str] = None, plate_text: Optional[str] = None) -> GuestSessionLookupResponse:
+        if not session_id and not plate_text:
+            raise KeyError("guest_session_lookup_requires_identifier")
+        return self._resolve_guest_session(session_id=session_id, plate_text=plate_text)
+
+    def client_pay_guest_session(self, payload: ClientGuestPaymentRequest) -> Payment:
+        if not payload.session_id:
+            raise ValueError("session_id required")
+        if payload.payment_source == "wallet" and not payload.user_id:
+            raise ValueError("user_id required for wallet payments")
+        with self._transaction():
+            lookup = self._resolve_guest_session(session_id=payload.session_id, plate_text=None)
+            amount_to_pay = round(payload.amount or lookup.amount_due, 2)
+            if payload.payment_source == "wallet" and payload.user_id:
+                self._apply_wallet_delta(
+                    payload.user_id,
+                    delta=-amount_to_pay,
+                    txn_type="guest_payment",
+                    description=f"Guest session {payload.session_id}",
+                    source="wallet",
+                )
+            return self.pay_guest_session(
+                GuestPaymentRequest(
+                    session_id=payload.session_id,
+                    amount=amount_to_pay,
+                    payment_source=payload.payment_source,
+                )
+            )
+
+    # ------------------------------------------------------------------
+    # Utilities
+    # ------------------------------------------------------------------
+    def _require_guest_session(self, session_id: str) -> GuestSession:
+        session = self._first(GuestSession, "select * from guest_sessions where id = ?", (session_id,))
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def _cache_guest_session(self, session: GuestSession) -> None:
+        key = CacheKeys.guest_session(session.plate_text)
+        if session.status == "open":
+            redis_cache.set_json(key, session.model_dump(mode="json"), ttl=self._guest_cache_ttl)
+        else:
+            redis_cache.delete(key)
+            plate_lookup_cache.invalidate(session.plate_text)
+
+    def _require_user(self, user_id: str) -> User:
+        user = self.get_user(user_id)
+        if not user:
+            raise KeyError(user_id)
+        return user
+
+    def _find_user_by_email(self, email: str) -> Optional[User]:
+        return self._first(User, "select * from users where lower(email) = ? limit 1", (email.lower(),))
+
+    def _ensure_client_registration(self, user_id: str, status: str = "pending") -> ClientRegistration:
+        existing = self._first(
+            ClientRegistration, "select * from client_registrations where user_id = ? limit 1", (user_id,)
+        )
+        if existing:
+            return existing
+        registration = ClientRegistration(
+            id=self._generate_id("REG"),
+            user_id=user_id,
+            status=status,
+            submitted_at=self._now(),
+        )
+        self._save("client_registrations", registration)
+        return registration
+
+    def _ensure_client_profile(self, user_id: str, default_status: str = "pending") -> ClientProfile:
+        profile = self._first(ClientProfile, "select * from client_profiles where user_id = ?", (user_id,))
+        if profile:
+            return profile
+        with self._transaction():
+            registration = self._ensure_client_registration(user_id, status=default_status)
+            now = self._now()
+            profile = ClientProfile(
+                user_id=user_id,
+                registration_id=registration.id,
+                status=default_status,
+                guest_pin=f"{randint(1000, 9999)}",
+                wallet_balance=0.0,
+                created_at=now,
+                updated_at=now,
+            )
+            self._save("client_profiles", profile, key="user_id")
+        return profile
+
+    def _ensure_all_client_profiles(self) -> None:
+        missing = self._query(
+            "select u.id from users u left join client_profiles p on p.user_id = u.id where p.user_id is null"
+        )
+        for row in missing:
+            self._ensure_client_profile(row["id"])
+
+    def _wallet_snapshot(self, user_id: str) -> ClientWallet:
+        profile = self._ensure_client_profile(user_id)
+        last_top_up = self._one(
+            "select created_at from wallet_transactions where user_id = ? and type = 'top_up' "
+            "order by created_at desc limit 1",
+            (user_id,),
+        )
+        return ClientWallet(
+            user_id=user_id,
+            balance=round(profile.wallet_balance, 2),
+            last_top_up=last_top_up["created_at"] if last_top_up else None,
+            currency=settings.currency_code,
+        )
+
+    def _wallet_activity(self, user_id: str) -> ClientWalletActivity:
+        wallet = self._wallet_snapshot(user_id)
+        rows = self._query(
+            "select * from wallet_transactions where user_id = ? order by created_at desc limit 20", (user_id,)
+        )
+        return ClientWalletActivity(wallet=wallet, transactions=[self._transaction_from_row(row) for row in rows])
+
+    def _record_payment(
+        self,
+        *,
+        amount: float,
+        processor: str,
+        reference: Optional[str],
+        session_id: Optional[str] = None,
+        pass_id: Optional[str] = None,
+    ) -> Payment:
+        payment = Payment(
+            id=self._generate_id("PAY"),
+            amount=round(amount, 2),
+            status="succeeded",
+            processor=processor,
+            timestamp=self._now(),
+            currency=settings.currency_code,
+            session_id=session_id,
+            pass_id=pass_id,
+            reference=reference,
+        )
+        self._save("payments", payment)
+        return payment
+
+    def _apply_wallet_delta(
+        self,
+        user_id: str,
+        *,
+        delta: float,
+        txn_type: str,
+        description: str,
+        source: str,
+    ) -> WalletTransaction:
+        with self._transaction():
+            profile = self._ensure_client_profile(user_id)
+            new_balance = round(profile.wallet_balance + delta, 2)
+            if new_balance < -1e-6:
+                raise ValueError("Insufficient wallet balance")
+            self._exec(
+                "update client_profiles set wallet_balance = ?, updated_at = ? where user_id = ?",
+                (new_balance, self._now().isoformat(), user_id),
+            )
+            self._summary_write(user_id)
+            transaction = WalletTransaction(
+                id=self._generate_id("TXN"),
+                user_id=user_id,
+                amount=round(delta, 2),
+                type=txn_type,  # type: ignore[arg-type]
+                description=description,
+                timestamp=self._now(),
+                source=source,
+            )
+            self._save_transaction(transaction)
+            return transaction
+
+    def pay_pass_invoice(self, user_id: str, pass_id: str) -> Pass:
+        with self._transaction():
+            parking_pass = self._first(Pass, "select * from passes where id = ?", (pass_id,))
+            if parking_pass is None:
+                raise KeyError(pass_id)
+            if parking_pass.user_id != user_id:
+                raise ValueError("Pass does not belong to user")
+            if parking_pass.is_paid:
+                return parking_pass
+            price = parking_pass.price_rm
+            txn = self._apply_wallet_delta(
+                user_id,
+                delta=-price,
+                txn_type="pass_payment",
+                description=f"Pass {parking_pass.plan_type}",
+                source="wallet",
+            )
+            paid_pass = parking_pass.model_copy(update={"is_paid": True, "paid_at": self._now()})
+            self._save("passes", paid_pass)
+            self._record_payment(amount=price, processor="wallet", reference=txn.id, pass_id=pass_id)
+            self._create_notification(user_id, f"Pass payment received: RM {price:.2f}")
+            return paid_pass
+
+    def _guest_sessions_for_user(self, vehicles: List[Vehicle]) -> List[GuestSession]:
+        plates = sorted({vehicle.plate_text.upper() for vehicle in vehicles})
+        if not plates:
+            return []
+        return self._models(
+            GuestSession,
+            f"select * from guest_sessions where plate_text in ({', '.join('?' * len(plates))}) "
+            "order by start_time desc",
+            plates,
+        )
+
+    def _resolve_guest_session(self, session_id: Optional[str], plate_text: Optional[str]) -> GuestSessionLookupResponse:
+        session: Optional[GuestSession] = None
+        if session_id:
+            session = self._first(GuestSession, "select * from guest_sessions where id = ?", (session_id,))
+        if not session and plate_text:
+            session = self.find_guest_session_by_plate(plate_text, status=None)
+        if not session:
+            raise KeyError(session_id or plate_text or "session")
+        minutes = session.minutes or max(1, int((self._now() - session.start_time).total_seconds() // 60))
+        fee = session.fee or self.compute_guest_fee(minutes)
+        return GuestSessionLookupResponse(session=session, amount_due=round(fee, 2))
+
+    def list_notifications(self, user_id: str) -> List[Notification]:
+        return self._models(
+            Notification, "select * from notifications where user_id = ? order by created_at desc", (user_id,)
+        )
+
+    def acknowledge_notification(self, user_id: str, notification_id: str) -> Notification:
+        with self._transaction():
+            if not self._exec(
+                "update notifications set is_read = 1 where id = ? and user_id = ?", (notification_id, user_id)
+            ):
+                raise KeyError(notification_id)
+            return self._first(Notification, "select * from notifications where id = ?", (notification_id,))  # type: ignore[return-value]
+
+    def _create_notification(self, user_id: str, message: str) -> Notification:
+        note = Notification(
+            id=self._generate_id("NTF"),
+            user_id=user_id,
+            message=message,
+            created_at=self._now(),
+            is_read=False,
+        )
+        self._save("notifications", note)
+        return note
+
+
+__all__ = ["SCHEMA", "SqliteStore"]
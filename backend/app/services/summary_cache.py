@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+
+from app.core.config import settings
+from app.schemas import ClientSummary
+
+from .plate_cache import normalize_plate
+
+# Collections a client summary is assembled from; writes elsewhere never touch it.
+SUMMARY_COLLECTIONS = frozenset(
+    {
+        "users",
+        "vehicles",
+        "passes",
+        "pass_applications",
+        "client_profiles",
+        "wallet_transactions",
+        "role_upgrades",
+        "role_upgrade_requests",
+        "guest_sessions",
+    }
+)
+# Longer than any summary read takes: write marks older than this are dropped.
+BUILD_HORIZON_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class CachedSummary:
+    etag: str
+    body: bytes
+    expires_at: float
+    plates: FrozenSet[str]
+
+
+class ClientSummaryCache:
+    """Serialised ``ClientSummary`` per user, with an ETag for conditional polls.
+
+    The stores call ``invalidate`` whenever they write something a user's
+    summary shows (profile, wallet, pass, vehicles, role upgrades,
+    applications) and ``invalidate_plate`` when a guest session changes; the
+    plate is mapped to its owner through the vehicles of the cached
+    summaries. A summary built while such a write happened is handed back
+    but not kept. The TTL bounds staleness across worker processes, which
+    do not see each other's invalidations; 0 disables the cache.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 4096) -> None:
+        self._ttl = max(0.0, ttl_seconds)
+        self._max_entries = max_entries
+        self._lock = Lock()
+        self._entries: Dict[str, CachedSummary] = {}
+        self._owners: Dict[str, Set[str]] = {}  # normalised plate -> cached users with that vehicle
+        self._written_at: Dict[str, float] = {}  # user -> last invalidation, for reads in flight
+        # Any guest session write: the plate's owner may be mid-read and not cached yet.
+        self._plate_written_at = 0.0
+
+    def get(self, user_id: str) -> Optional[CachedSummary]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry.expires_at < monotonic():
+            with self._lock:
+                if self._entries.get(user_id) is entry:
+                    self._forget(user_id)
+            return None
+        return entry
+
+    def begin(self) -> float:
+        """Token to pass to ``put`` for a summary about to be read from the store."""
+        return monotonic()
+
+    def put(self, user_id: str, started_at: float, summary: ClientSummary) -> CachedSummary:
+        body = summary.model_dump_json().encode()
+        plates = frozenset(normalize_plate(vehicle.plate_text) for vehicle in summary.vehicles)
+        entry = CachedSummary(etag=_etag(body), body=body, expires_at=monotonic() + self._ttl, plates=plates)
+        if not self._ttl:
+            return entry
+        with self._lock:
+            if max(self._written_at.get(user_id, 0.0), self._plate_written_at) >= started_at:
+                return entry  # written to while it was being read
+            if len(self._entries) >= self._max_entries and user_id not in self._entries:
+                self._evict(monotonic())
+            self._forget(user_id)
+            self._entries[user_id] = entry
+            for plate in plates:
+                self._owners.setdefault(plate, set()).add(user_id)
+        return entry
+
+    def invalidate(self, user_id: Optional[str]) -> None:
+        if not user_id:
+            return
+        with self._lock:
+            self._bump(user_id)
+
+    def invalidate_many(self, user_ids: Iterable[Optional[str]]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                if user_id:
+                    self._bump(user_id)
+
+    def invalidate_plate(self, plate_text: Optional[str]) -> None:
+        if not plate_text:
+            return
+        with self._lock:
+            self._plate_written_at = monotonic()
+            for user_id in list(self._owners.get(normalize_plate(plate_text), ())):
+                self._bump(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._owners.clear()
+            self._written_at.clear()
+            self._plate_written_at = monotonic()
+
+    def _bump(self, user_id: str) -> None:
+        now = monotonic()
+        if len(self._written_at) >= self._max_entries:
+            horizon = now - BUILD_HORIZON_SECONDS
+            for stale in [key for key, written_at in self._written_at.items() if written_at < horizon]:
+                del self._written_at[stale]
+        self._written_at[user_id] = now
+        self._forget(user_id)
+
+    def _forget(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        for plate in entry.plates:
+            owners = self._owners.get(plate)
+            if owners is not None:
+                owners.discard(user_id)
+                if not owners:
+                    del self._owners[plate]
+
+    def _evict(self, now: float) -> None:
+        stale = [user_id for user_id, entry in self._entries.items() if entry.expires_at < now]
+        if not stale:
+            # Nothing expired: drop the entries closest to expiry instead.
+            ordered = sorted(self._entries, key=lambda user_id: self._entries[user_id].expires_at)
+            stale = ordered[: max(1, self._max_entries // 8)]
+        for user_id in stale:
+            self._forget(user_id)
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` comparison (weak, so ``W/`` prefixes are ignored)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(candidate == "*" or candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+client_summary_cache = ClientSummaryCache(settings.client_summary_cache_ttl)
+
+__all__ = [
+    "CachedSummary",
+    "ClientSummaryCache",
+    "SUMMARY_COLLECTIONS",
+    "client_summary_cache",
+    "etag_matches",
+]
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from random import randint
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from uuid import uuid4
 
 from loguru import logger
@@ -62,6 +63,9 @@ from app.schemas import (
 
 from .auth import auth_service
 from .cache import CacheKeys, redis_cache
+from .pagination import PageQuery, ResolvedPage, finish_page, resolve_page
+from .plate_cache import plate_lookup_cache
+from .summary_cache import SUMMARY_COLLECTIONS, client_summary_cache
 from .touchngo import touchngo_gateway
 
 
@@ -81,6 +85,11 @@ class SupabaseStore:
         self._wallet_transactions: Dict[str, List[WalletTransaction]] = {}
         self._role_upgrades: Dict[str, List[RoleUpgradeRequest]] = {}
         self._parking_venues: Dict[str, ParkingVenueStatus] = {venue.id: venue for venue in seed.seed_parking_venues()}
+        # Independent PostgREST reads of one request (the client summary) run
+        # side by side here; httpx's sync client is safe to share across threads.
+        self._fanout = ThreadPoolExecutor(
+            max_workers=max(1, settings.supabase_fanout_workers), thread_name_prefix="supabase-fanout"
+        )
 
     # ------------------------------------------------------------------
     # Helpers
@@ -108,12 +117,58 @@ class SupabaseStore:
             raise RuntimeError(response.error.message)
         if not response.data:
             raise RuntimeError(f"Supabase insert into {table} returned no data")
+        self._summary_touched(table, response.data)
         return response.data[0]
 
+    def _write(self, table: str, query) -> List[Dict]:
+        """Run an update / delete and drop the client summaries of the rows it returned."""
+        rows = self._execute(query)
+        self._summary_touched(table, rows)
+        return rows
+
+    @staticmethod
+    def _summary_touched(table: str, rows: List[Dict]) -> None:
+        if table not in SUMMARY_COLLECTIONS:
+            return
+        if table == "guest_sessions":
+            for row in rows:
+                client_summary_cache.invalidate_plate(row.get("plate_text"))
+            return
+        key = "id" if table == "users" else "user_id"
+        client_summary_cache.invalidate_many(row.get(key) for row in rows)
+
     def _single(self, query) -> Optional[Dict]:
         data = self._execute(query.limit(1))
         return data[0] if data else None
 
+    @staticmethod
+    def _quote(value: Any) -> str:
+        # PostgREST logic-tree values are double-quoted so ``,.()`` in ids,
+        # names or ISO timestamps cannot break the ``or`` expression.
+        text = value if isinstance(value, str) else json.dumps(value)
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def _page(self, table: str, query: PageQuery) -> Tuple[List[Dict], ResolvedPage]:
+        """Fetch ``limit + 1`` rows after the cursor, ordered by ``(sort, id)``.
+
+        Served by the ``(sort, id)`` indexes of migration 005.
+        """
+        page = resolve_page(table, query)
+        request = self.client.table(table).select("*")
+        for name, value in page.filters.items():
+            request = request.eq(name, value)
+        if page.after_raw is not None:
+            value, last_id = (self._quote(part) for part in page.after_raw)
+            op = "lt" if page.descending else "gt"
+            request = request.or_(f"{page.sort}.{op}.{value},and({page.sort}.eq.{value},id.{op}.{last_id})")
+        since, until = page.range_raw()
+        if since is not None:
+            request = request.gte(page.range_field, since)
+        if until is not None:
+            request = request.lt(page.range_field, until)
+        request = request.order(page.sort, desc=page.descending).order("id", desc=page.descending)
+        return self._execute(request.limit(page.limit + 1)), page
+
     # ------------------------------------------------------------------
     # Users
     # ------------------------------------------------------------------
@@ -121,10 +176,21 @@ class SupabaseStore:
         data = self._execute(self.client.table("users").select("*").order("name"))
         return [User(**row) for row in data]
 
+    def page_users(self, query: PageQuery) -> Tuple[List[User], Optional[str]]:
+        rows, page = self._page("users", query)
+        return finish_page([User(**row) for row in rows], page)
+
     def get_user(self, user_id: str) -> Optional[User]:
         row = self._single(self.client.table("users").select("*").eq("id", user_id))
         return User(**row) if row else None
 
+    def get_users_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        ids = sorted(set(user_ids))
+        if not ids:
+            return {}
+        data = self._execute(self.client.table("users").select("*").in_("id", ids))
+        return {row["id"]: User(**row) for row in data}
+
     def create_user(self, payload: UserCreate) -> User:
         body = payload.model_dump(exclude={"id"})
         body["id"] = payload.id or self._generate_id("USR")
@@ -143,17 +209,17 @@ class SupabaseStore:
             if not user:
                 raise KeyError(user_id)
             return User(**user)
-        self._execute(self.client.table("users").update(fields).eq("id", user_id))
+        self._write("users", self.client.table("users").update(fields).eq("id", user_id))
         user = self._single(self.client.table("users").select("*").eq("id", user_id))
         if not user:
             raise KeyError(user_id)
         return User(**user)
 
     def delete_user(self, user_id: str) -> None:
-        self._execute(self.client.table("users").delete().eq("id", user_id))
+        self._write("users", self.client.table("users").delete().eq("id", user_id))
         # Cascade cleanup for vehicles/passes to mimic mock behavior
-        self._execute(self.client.table("vehicles").delete().eq("user_id", user_id))
-        self._execute(self.client.table("passes").delete().eq("user_id", user_id))
+        self._write("vehicles", self.client.table("vehicles").delete().eq("user_id", user_id))
+        self._write("passes", self.client.table("passes").delete().eq("user_id", user_id))
 
     # ------------------------------------------------------------------
     # Vehicles
@@ -162,22 +228,32 @@ class SupabaseStore:
         data = self._execute(self.client.table("vehicles").select("*"))
         return [Vehicle(**row) for row in data]
 
+    def page_vehicles(self, query: PageQuery) -> Tuple[List[Vehicle], Optional[str]]:
+        rows, page = self._page("vehicles", query)
+        return finish_page([Vehicle(**row) for row in rows], page)
+
     def create_vehicle(self, payload: VehicleCreate) -> Vehicle:
         body = payload.model_dump(exclude={"id"})
         body["id"] = payload.id or self._generate_id("VEH")
         row = self._insert_row("vehicles", body)
+        plate_lookup_cache.invalidate(row["plate_text"])
         return Vehicle(**row)
 
     def update_vehicle(self, vehicle_id: str, payload: VehicleUpdate) -> Vehicle:
         fields = payload.model_dump(exclude_unset=True)
-        self._execute(self.client.table("vehicles").update(fields).eq("id", vehicle_id))
+        if "user_id" in fields:
+            # The update only returns the new owner; the previous one loses the vehicle.
+            current = self._single(self.client.table("vehicles").select("user_id").eq("id", vehicle_id))
+            client_summary_cache.invalidate(current and current.get("user_id"))
+        self._write("vehicles", self.client.table("vehicles").update(fields).eq("id", vehicle_id))
         data = self._single(self.client.table("vehicles").select("*").eq("id", vehicle_id))
         if not data:
             raise KeyError(vehicle_id)
+        plate_lookup_cache.invalidate(data["plate_text"])
         return Vehicle(**data)
 
     def delete_vehicle(self, vehicle_id: str) -> None:
-        self._execute(self.client.table("vehicles").delete().eq("id", vehicle_id))
+        self._write("vehicles", self.client.table("vehicles").delete().eq("id", vehicle_id))
 
     # ------------------------------------------------------------------
     # Passes
@@ -186,6 +262,10 @@ class SupabaseStore:
         data = self._execute(self.client.table("passes").select("*"))
         return [Pass(**row) for row in data]
 
+    def page_passes(self, query: PageQuery) -> Tuple[List[Pass], Optional[str]]:
+        rows, page = self._page("passes", query)
+        return finish_page([Pass(**row) for row in rows], page)
+
     def create_pass(self, payload: PassCreate) -> Pass:
         user = self.get_user(payload.user_id)
         if not user:
@@ -226,14 +306,14 @@ class SupabaseStore:
                 f"{plan.label} pass updated. Pay RM {plan.price_rm:.2f} via wallet.",
             )
         if fields:
-            self._execute(self.client.table("passes").update(fields).eq("id", pass_id))
+            self._write("passes", self.client.table("passes").update(fields).eq("id", pass_id))
         data = self._single(self.client.table("passes").select("*").eq("id", pass_id))
         if not data:
             raise KeyError(pass_id)
         return Pass(**data)
 
     def delete_pass(self, pass_id: str) -> None:
-        self._execute(self.client.table("passes").delete().eq("id", pass_id))
+        self._write("passes", self.client.table("passes").delete().eq("id", pass_id))
 
     def get_latest_pass(self, user_id: str) -> Optional[Pass]:
         row = self._single(
@@ -251,6 +331,10 @@ class SupabaseStore:
         rows = self._execute(query)
         return [self._pass_application_from_row(row) for row in rows]
 
+    def page_pass_applications(self, query: PageQuery) -> Tuple[List[PassApplication], Optional[str]]:
+        rows, page = self._page("pass_applications", query)
+        return finish_page([self._pass_application_from_row(row) for row in rows], page)
+
     def review_pass_application(self, app_id: str, payload: PassApplicationDecision) -> PassApplication:
         application_row = self._single(self.client.table("pass_applications").select("*").eq("id", app_id))
         if not application_row:
@@ -270,7 +354,7 @@ class SupabaseStore:
             "review_note": review_note,
             "reviewed_at": now_iso,
         }
-        self._execute(self.client.table("pass_applications").update(update_fields).eq("id", app_id))
+        self._write("pass_applications", self.client.table("pass_applications").update(update_fields).eq("id", app_id))
         updated_row = self._single(self.client.table("pass_applications").select("*").eq("id", app_id))
         application = self._pass_application_from_row(updated_row)
         if payload.status == "approved":
@@ -311,6 +395,141 @@ class SupabaseStore:
         self._create_notification(user_id, f"{plan.label} pass issued. Pay RM {plan.price_rm:.2f} via wallet.")
         return Pass(**row)
 
+    # ------------------------------------------------------------------
+    # Bulk import
+    # ------------------------------------------------------------------
+    # Per chunk: one ``in_`` query per conflict check and one multi-row
+    # insert per table, instead of 2-3 round trips per row. Returns one error
+    # message (or ``None`` for created) per payload, in order.
+    def _existing(self, table: str, column: str, keys: Iterable[str]) -> Set[str]:
+        keys = sorted(set(keys))
+        if not keys:
+            return set()
+        return {row[column] for row in self._execute(self.client.table(table).select(column).in_(column, keys))}
+
+    def _insert_rows(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        errors: List[Optional[str]],
+        slots: List[int],
+        failure: str = "Insert into {table} failed",
+    ) -> bool:
+        """Multi-row insert; if it fails, every row it carried (``slots``) reports ``failure``."""
+        if not rows:
+            return True
+        try:
+            self._summary_touched(table, self._execute(self.client.table(table).insert(rows)))
+        except Exception as exc:  # pragma: no cover - depends on Supabase
+            for slot in slots:
+                errors[slot] = f"{failure.format(table=table)}: {exc}"
+            return False
+        return True
+
+    def bulk_create_users(self, payloads: Sequence[UserCreate], password_hashes: Sequence[str]) -> List[Optional[str]]:
+        bodies = [
+            {**payload.model_dump(exclude={"id"}), "id": payload.id or self._generate_id("USR")} for payload in payloads
+        ]
+        taken_ids = self._existing("users", "id", (body["id"] for body in bodies))
+        taken_emails = self._existing("users", "email", (body["email"] for body in bodies))
+        errors: List[Optional[str]] = []
+        rows: List[Dict[str, Any]] = []
+        credentials: List[Dict[str, Any]] = []
+        slots: List[int] = []
+        for body, hashed in zip(bodies, password_hashes):
+            if body["id"] in taken_ids:
+                errors.append(f"User {body['id']} already exists")
+            elif body["email"] in taken_emails:
+                errors.append(f"Email {body['email']} already registered")
+            else:
+                taken_ids.add(body["id"])
+                taken_emails.add(body["email"])
+                rows.append({**body, "wallet_balance": body.get("wallet_balance") or 0})
+                credentials.append({"user_id": body["id"], "password_hash": hashed})
+                slots.append(len(errors))
+                errors.append(None)
+        if self._insert_rows("users", rows, errors, slots):
+            failure = "User created but its portal credentials were not saved"
+            self._insert_rows("user_credentials", credentials, errors, slots, failure=failure)
+        return errors
+
+    def bulk_create_vehicles(self, payloads: Sequence[VehicleCreate]) -> List[Optional[str]]:
+        bodies = [
+            {**payload.model_dump(exclude={"id"}), "id": payload.id or self._generate_id("VEH")} for payload in payloads
+        ]
+        users = self._existing("users", "id", (body["user_id"] for body in bodies))
+        taken_ids = self._existing("vehicles", "id", (body["id"] for body in bodies))
+        taken_plates = self._existing("vehicles", "plate_text", (body["plate_text"] for body in bodies))
+        errors: List[Optional[str]] = []
+        rows: List[Dict[str, Any]] = []
+        slots: List[int] = []
+        for body in bodies:
+            if body["user_id"] not in users:
+                errors.append(f"Unknown user_id {body['user_id']}")
+            elif body["id"] in taken_ids:
+                errors.append(f"Vehicle {body['id']} already exists")
+            elif body["plate_text"] in taken_plates:
+                errors.append(f"Plate {body['plate_text']} already registered")
+            else:
+                taken_ids.add(body["id"])
+                taken_plates.add(body["plate_text"])
+                rows.append(body)
+                slots.append(len(errors))
+                errors.append(None)
+        if self._insert_rows("vehicles", rows, errors, slots):
+            for row in rows:
+                plate_lookup_cache.invalidate(row["plate_text"])
+        return errors
+
+    def bulk_create_passes(self, payloads: Sequence[PassCreate]) -> List[Optional[str]]:
+        users = self._existing("users", "id", (payload.user_id for payload in payloads))
+        taken_ids = self._existing("passes", "id", (payload.id for payload in payloads if payload.id))
+        now = self._now()
+        errors: List[Optional[str]] = []
+        rows: List[Dict[str, Any]] = []
+        notes: List[Dict[str, Any]] = []
+        slots: List[int] = []
+        for payload in payloads:
+            if payload.user_id not in users:
+                errors.append(f"Unknown user_id {payload.user_id}")
+                continue
+            if payload.id and payload.id in taken_ids:
+                errors.append(f"Pass {payload.id} already exists")
+                continue
+            starts_at = payload.starts_at or now
+            valid_from, valid_to, plan = compute_validity_window(payload.plan_type, starts_at=starts_at)
+            pass_id = payload.id or self._generate_id("PASS")
+            taken_ids.add(pass_id)
+            rows.append(
+                {
+                    "id": pass_id,
+                    "user_id": payload.user_id,
+                    "role": payload.role,
+                    "plan_type": plan.plan_type,
+                    "valid_from": valid_from.isoformat(),
+                    "valid_to": valid_to.isoformat(),
+                    "price_rm": plan.price_rm,
+                    "is_paid": False,
+                    "paid_at": None,
+                }
+            )
+            notes.append(
+                {
+                    "id": self._generate_id("NTF"),
+                    "user_id": payload.user_id,
+                    "message": f"{plan.label} pass issued. Pay RM {plan.price_rm:.2f} via wallet.",
+                    "is_read": False,
+                }
+            )
+            slots.append(len(errors))
+            errors.append(None)
+        if self._insert_rows("passes", rows, errors, slots) and notes:
+            try:
+                self._execute(self.client.table("notifications").insert(notes))
+            except Exception as exc:  # pragma: no cover - depends on Supabase
+                logger.warning("Imported {} passes but their notifications failed: {}", len(rows), exc)
+        return errors
+
     # ------------------------------------------------------------------
     # Access events
     # ------------------------------------------------------------------
@@ -323,6 +542,10 @@ class SupabaseStore:
         )
         return [AccessEvent(**row) for row in data]
 
+    def page_access_events(self, query: PageQuery) -> Tuple[List[AccessEvent], Optional[str]]:
+        rows, page = self._page("access_events", query)
+        return finish_page([AccessEvent(**row) for row in rows], page)
+
     def add_access_event(self, payload: AccessEventBase) -> AccessEvent:
         body = payload.model_dump()
         body["id"] = self._generate_id("EVT")
@@ -333,13 +556,13 @@ class SupabaseStore:
         return event
 
     def find_user_by_plate(self, plate_text: str) -> Tuple[Optional[User], Optional[Vehicle]]:
-        normalized = self._normalize_plate(plate_text)
-        for vehicle in self.list_vehicles():
-            if self._normalize_plate(vehicle.plate_text) == normalized:
-                user_data = self._single(self.client.table("users").select("*").eq("id", vehicle.user_id))
-                user = User(**user_data) if user_data else None
-                return user, vehicle
-        return None, None
+        row = self._single(
+            self.client.table("vehicles").select("*", "users(*)").eq("plate_key", self._normalize_plate(plate_text))
+        )
+        if not row:
+            return None, None
+        user_row = row.pop("users", None)
+        return (User(**user_row) if user_row else None), Vehicle(**row)
 
     # ------------------------------------------------------------------
     # Gates
@@ -383,6 +606,10 @@ class SupabaseStore:
         data = self._execute(self.client.table("guest_sessions").select("*").order("start_time", desc=True))
         return [GuestSession(**row) for row in data]
 
+    def page_guest_sessions(self, query: PageQuery) -> Tuple[List[GuestSession], Optional[str]]:
+        rows, page = self._page("guest_sessions", query)
+        return finish_page([GuestSession(**row) for row in rows], page)
+
     def find_guest_session_by_plate(self, plate_text: str, status: Optional[str] = None) -> Optional[GuestSession]:
         normalized = plate_text.upper()
         cached = redis_cache.get_json(CacheKeys.guest_session(normalized))
@@ -425,7 +652,7 @@ class SupabaseStore:
             "fee": round(fee, 2),
             "status": "closed",
         }
-        self._execute(self.client.table("guest_sessions").update(update_fields).eq("id", session_id))
+        self._write("guest_sessions", self.client.table("guest_sessions").update(update_fields).eq("id", session_id))
         updated_row = self._single(self.client.table("guest_sessions").select("*").eq("id", session_id))
         if not updated_row:
             raise KeyError(session_id)
@@ -443,7 +670,7 @@ class SupabaseStore:
             "fee": round(fee, 2),
             "status": "paid",
         }
-        self._execute(self.client.table("guest_sessions").update(update_fields).eq("id", session.id))
+        self._write("guest_sessions", self.client.table("guest_sessions").update(update_fields).eq("id", session.id))
         updated_row = self._single(self.client.table("guest_sessions").select("*").eq("id", session.id))
         if not updated_row:
             raise KeyError(session.id)
@@ -471,6 +698,10 @@ class SupabaseStore:
         data = self._execute(self.client.table("payments").select("*").order("timestamp", desc=True))
         return [Payment(**row) for row in data]
 
+    def page_payments(self, query: PageQuery) -> Tuple[List[Payment], Optional[str]]:
+        rows, page = self._page("payments", query)
+        return finish_page([Payment(**row) for row in rows], page)
+
     # ------------------------------------------------------------------
     # Guest rates
     # ------------------------------------------------------------------
@@ -609,31 +840,44 @@ class SupabaseStore:
         return AuthResponse(token=token, user=user)
 
     def get_client_summary(self, user_id: str) -> ClientSummary:
-        user = self.get_user(user_id)
+        """Assemble the portal summary in two round trips instead of one per section.
+
+        The user, pass, vehicles, wallet transactions, role upgrades and
+        applications are fetched concurrently on ``_fanout``; guest sessions
+        for every plate follow the vehicles as a single ``in`` query.
+        """
+        fanout = self._fanout
+        user_f = fanout.submit(self.get_user, user_id)
+        pass_f = fanout.submit(self._single, self.client.table("passes").select("*").eq("user_id", user_id))
+        vehicles_f = fanout.submit(self._vehicles_with_guest_sessions, user_id)
+        transactions_f = fanout.submit(self._wallet_transactions_for_user, user_id, 20)
+        upgrades_f = fanout.submit(self._fetch_role_upgrades, user_id)
+        applications_f = fanout.submit(
+            self._execute,
+            self.client.table("pass_applications").select("*").eq("user_id", user_id).order("submitted_at", desc=True),
+        )
+        user = user_f.result()
         if not user:
             raise KeyError(user_id)
-        pass_row = self._single(self.client.table("passes").select("*").eq("user_id", user_id))
-        pass_info = Pass(**pass_row) if pass_row else None
-        vehicles = [Vehicle(**row) for row in self._execute(self.client.table("vehicles").select("*").eq("user_id", user_id))]
+        pass_row = pass_f.result()
+        vehicles, guest_sessions = vehicles_f.result()
         profile = self._ensure_client_profile(user_id, status="active" if user.role != "guest" else "pending")
-        wallet = self._wallet_snapshot(user_id)
-        guest_sessions = self._guest_sessions_for_user(vehicles)
-        upgrades = self._fetch_role_upgrades(user_id)
-        application_rows = self._execute(
-            self.client.table("pass_applications").select("*").eq("user_id", user_id).order("submitted_at", desc=True)
-        )
-        applications = [self._pass_application_from_row(row) for row in application_rows]
         return ClientSummary(
             user=user,
-            pass_info=pass_info,
+            pass_info=Pass(**pass_row) if pass_row else None,
             vehicles=vehicles,
             profile=profile,
-            wallet=wallet,
+            wallet=self._wallet_from(user, transactions_f.result()),
             guest_sessions=guest_sessions,
-            role_upgrades=upgrades,
-            pass_applications=applications,
+            role_upgrades=upgrades_f.result(),
+            pass_applications=[self._pass_application_from_row(row) for row in applications_f.result()],
         )
 
+    def _vehicles_with_guest_sessions(self, user_id: str) -> Tuple[List[Vehicle], List[GuestSession]]:
+        rows = self._execute(self.client.table("vehicles").select("*").eq("user_id", user_id))
+        vehicles = [Vehicle(**row) for row in rows]
+        return vehicles, self._guest_sessions_for_user(vehicles)
+
     def wallet_top_up(self, user_id: str, payload: WalletTopUpRequest) -> ClientWalletActivity:
         charge = touchngo_gateway.charge_wallet_top_up(user_id=user_id, amount_rm=payload.amount)
         self._apply_wallet_delta(
@@ -662,6 +906,7 @@ class SupabaseStore:
         row = self._insert_row("role_upgrade_requests", body)
         profile = self._ensure_client_profile(user_id)
         self._client_profiles[user_id] = profile.model_copy(update={"status": "pending", "updated_at": self._now()})
+        client_summary_cache.invalidate(user_id)
         return RoleUpgradeRequest(**row)
 
     def list_role_upgrades(self, status: Optional[str] = None) -> List[RoleUpgradeRequest]:
@@ -680,10 +925,14 @@ class SupabaseStore:
             "reviewer_id": payload.reviewer_id,
             "reviewed_at": self._now().isoformat(),
         }
-        self._execute(self.client.table("role_upgrade_requests").update(update_fields).eq("id", request_id))
+        self._write(
+            "role_upgrade_requests",
+            self.client.table("role_upgrade_requests").update(update_fields).eq("id", request_id),
+        )
         if payload.status == "approved":
-            self._execute(self.client.table("users").update({"role": row["target_role"]}).eq("id", row["user_id"]))
-            self._execute(self.client.table("passes").update({"role": row["target_role"]}).eq("user_id", row["user_id"]))
+            role = {"role": row["target_role"]}
+            self._write("users", self.client.table("users").update(role).eq("id", row["user_id"]))
+            self._write("passes", self.client.table("passes").update(role).eq("user_id", row["user_id"]))
         message = payload.note or f"Role upgrade to {row['target_role']} {payload.status.upper()}"
         self._create_notification(row["user_id"], message)
         row.update(update_fields)
@@ -839,6 +1088,7 @@ class SupabaseStore:
             redis_cache.set_json(key, session.model_dump(mode="json"), ttl=4 * 60 * 60)
         else:
             redis_cache.delete(key)
+            plate_lookup_cache.invalidate(session.plate_text)
 
     def _get_guest_session(self, session_id: str) -> GuestSession:
         data = self._single(self.client.table("guest_sessions").select("*").eq("id", session_id))
@@ -886,10 +1136,13 @@ class SupabaseStore:
         user = self.get_user(user_id)
         if not user:
             raise KeyError(user_id)
-        transactions = self._wallet_transactions_for_user(user_id, limit=20)
+        return self._wallet_from(user, self._wallet_transactions_for_user(user_id, limit=20))
+
+    @staticmethod
+    def _wallet_from(user: User, transactions: List[WalletTransaction]) -> ClientWallet:
         last_top_up = next((txn.timestamp for txn in transactions if txn.type == "top_up"), None)
         return ClientWallet(
-            user_id=user_id,
+            user_id=user.id,
             balance=round(user.wallet_balance or 0.0, 2),
             last_top_up=last_top_up,
             currency=settings.currency_code,
@@ -942,7 +1195,7 @@ class SupabaseStore:
         new_balance = round((user.wallet_balance or 0.0) + delta, 2)
         if new_balance < -1e-6:
             raise ValueError("Insufficient wallet balance")
-        self._execute(self.client.table("users").update({"wallet_balance": new_balance}).eq("id", user_id))
+        self._write("users", self.client.table("users").update({"wallet_balance": new_balance}).eq("id", user_id))
         txn_body = {
             "id": self._generate_id("TXN"),
             "user_id": user_id,
@@ -979,26 +1232,20 @@ class SupabaseStore:
             source="wallet",
         )
         update_fields = {"is_paid": True, "paid_at": self._now().isoformat()}
-        self._execute(self.client.table("passes").update(update_fields).eq("id", pass_id))
+        self._write("passes", self.client.table("passes").update(update_fields).eq("id", pass_id))
         updated = self._single(self.client.table("passes").select("*").eq("id", pass_id))
         self._record_payment(amount=price, processor="wallet", reference=txn.id, pass_id=pass_id)
         self._create_notification(user_id, f"Pass payment received: RM {price:.2f}")
         return Pass(**updated)
 
     def _guest_sessions_for_user(self, vehicles: List[Vehicle]) -> List[GuestSession]:
-        if not vehicles:
+        plates = sorted({vehicle.plate_text.upper() for vehicle in vehicles})
+        if not plates:
             return []
-        sessions: List[GuestSession] = []
-        for vehicle in vehicles:
-            data = self._execute(
-                self.client.table("guest_sessions")
-                .select("*")
-                .eq("plate_text", vehicle.plate_text.upper())
-                .order("start_time", desc=True)
-            )
-            sessions.extend(GuestSession(**row) for row in data)
-        sessions.sort(key=lambda s: s.start_time, reverse=True)
-        return sessions
+        data = self._execute(
+            self.client.table("guest_sessions").select("*").in_("plate_text", plates).order("start_time", desc=True)
+        )
+        return [GuestSession(**row) for row in data]
 
     def _fetch_role_upgrades(self, user_id: str) -> List[RoleUpgradeRequest]:
         rows = (
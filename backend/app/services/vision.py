@@ -108,12 +108,14 @@ class VisionPipeline:
         self._ensure_loaded()
         return self._model is not None and self._reader is not None
 
-    def detect_from_base64(self, image_base64: str) -> Optional[VisionDetection]:
+    def detect_from_base64(self, image_base64: str, frame: Optional[np.ndarray] = None) -> Optional[VisionDetection]:
+        """Detect a plate; pass ``frame`` when the caller has already decoded the payload."""
         fingerprint = self._fingerprint(image_base64)
         cached = self._get_cached_detection(fingerprint)
         if cached:
             return cached
-        frame = self._decode_frame(image_base64)
+        if frame is None:
+            frame = decode_base64_frame(image_base64)
         if frame is None:
             return None
         detection = self.detect_from_frame(frame)
@@ -262,17 +264,6 @@ class VisionPipeline:
                 return idx
         return None
 
-    @staticmethod
-    def _decode_frame(image_base64: str) -> Optional[np.ndarray]:
-        try:
-            frame_bytes = base64.b64decode(image_base64)
-            np_arr = np.frombuffer(frame_bytes, dtype=np.uint8)
-            frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-            return frame
-        except Exception as exc:  # pragma: no cover
-            logger.warning("Failed to decode base64 frame: {}", exc)
-            return None
-
     def _fingerprint(self, payload: str) -> Optional[str]:
         if not payload or not self._cache_ttl:
             return None
@@ -302,6 +293,17 @@ class VisionPipeline:
             self._last_detection_ts = monotonic()
 
 
+def decode_base64_frame(image_base64: str) -> Optional[np.ndarray]:
+    try:
+        frame_bytes = base64.b64decode(image_base64)
+        np_arr = np.frombuffer(frame_bytes, dtype=np.uint8)
+        frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+        return frame
+    except Exception as exc:  # pragma: no cover
+        logger.warning("Failed to decode base64 frame: {}", exc)
+        return None
+
+
 vision_pipeline = VisionPipeline()
 
-__all__ = ["vision_pipeline", "VisionDetection"]
+__all__ = ["decode_base64_frame", "vision_pipeline", "VisionDetection"]
@@ -0,0 +1,18 @@
+-- (sort column, id) indexes for the keyset-paginated admin lists: each page
+-- is an index range scan from the cursor, whatever its depth.
+create index if not exists users_name_page_idx on public.users (name, id);
+create index if not exists users_email_page_idx on public.users (email, id);
+
+create index if not exists vehicles_plate_page_idx on public.vehicles (plate_text, id);
+create index if not exists vehicles_user_idx on public.vehicles (user_id);
+
+create index if not exists passes_valid_to_page_idx on public.passes (valid_to, id);
+create index if not exists passes_valid_from_page_idx on public.passes (valid_from, id);
+create index if not exists passes_user_idx on public.passes (user_id, valid_to);
+
+create index if not exists guest_sessions_start_page_idx on public.guest_sessions (start_time, id);
+
+create index if not exists payments_timestamp_page_idx on public.payments (timestamp, id);
+
+create index if not exists pass_applications_submitted_page_idx on public.pass_applications (submitted_at, id);
+create index if not exists pass_applications_status_page_idx on public.pass_applications (status, submitted_at, id);
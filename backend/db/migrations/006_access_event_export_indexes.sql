@@ -0,0 +1,4 @@
+-- (timestamp, id) indexes for the keyset-paged access event export; the
+-- gate variant serves the common "one gate over a date range" audit pull.
+create index if not exists access_events_timestamp_page_idx on public.access_events (timestamp, id);
+create index if not exists access_events_gate_page_idx on public.access_events (gate, timestamp, id);
@@ -0,0 +1,17 @@
+-- Normalised plate (upper case, every run of punctuation/whitespace folded to
+-- one space, trimmed - the same as normalize_plate and SqliteStore's plate_key)
+-- so a gate resolves a plate with one indexed equality instead of scanning
+-- every vehicle.
+alter table if exists public.vehicles
+    add column if not exists plate_key text
+    generated always as (btrim(regexp_replace(upper(plate_text), '[^[:alnum:]]+', ' ', 'g'))) stored;
+
+create index if not exists vehicles_plate_key_idx on public.vehicles (plate_key);
+
+-- The lookup embeds the owner (select=*,users(*)); PostgREST resolves the
+-- embedding through this foreign key.
+alter table if exists public.vehicles
+    drop constraint if exists vehicles_user_id_fkey;
+
+alter table if exists public.vehicles
+    add constraint vehicles_user_id_fkey foreign key (user_id) references public.users (id) on delete cascade;
@@ -0,0 +1,148 @@
+"""Compare gate-decision latency across the datastore backends.
+
+One decision is the store work ``InferenceService`` does per plate read:
+``get_gate_by_slug`` + ``find_user_by_plate`` + ``get_latest_pass`` and, unless
+``--read-only``, ``add_access_event``. Timed against:
+
+* memory - ``MockDatabase`` (volatile);
+* sqlite - ``SqliteStore`` on a fresh file under ``--dir``;
+* supabase - ``SupabaseStore`` with the configured project (``--supabase``;
+  not populated, probes the plates already there).
+
+memory and sqlite are filled with ``--users`` users (one vehicle and one pass
+each). Redis caches are disabled so only the store is measured.
+
+Usage:
+    python -m scripts.bench_backends --users 10000 --decisions 5000
+    python -m scripts.bench_backends --supabase --decisions 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, List
+
+from app.schemas import AccessEventBase, Pass, User, Vehicle
+from app.services.cache import redis_cache
+from app.services.datastore import MockDatabase
+from app.services.sqlite_store import SqliteStore
+
+
+def bench_user(idx: int) -> User:
+    return User(
+        id=f"USR-B{idx:07d}",
+        name=f"Bench User {idx}",
+        email=f"bench{idx}@smartgate.demo",
+        phone="+60123456789",
+        role="student",
+        programme="Benchmark",
+    )
+
+
+def bench_pass(idx: int, now: datetime) -> Pass:
+    return Pass(
+        id=f"PASS-B{idx:07d}",
+        user_id=f"USR-B{idx:07d}",
+        role="student",
+        plan_type="annual",
+        valid_from=now,
+        valid_to=now + timedelta(days=365),
+        price_rm=0.0,
+        is_paid=True,
+    )
+
+
+def populate_memory(db: MockDatabase, size: int) -> None:
+    now = datetime.now(timezone.utc)
+    with db._lock:
+        for idx in range(size):
+            db._put("users", bench_user(idx))
+            db._put("vehicles", Vehicle(id=f"VEH-B{idx:07d}", plate_text=f"BEN {idx}", user_id=f"USR-B{idx:07d}"))
+            db._put("passes", bench_pass(idx, now))
+
+
+def populate_sqlite(db: SqliteStore, size: int) -> None:
+    now = datetime.now(timezone.utc)
+    with db._transaction():
+        for idx in range(size):
+            db._save("users", bench_user(idx), wallet_balance=0)
+            db._save_vehicle(Vehicle(id=f"VEH-B{idx:07d}", plate_text=f"BEN {idx}", user_id=f"USR-B{idx:07d}"))
+            db._save("passes", bench_pass(idx, now))
+
+
+def decide(store: Any, gate: str, plate: str, write: bool) -> None:
+    store.get_gate_by_slug(gate)
+    user, _ = store.find_user_by_plate(plate)
+    latest = store.get_latest_pass(user.id) if user else None
+    if write:
+        store.add_access_event(
+            AccessEventBase(
+                plate_text=plate,
+                confidence=0.9,
+                decision="ALLOW" if latest else "DENY",
+                gate=gate,
+                role=user.role if user else "guest",
+                reason="bench",
+            )
+        )
+
+
+def run(name: str, store: Any, plates: List[str], decisions: int, write: bool) -> None:
+    gate = store.list_gates()[0].slug
+    decide(store, gate, plates[0], write)  # warm connections / statement cache
+    samples = []
+    for idx in range(decisions):
+        plate = plates[(idx * 7919) % len(plates)]
+        started = perf_counter()
+        decide(store, gate, plate, write)
+        samples.append((perf_counter() - started) * 1_000_000)
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{name:<9} p50={median(samples):9.1f}us p99={p99:9.1f}us mean={sum(samples) / len(samples):9.1f}us")
+
+
+def main(users: int, decisions: int, directory: str, write: bool, supabase: bool) -> None:
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    redis_cache.delete = lambda key: None  # type: ignore[method-assign]
+    plates = [f"ben-{idx}" for idx in range(users)]
+    print(f"users={users} decisions={decisions} writes={'on' if write else 'off'}")
+
+    memory = MockDatabase()
+    populate_memory(memory, users)
+    run("memory", memory, plates, decisions, write)
+
+    path = Path(directory) / "bench.sqlite"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    sqlite = SqliteStore(str(path))
+    started = perf_counter()
+    populate_sqlite(sqlite, users)
+    print(f"sqlite    loaded in {perf_counter() - started:.2f}s ({path})")
+    run("sqlite", sqlite, plates, decisions, write)
+    sqlite.close()
+
+    if supabase:
+        from app.services.supabase_store import SupabaseStore
+
+        remote = SupabaseStore()
+        remote_plates = [vehicle.plate_text for vehicle in remote.list_vehicles()] or ["UNKNOWN"]
+        run("supabase", remote, remote_plates, decisions, write)
+    else:
+        print("supabase  skipped (pass --supabase with SUPABASE_URL / SUPABASE_KEY set)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--decisions", type=int, default=5_000)
+    parser.add_argument("--dir", default=tempfile.gettempdir())
+    parser.add_argument("--read-only", action="store_true", help="skip the access-event insert")
+    parser.add_argument("--supabase", action="store_true")
+    args = parser.parse_args()
+    main(args.users, args.decisions, args.dir, not args.read_only, args.supabase)
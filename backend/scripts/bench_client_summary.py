@@ -0,0 +1,183 @@
+"""Client summary latency against PostgREST: sequential reads vs the fan-out builder.
+
+A local HTTP server stands in for PostgREST: it answers every
+``/rest/v1/<table>`` read with a few canned rows after ``--rtt-ms``, so the
+real ``supabase`` client and ``SupabaseStore`` code run unchanged and only
+the network round trip is simulated. Two assemblies are timed:
+
+* sequential - the previous ``get_client_summary``: one read after another,
+  guest sessions one query per vehicle, the user fetched twice;
+* fanout - ``SupabaseStore.get_client_summary``.
+
+``requests`` counts the HTTP calls one summary makes.
+
+Usage:
+    python -m scripts.bench_client_summary --rtt-ms 20 40 80 --vehicles 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+from threading import Lock, Thread
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, List
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from app.core.config import settings
+from app.schemas import ClientSummary, GuestSession, Pass, Vehicle
+from app.services.supabase_store import SupabaseStore
+
+USER_ID = "USR-BENCH"
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def canned_rows(vehicles: int) -> Dict[str, List[Dict[str, Any]]]:
+    plates = [f"BEN {idx}" for idx in range(vehicles)]
+    return {
+        "users": [
+            {
+                "id": USER_ID,
+                "name": "Bench User",
+                "email": "bench@smartgate.demo",
+                "phone": "+60123456789",
+                "role": "student",
+                "programme": "Benchmark",
+                "wallet_balance": 12.5,
+            }
+        ],
+        "passes": [
+            {
+                "id": "PASS-BENCH",
+                "user_id": USER_ID,
+                "role": "student",
+                "plan_type": "annual",
+                "valid_from": NOW.isoformat(),
+                "valid_to": (NOW + timedelta(days=365)).isoformat(),
+                "price_rm": 150.0,
+                "is_paid": True,
+            }
+        ],
+        "vehicles": [{"id": f"VEH-B{idx}", "plate_text": plate, "user_id": USER_ID} for idx, plate in enumerate(plates)],
+        "guest_sessions": [
+            {"id": f"GST-B{idx}", "plate_text": plate, "start_time": NOW.isoformat(), "status": "closed"}
+            for idx, plate in enumerate(plates)
+        ],
+        "wallet_transactions": [
+            {
+                "id": "TXN-B0",
+                "user_id": USER_ID,
+                "amount": 20.0,
+                "type": "top_up",
+                "description": "Wallet top-up",
+                "created_at": NOW.isoformat(),
+                "source": "touchngo",
+            }
+        ],
+    }
+
+
+class FakePostgrest(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rtt: float, rows: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.rtt = rtt
+        self.rows = rows
+        self.requests = 0
+        self.count_lock = Lock()
+        super().__init__(("127.0.0.1", 0), _Handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakePostgrest
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # no delayed-ACK stalls on top of the simulated RTT
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))  # postgrest-py sends "{}" on GETs
+        with self.server.count_lock:
+            self.server.requests += 1
+        sleep(self.server.rtt)
+        table = urlparse(self.path).path.rsplit("/", 1)[-1]
+        body = json.dumps(self.server.rows.get(table, [])).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+def sequential_summary(store: SupabaseStore, user_id: str) -> ClientSummary:
+    """The summary as it was assembled before the fan-out builder."""
+    user = store.get_user(user_id)
+    if not user:
+        raise KeyError(user_id)
+    pass_row = store._single(store.client.table("passes").select("*").eq("user_id", user_id))
+    vehicle_rows = store._execute(store.client.table("vehicles").select("*").eq("user_id", user_id))
+    vehicles = [Vehicle(**row) for row in vehicle_rows]
+    profile = store._ensure_client_profile(user_id, status="active")
+    wallet = store._wallet_snapshot(user_id)
+    sessions: List[GuestSession] = []
+    for vehicle in vehicles:
+        rows = store._execute(
+            store.client.table("guest_sessions").select("*").eq("plate_text", vehicle.plate_text.upper())
+        )
+        sessions.extend(GuestSession(**row) for row in rows)
+    upgrades = store._fetch_role_upgrades(user_id)
+    application_rows = store._execute(store.client.table("pass_applications").select("*").eq("user_id", user_id))
+    return ClientSummary(
+        user=user,
+        pass_info=Pass(**pass_row) if pass_row else None,
+        vehicles=vehicles,
+        profile=profile,
+        wallet=wallet,
+        guest_sessions=sessions,
+        role_upgrades=upgrades,
+        pass_applications=[store._pass_application_from_row(row) for row in application_rows],
+    )
+
+
+def timed(server: FakePostgrest, fn: Callable[[], ClientSummary], repeats: int) -> tuple[float, int]:
+    fn()  # warm the connection pool
+    server.requests = 0
+    samples = []
+    for _ in range(repeats):
+        started = perf_counter()
+        fn()
+        samples.append((perf_counter() - started) * 1_000)
+    return median(samples), server.requests // repeats
+
+
+def main(rtts: List[float], vehicles: int, repeats: int) -> None:
+    logger.remove()
+    for rtt in rtts:
+        server = FakePostgrest(rtt / 1_000, canned_rows(vehicles))
+        Thread(target=server.serve_forever, daemon=True).start()
+        settings.supabase_url = f"http://127.0.0.1:{server.server_address[1]}"
+        settings.supabase_key = "bench.local.key"  # JWT-shaped; the fake server ignores it
+        store = SupabaseStore()
+        cases = (
+            ("sequential", lambda: sequential_summary(store, USER_ID)),
+            ("fanout", lambda: store.get_client_summary(USER_ID)),
+        )
+        for label, fn in cases:
+            ms, requests = timed(server, fn, repeats)
+            print(f"rtt={rtt:5.0f}ms vehicles={vehicles}  {label:<10} {ms:8.1f}ms  requests={requests}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[20.0, 40.0, 80.0])
+    parser.add_argument("--vehicles", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rtt_ms, args.vehicles, args.repeats)
@@ -0,0 +1,176 @@
+"""Hammer ``MockDatabase`` from gate, portal and admin threads at once.
+
+Each role runs in its own threads for ``--seconds``:
+
+* gate - ``get_gate_by_slug`` + ``find_user_by_plate`` + ``get_latest_pass`` +
+  ``add_access_event`` per plate read, opening / closing a guest session and
+  counting a parking entry every few reads;
+* portal - ``get_client_summary``, ``wallet_top_up`` and ``submit_role_upgrade``
+  for random users;
+* admin - the list endpoints (users, passes, guest sessions, payments).
+
+``--global-lock`` points every stripe and leaf lock at ``_lock`` to reproduce
+the old single-lock store. ``--data-dir`` journals to a WAL there, which adds
+the file I/O each write did under the lock. Redis caches are disabled.
+
+Usage:
+    python -m scripts.bench_contention --users 5000 --gates 8 --portal 8 --seconds 5
+    python -m scripts.bench_contention --global-lock
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+from statistics import median
+from threading import Barrier, Lock, Thread
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from loguru import logger
+
+from app.schemas import (
+    AccessEventBase,
+    GuestSessionCreate,
+    ParkingEventRequest,
+    RoleUpgradeSubmit,
+    WalletTopUpRequest,
+)
+from app.services.cache import redis_cache
+from app.services.datastore import USER_LOCK_STRIPES, MockDatabase
+
+from scripts.bench_backends import bench_user, populate_memory
+
+
+def populate(db: MockDatabase, size: int) -> None:
+    populate_memory(db, size)
+    for idx in range(size):
+        db._ensure_client_profile(bench_user(idx).id, default_status="active")
+
+
+def gate_worker(db: MockDatabase, users: int, deadline: float, samples: List[float]) -> int:
+    rng = random.Random()
+    gate = db.list_gates()[0].slug
+    venue = db.list_parking_venues()[0].id
+    done = 0
+    while perf_counter() < deadline:
+        plate = f"ben-{rng.randrange(users)}"
+        started = perf_counter()
+        db.get_gate_by_slug(gate)
+        user, _ = db.find_user_by_plate(plate)
+        latest = db.get_latest_pass(user.id) if user else None
+        db.add_access_event(
+            AccessEventBase(
+                plate_text=plate,
+                confidence=0.9,
+                decision="ALLOW" if latest else "DENY",
+                gate=gate,
+                role=user.role if user else "guest",
+                reason="bench",
+            )
+        )
+        samples.append((perf_counter() - started) * 1_000_000)
+        if done % 4 == 0:
+            session = db.open_guest_session(GuestSessionCreate(plate_text=f"VIS {rng.randrange(10_000)}"))
+            db.close_guest_session(session.id)
+            db.record_parking_event(ParkingEventRequest(venue_id=venue, direction="entry" if done % 8 else "exit"))
+        done += 1
+    return done
+
+
+def portal_worker(db: MockDatabase, users: int, deadline: float, samples: List[float]) -> int:
+    rng = random.Random()
+    done = 0
+    while perf_counter() < deadline:
+        user_id = bench_user(rng.randrange(users)).id
+        started = perf_counter()
+        step = done % 3
+        if step == 0:
+            db.get_client_summary(user_id)
+        elif step == 1:
+            db.wallet_top_up(user_id, WalletTopUpRequest(amount=5.0, source="touchngo"))
+        else:
+            db.submit_role_upgrade(user_id, RoleUpgradeSubmit(target_role="staff", reason="bench"))
+        samples.append((perf_counter() - started) * 1_000_000)
+        done += 1
+    return done
+
+
+def admin_worker(db: MockDatabase, users: int, deadline: float, samples: List[float]) -> int:
+    done = 0
+    while perf_counter() < deadline:
+        started = perf_counter()
+        db.list_users()
+        db.list_passes()
+        db.list_guest_sessions()
+        db.list_payments()
+        samples.append((perf_counter() - started) * 1_000_000)
+        done += 1
+    return done
+
+
+def main(users: int, gates: int, portal: int, admins: int, seconds: float, global_lock: bool, data_dir: str) -> None:
+    logger.remove()  # the Touch 'n Go mock logs every charge
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    redis_cache.delete = lambda key: None  # type: ignore[method-assign]
+    redis_cache.list_json = lambda key, limit: []  # type: ignore[method-assign]
+    redis_cache.push_json = lambda key, value, max_length=50: None  # type: ignore[method-assign]
+
+    db = MockDatabase(tempfile.mkdtemp(dir=data_dir) if data_dir else None)
+    populate(db, users)
+    if global_lock:
+        db._user_locks = (db._lock,) * USER_LOCK_STRIPES
+        db._leaf_locks = {collection: db._lock for collection in db._leaf_locks}
+
+    roles: Dict[str, Callable[[MockDatabase, int, float, List[float]], int]] = {
+        "gate": gate_worker,
+        "portal": portal_worker,
+        "admin": admin_worker,
+    }
+    counts = {"gate": gates, "portal": portal, "admin": admins}
+    samples: Dict[str, List[float]] = {role: [] for role in roles}
+    totals: Dict[str, int] = {role: 0 for role in roles}
+    barrier = Barrier(sum(counts.values()) + 1)
+    guard = Lock()
+
+    def run(role: str) -> None:
+        barrier.wait()
+        local: List[float] = []
+        done = roles[role](db, users, perf_counter() + seconds, local)
+        with guard:
+            totals[role] += done
+            samples[role].extend(local)
+
+    threads = [Thread(target=run, args=(role,)) for role, count in counts.items() for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    db.close()
+
+    mode = "global-lock" if global_lock else "striped"
+    print(f"{mode} users={users} gate={gates} portal={portal} admin={admins} wal={'on' if data_dir else 'off'}")
+    for role, values in samples.items():
+        if not values:
+            continue
+        values.sort()
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(
+            f"{role:<7} {totals[role] / seconds:9.0f} ops/s p50={median(values):9.1f}us p99={p99:9.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--gates", type=int, default=8)
+    parser.add_argument("--portal", type=int, default=8)
+    parser.add_argument("--admins", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--global-lock", action="store_true", help="collapse every lock into _lock")
+    parser.add_argument("--data-dir", default=None, help="journal to a WAL under this directory")
+    args = parser.parse_args()
+    main(args.users, args.gates, args.portal, args.admins, args.seconds, args.global_lock, args.data_dir)
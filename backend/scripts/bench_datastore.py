@@ -0,0 +1,165 @@
+"""Benchmark ``MockDatabase`` lookups as the number of users grows.
+
+For every size the store is filled with that many users (one vehicle, one
+pass and one guest session each) and the gate / portal lookups are timed
+against the linear scans they replaced:
+
+* plate - ``find_user_by_plate``;
+* pass - ``get_latest_pass``;
+* email - ``_find_user_by_email`` (signup / registration);
+* login - ``login_portal_user`` resolution by email, name or id;
+* session - ``find_guest_session_by_plate`` (Redis disabled);
+* gate - ``get_gate_by_slug``.
+
+Indexed columns should stay flat while the scan columns grow linearly.
+
+Usage:
+    python -m scripts.bench_datastore --sizes 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.schemas import Gate, GuestSession, Pass, User, Vehicle
+from app.services.cache import redis_cache
+from app.services.datastore import MockDatabase
+
+
+def time_us(fn: Callable[[int], object], repeats: int) -> float:
+    started = perf_counter()
+    for idx in range(repeats):
+        fn(idx)
+    return (perf_counter() - started) / repeats * 1_000_000
+
+
+def populate(db: MockDatabase, size: int) -> None:
+    now = datetime.now(timezone.utc)
+    with db._lock:
+        for idx in range(size):
+            user_id = f"USR-B{idx:07d}"
+            db._put(
+                "users",
+                User(
+                    id=user_id,
+                    name=f"Bench User {idx}",
+                    email=f"bench{idx}@smartgate.demo",
+                    phone="+60123456789",
+                    role="student",
+                    programme="Benchmark",
+                ),
+            )
+            db._put("vehicles", Vehicle(id=f"VEH-B{idx:07d}", plate_text=f"BEN {idx}", user_id=user_id))
+            db._put(
+                "passes",
+                Pass(
+                    id=f"PASS-B{idx:07d}",
+                    user_id=user_id,
+                    role="student",
+                    plan_type="annual",
+                    valid_from=now,
+                    valid_to=now + timedelta(days=365),
+                    price_rm=0.0,
+                    is_paid=True,
+                ),
+            )
+            db._put(
+                "guest_sessions",
+                GuestSession(id=f"GST-B{idx:07d}", plate_text=f"GST {idx}", start_time=now, status="open"),
+            )
+        for idx in range(min(size, 200)):
+            db._put("gates", Gate(id=f"GTE-B{idx:04d}", name=f"Gate {idx}", slug=f"bench-{idx}", min_role="guest"))
+
+
+# Linear scans as they were before the secondary indexes.
+def scan_plate(db: MockDatabase, plate_text: str) -> Tuple[Optional[User], Optional[Vehicle]]:
+    normalized = db._normalize_plate(plate_text)
+    for vehicle in db.vehicles.values():
+        if db._normalize_plate(vehicle.plate_text) == normalized:
+            return db.users.get(vehicle.user_id), vehicle
+    return None, None
+
+
+def scan_pass(db: MockDatabase, user_id: str) -> Optional[Pass]:
+    passes = [parking_pass for parking_pass in db.passes.values() if parking_pass.user_id == user_id]
+    return max(passes, key=lambda p: p.valid_to) if passes else None
+
+
+def scan_email(db: MockDatabase, email: str) -> Optional[User]:
+    target = email.lower()
+    return next((user for user in db.users.values() if user.email.lower() == target), None)
+
+
+def scan_login(db: MockDatabase, identifier: str) -> Optional[User]:
+    identifier = identifier.lower()
+    for user in db.users.values():
+        if user.email.lower() == identifier or user.name.lower() == identifier or user.id.lower() == identifier:
+            return user
+    return None
+
+
+def scan_session(db: MockDatabase, plate_text: str) -> Optional[GuestSession]:
+    normalized = plate_text.upper()
+    return next(
+        (s for s in db.guest_sessions.values() if s.plate_text.upper() == normalized and s.status == "open"), None
+    )
+
+
+def scan_gate(db: MockDatabase, slug: str) -> Optional[Gate]:
+    return next((gate for gate in db.gates.values() if gate.slug == slug), None)
+
+
+def main(sizes: List[int], repeats: int) -> None:
+    # Measure the store, not Redis: turn the guest-session cache into a no-op.
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    for size in sizes:
+        db = MockDatabase()
+        started = perf_counter()
+        populate(db, size)
+        load_s = perf_counter() - started
+        pick = lambda idx: (idx * 7919) % size  # noqa: E731 - spread probes over the whole store
+        gates = min(size, 200)
+        cases: Dict[str, Tuple[Callable[[int], object], Callable[[int], object]]] = {
+            "plate": (
+                lambda idx: db.find_user_by_plate(f"ben-{pick(idx)}"),
+                lambda idx: scan_plate(db, f"ben-{pick(idx)}"),
+            ),
+            "pass": (
+                lambda idx: db.get_latest_pass(f"USR-B{pick(idx):07d}"),
+                lambda idx: scan_pass(db, f"USR-B{pick(idx):07d}"),
+            ),
+            "email": (
+                lambda idx: db._find_user_by_email(f"BENCH{pick(idx)}@smartgate.demo"),
+                lambda idx: scan_email(db, f"BENCH{pick(idx)}@smartgate.demo"),
+            ),
+            "login": (
+                lambda idx: db._lookup("users", db._users_by_login, f"bench user {pick(idx)}"),
+                lambda idx: scan_login(db, f"bench user {pick(idx)}"),
+            ),
+            "session": (
+                lambda idx: db.find_guest_session_by_plate(f"gst {pick(idx)}", status="open"),
+                lambda idx: scan_session(db, f"gst {pick(idx)}"),
+            ),
+            "gate": (
+                lambda idx: db.get_gate_by_slug(f"bench-{idx % gates}"),
+                lambda idx: scan_gate(db, f"bench-{idx % gates}"),
+            ),
+        }
+        scan_repeats = max(1, repeats // max(1, size // 1000))
+        line = [f"users={size:>7} load={load_s:6.2f}s"]
+        for name, (indexed, scan) in cases.items():
+            assert indexed(1) is not None and scan(1) is not None, name
+            line.append(f"{name}={time_us(indexed, repeats):6.2f}us/{time_us(scan, scan_repeats):9.1f}us")
+        print(" ".join(line) + "  (indexed/scan)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=2_000)
+    args = parser.parse_args()
+    main(args.sizes, args.repeats)
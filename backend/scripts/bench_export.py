@@ -0,0 +1,114 @@
+"""Peak memory of streaming exports vs building the whole list.
+
+For each ``--sizes`` entry a SQLite store gets that many access events and
+payments, and an in-memory store that many payments (it keeps only the last
+200 access events). Each collection is then serialised twice:
+
+* list - every row loaded into models and dumped as one JSON body, as an
+  unbounded list endpoint would;
+* export - ``export_rows`` NDJSON chunks consumed one at a time, as
+  ``StreamingResponse`` does.
+
+``peak`` is the tracemalloc high-water mark while serialising. The export
+peak should stay flat as the collection grows; for the in-memory store it
+also includes the payments sort order, built once on the first page and
+kept afterwards. Redis caches are disabled.
+
+Usage:
+    python -m scripts.bench_export --sizes 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, List
+
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter
+
+from app.schemas import AccessEvent, Payment
+from app.services.cache import redis_cache
+from app.services.datastore import MockDatabase
+from app.services.export import export_rows
+from app.services.pagination import PageQuery
+from app.services.sqlite_store import SqliteStore
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def event(idx: int) -> AccessEvent:
+    return AccessEvent(
+        id=f"EVT-B{idx:07d}",
+        timestamp=START + timedelta(seconds=idx),
+        plate_text=f"BEN {idx}",
+        confidence=0.9,
+        decision="ALLOW" if idx % 3 else "DENY",
+        gate="outer" if idx % 2 else "inner",
+        role="student",
+        reason="Bench event",
+    )
+
+
+def payment(idx: int) -> Payment:
+    return Payment(
+        id=f"PAY-B{idx:07d}",
+        amount=5.0,
+        status="succeeded",
+        timestamp=START + timedelta(seconds=idx),
+        reference=f"REF-{idx}",
+    )
+
+
+def measure(fn: Callable[[], int]) -> tuple[float, float, int]:
+    tracemalloc.start()
+    started = perf_counter()
+    size = fn()
+    elapsed = perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1_048_576, size
+
+
+def run(label: str, collection: str, lister: Callable[[], List[Any]], pager: Any, model: type[BaseModel]) -> None:
+    body = TypeAdapter(List[model])  # type: ignore[valid-type]
+    cases = (
+        ("list", lambda: len(body.dump_json(lister()))),
+        ("export", lambda: sum(len(chunk) for chunk in export_rows(pager, PageQuery(), model, "ndjson"))),
+    )
+    for case, fn in cases:
+        seconds, peak, size = measure(fn)
+        print(f"{label:<7} {collection:<14} {case:<6} {seconds:7.2f}s  peak={peak:8.1f}MB  bytes={size:>11}")
+
+
+def main(sizes: List[int]) -> None:
+    logger.remove()
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    redis_cache.delete = lambda key: None  # type: ignore[method-assign]
+    for size in sizes:
+        print(f"-- {size} rows")
+        sqlite = SqliteStore(str(Path(tempfile.mkdtemp()) / "bench.db"))
+        with sqlite._transaction():
+            sqlite._insert_many("access_events", [event(idx).model_dump(mode="json") for idx in range(size)])
+            sqlite._insert_many("payments", [payment(idx).model_dump(mode="json") for idx in range(size)])
+        all_events = lambda: sqlite._models(AccessEvent, "select * from access_events order by timestamp desc", ())
+        run("sqlite", "access_events", all_events, sqlite.page_access_events, AccessEvent)
+        run("sqlite", "payments", sqlite.list_payments, sqlite.page_payments, Payment)
+        sqlite.close()
+        memory = MockDatabase()
+        with memory._leaf_locks["payments"]:
+            for idx in range(size):
+                memory._put("payments", payment(idx))
+        run("memory", "payments", memory.list_payments, memory.page_payments, Payment)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+    main(args.sizes)
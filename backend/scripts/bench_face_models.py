@@ -0,0 +1,85 @@
+"""Compare CPU latency of InsightFace configurations for verification.
+
+For each model pack / detector size it times:
+
+* full - ``FaceAnalysis.get`` with every module of the pack loaded (the
+  previous behaviour: detection, landmarks, gender/age, recognition);
+* fast - detection on a frame downscaled to ``--max-side`` followed by the
+  recogniser on the aligned crop only (``FACE_FAST_PATH``).
+
+Pass ``--image`` with a photo containing a face; without one a synthetic
+frame is used and only detection cost is meaningful. Forces the CPU provider
+so numbers are comparable across machines.
+
+Usage:
+    python -m scripts.bench_face_models --image driver.jpg
+    python -m scripts.bench_face_models --packs buffalo_l buffalo_s --det-sizes 640 320 --max-side 640
+"""
+
+from __future__ import annotations
+
+import argparse
+from statistics import median
+from time import perf_counter
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+from insightface.app import FaceAnalysis
+
+from app.services.face_pipeline import align_best_face, embed_crops
+
+
+def load(pack: str, det_size: int, modules: Optional[List[str]]) -> FaceAnalysis:
+    app = FaceAnalysis(name=pack, allowed_modules=modules, providers=["CPUExecutionProvider"])
+    app.prepare(ctx_id=-1, det_size=(det_size, det_size))
+    return app
+
+
+def time_ms(fn: Callable[[], object], repeats: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeats):
+        started = perf_counter()
+        fn()
+        samples.append((perf_counter() - started) * 1000)
+    return median(samples)
+
+
+def fast_path(app: FaceAnalysis, frame: np.ndarray, max_side: int) -> Optional[np.ndarray]:
+    crop = align_best_face(app, frame, max_side)
+    return embed_crops(app, [crop])[0] if crop is not None else None
+
+
+def main(image: Optional[str], packs: List[str], det_sizes: List[int], max_side: int, repeats: int) -> None:
+    if image:
+        frame = cv2.imread(image)
+        if frame is None:
+            raise SystemExit(f"Unable to read {image}")
+    else:
+        frame = np.random.default_rng(3).integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+    print(f"frame={frame.shape[1]}x{frame.shape[0]} repeats={repeats}")
+    for pack in packs:
+        for det_size in det_sizes:
+            full = load(pack, det_size, None)  # every module of the pack
+            faces = len(full.get(frame))
+            full_ms = time_ms(lambda: full.get(frame), repeats)
+            lean = load(pack, det_size, ["detection", "recognition"])
+            found = fast_path(lean, frame, max_side) is not None
+            fast_ms = time_ms(lambda: fast_path(lean, frame, max_side), repeats)
+            print(
+                f"pack={pack:<9} det_size={det_size:>4} faces={faces} "
+                f"full={full_ms:8.1f}ms fast(max_side={max_side})={fast_ms:8.1f}ms "
+                f"speedup={full_ms / fast_ms:5.2f}x embedded={found}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--image", help="photo containing at least one face")
+    parser.add_argument("--packs", nargs="+", default=["buffalo_l", "buffalo_s"])
+    parser.add_argument("--det-sizes", type=int, nargs="+", default=[640, 320])
+    parser.add_argument("--max-side", type=int, default=640)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    main(args.image, args.packs, args.det_sizes, args.max_side, args.repeats)
@@ -0,0 +1,224 @@
+"""Benchmark the face gallery at campus scale.
+
+For every size it reports:
+
+* search - the per-request rebuild used before the contiguous matrix landed
+  (``np.array`` over Python lists + re-normalising every target + full
+  ``argsort``) against ``FaceEmbeddingStore.find_matches``;
+* batch - ``find_matches_batch`` (one GEMM for ``--batch`` probes) against
+  calling ``find_matches`` once per probe;
+* open / enrol - parsing and rewriting the legacy pretty-printed JSON file
+  against reopening the memory-mapped store and appending one profile.
+  The JSON columns are skipped above ``--json-max`` profiles (the file gets
+  into the gigabytes);
+* ivf - recall@k and latency of the IVF index against exact search, for each
+  ``--nprobe`` value;
+* compaction - identity recall@k and verify latency on a gallery where every
+  user enrolled ``--enrolments`` times, before compaction and after the
+  ``centroid`` and ``exemplars`` modes;
+* crowded - a regression check, exact and IVF: one user with far more close
+  enrolments than rows fetched per match must not push the runners-up out of
+  the top-k. The script exits non-zero if it does.
+
+The synthetic gallery enrols several noisy embeddings per identity and
+queries are fresh noisy captures of enrolled identities.
+
+Usage:
+    python -m scripts.bench_face_store --sizes 10000 100000
+    python -m scripts.bench_face_store --sizes 100000 --nprobe 4 8 16 --json-max 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, List
+
+import numpy as np
+
+from app.services.face_index import IVFIndex
+from app.services.face_store import FaceEmbeddingStore
+
+DIM = 512
+PER_IDENTITY = 4
+NOISE = 0.6
+
+
+def legacy_find(embeddings: List[List[float]], embedding: np.ndarray, top_k: int) -> List[int]:
+    targets = np.array(embeddings, dtype=np.float32)
+    query = embedding.astype(np.float32)
+    query /= np.linalg.norm(query) + 1e-8
+    targets /= np.linalg.norm(targets, axis=1, keepdims=True) + 1e-8
+    scores = np.dot(targets, query)
+    return list(np.argsort(scores)[::-1][:top_k])
+
+
+def capture(identities: np.ndarray, rng: np.random.Generator, noise: float = NOISE) -> np.ndarray:
+    noisy = identities + noise * rng.standard_normal(identities.shape).astype(np.float32) / np.sqrt(DIM)
+    return (noisy / np.linalg.norm(noisy, axis=1, keepdims=True)).astype(np.float32)
+
+
+def build_store(root: Path, vectors: np.ndarray, per_identity: int = PER_IDENTITY) -> FaceEmbeddingStore:
+    store = FaceEmbeddingStore(str(root / "face_store"))
+    store.add_profiles([(f"USR-{idx // per_identity:06d}", vector) for idx, vector in enumerate(vectors)])
+    return store
+
+
+def time_call(fn: Callable[[], object], repeats: int) -> float:
+    fn()
+    started = perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (perf_counter() - started) / repeats * 1000
+
+
+def json_costs(root: Path, embeddings: List[List[float]]) -> tuple[float, float]:
+    path = root / "face_store.json"
+    data = [
+        {"id": f"FACE-{idx:08X}", "user_id": "USR-000001", "embedding": row, "captured_at": "2024-01-01T00:00:00+00:00"}
+        for idx, row in enumerate(embeddings)
+    ]
+
+    def persist() -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+
+    def load() -> None:
+        with open(path, "r", encoding="utf-8") as handle:
+            json.load(handle)
+
+    enrol_ms = time_call(persist, 1)
+    open_ms = time_call(load, 1)
+    return open_ms, enrol_ms
+
+
+def ivf_recall(root: Path, store: FaceEmbeddingStore, queries: np.ndarray, top_k: int, nprobes: List[int]) -> None:
+    started = perf_counter()
+    index = IVFIndex(str(root / "face_store"), min_rows=1)
+    indexed = FaceEmbeddingStore(str(root / "face_store"), index=index)
+    build_ms = (perf_counter() - started) * 1000
+    size = store._view.size
+    exact = [set(store.exact_search(query, top_k)[0].tolist()) for query in queries]
+    exact_ms = time_call(lambda: [store.exact_search(query, top_k) for query in queries], 1) / len(queries)
+    for nprobe in nprobes:
+        index.nprobe = nprobe
+        hits = sum(
+            len(expected & set(index.search(indexed._view.matrix, size, query, top_k)[0].tolist()))
+            for expected, query in zip(exact, queries)
+        )
+        ivf_ms = time_call(lambda: [index.search(indexed._view.matrix, size, query, top_k) for query in queries], 1)
+        print(
+            f"profiles={size:>7} ivf nprobe={nprobe:>3} recall@{top_k}={hits / (len(queries) * top_k):.3f} "
+            f"ivf={ivf_ms / len(queries):6.2f}ms exact={exact_ms:6.2f}ms build={build_ms:8.1f}ms"
+        )
+
+
+def identity_recall(store: FaceEmbeddingStore, queries: np.ndarray, truth: List[str], top_k: int) -> tuple[float, float]:
+    started = perf_counter()
+    ranked = [store.find_matches(query, top_k=top_k) for query in queries]
+    latency_ms = (perf_counter() - started) / len(queries) * 1000
+    hits = sum(user in {profile.user_id for profile, _ in matches} for user, matches in zip(truth, ranked))
+    return hits / len(queries), latency_ms
+
+
+def compaction(size: int, enrolments: int, queries: int, noise: float, rng: np.random.Generator) -> None:
+    users = max(1, size // enrolments)
+    identities = rng.standard_normal((users, DIM)).astype(np.float32)
+    identities /= np.linalg.norm(identities, axis=1, keepdims=True)
+    picked = rng.choice(users, queries)
+    probes = capture(identities[picked], rng, noise)
+    truth = [f"USR-{idx:06d}" for idx in picked]
+    for mode in ("all", "centroid", "exemplars"):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = build_store(Path(tmp), capture(np.repeat(identities, enrolments, axis=0), rng, noise), enrolments)
+            report = store.compact(mode, max_exemplars=3)
+            recall, latency_ms = identity_recall(store, probes, truth, 1)
+            print(
+                f"compaction mode={mode:<9} rows={report.rows_before:>7}->{report.rows_after:<7} "
+                f"recall@1={recall:.3f} verify={latency_ms:6.2f}ms compact={report.duration_ms:8.1f}ms"
+            )
+
+
+def crowded_user_check(rng: np.random.Generator, top_k: int) -> None:
+    identity = capture(rng.standard_normal((1, DIM)).astype(np.float32), rng, 0.0)
+    crowd = 16 * top_k
+    vectors = capture(np.repeat(identity, crowd + top_k - 1, axis=0), rng, 1.0)
+    users = ["USR-CROWD"] * crowd + [f"USR-RUNNER-{idx}" for idx in range(top_k - 1)]
+    vectors[crowd:] = capture(np.repeat(identity, top_k - 1, axis=0), rng, 3.0)  # further away than the crowd
+    noise = capture(rng.standard_normal((200, DIM)).astype(np.float32), rng, 0.0)
+    for label in ("exact", "ivf"):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = IVFIndex(tmp, nlist=4, nprobe=4, min_rows=1) if label == "ivf" else None
+            store = FaceEmbeddingStore(tmp, index=index)
+            store.add_profiles(list(zip(users, vectors)) + [(f"USR-NOISE-{idx}", row) for idx, row in enumerate(noise)])
+            found = [profile.user_id for profile, _ in store.find_matches(identity[0], top_k=top_k)]
+            print(f"crowded {label:<5} rows={crowd}+{top_k - 1} top_k={top_k} users={found}")
+            if found[0:1] != ["USR-CROWD"] or sorted(found[1:]) != sorted(users[crowd:]):
+                raise SystemExit(f"crowded {label}: expected USR-CROWD then the runners-up, got {found}")
+
+
+def main(sizes: List[int], repeats: int, top_k: int, json_max: int, nprobes: List[int], queries: int, batch: int, enrolments: int, noise: float) -> None:
+    rng = np.random.default_rng(11)
+    crowded_user_check(rng, top_k)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            identities = rng.standard_normal((max(1, size // PER_IDENTITY), DIM)).astype(np.float32)
+            identities /= np.linalg.norm(identities, axis=1, keepdims=True)
+            vectors = capture(np.repeat(identities, PER_IDENTITY, axis=0)[:size], rng)
+            embeddings = vectors.tolist()
+            store = build_store(root, vectors)
+            probe = capture(identities[:1], rng)[0]
+            legacy_ms = time_call(lambda: legacy_find(embeddings, probe.copy(), top_k), max(1, repeats // 10))
+            matrix_ms = time_call(lambda: store.find_matches(probe, top_k=top_k), repeats)
+            print(
+                f"profiles={size:>7} search legacy={legacy_ms:9.2f}ms matrix={matrix_ms:7.2f}ms "
+                f"speedup={legacy_ms / matrix_ms:6.1f}x"
+            )
+
+            probes = capture(identities[rng.choice(identities.shape[0], batch)], rng)
+            loop_ms = time_call(lambda: [store.find_matches(row, top_k=top_k) for row in probes], repeats)
+            batch_ms = time_call(lambda: store.find_matches_batch(probes, top_k=top_k), repeats)
+            print(f"profiles={size:>7} batch={batch:>3} per-probe={loop_ms:8.2f}ms gemm={batch_ms:8.2f}ms")
+
+            open_ms = time_call(lambda: FaceEmbeddingStore(str(root / "face_store")), 3)
+            enrol_ms = time_call(lambda: store.add_profile("USR-BENCH", probe), repeats)
+            line = f"profiles={size:>7} binary open={open_ms:9.2f}ms enrol={enrol_ms:7.2f}ms"
+            if size <= json_max:
+                json_open_ms, json_enrol_ms = json_costs(root, embeddings)
+                line += f" | json open={json_open_ms:9.2f}ms enrol={json_enrol_ms:9.2f}ms"
+            print(line)
+
+            if nprobes:
+                sample = capture(identities[rng.choice(identities.shape[0], queries)], rng)
+                ivf_recall(root, store, sample, top_k, nprobes)
+        if enrolments:
+            compaction(size, enrolments, queries, noise, rng)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--json-max", type=int, default=20_000)
+    parser.add_argument("--nprobe", type=int, nargs="*", default=[4, 8, 16], help="IVF probes to test (none to skip)")
+    parser.add_argument("--queries", type=int, default=200, help="queries used for recall@k")
+    parser.add_argument("--batch", type=int, default=32, help="probes per batched verification")
+    parser.add_argument("--enrolments", type=int, default=10, help="enrolments per user for compaction (0 skips)")
+    parser.add_argument("--noise", type=float, default=3.0, help="capture noise for the compaction gallery")
+    args = parser.parse_args()
+    main(
+        args.sizes,
+        args.repeats,
+        args.top_k,
+        args.json_max,
+        args.nprobe,
+        args.queries,
+        args.batch,
+        args.enrolments,
+        args.noise,
+    )
@@ -0,0 +1,155 @@
+"""Simulate concurrent gate traffic against the configured datastore.
+
+Compares the awaitable store (``adb``) against the legacy ``asyncio.to_thread``
+hops around the blocking store (``db``) for the reads/writes a gate decision
+performs.
+
+With ``--guest-burst N`` it instead fires N parallel inferences for one
+unregistered plate and checks that exactly one guest session was opened.
+Every store call the inference service makes first sleeps
+``--store-latency-ms`` (a network round trip), so the frames really do
+interleave between looking up the open session and creating one. Add
+``--no-single-flight`` to see the race the single-flight guard prevents:
+the burst then opens several sessions and the script exits non-zero.
+
+Usage:
+    python -m scripts.bench_gate_load --gates 8 --frames 25
+    python -m scripts.bench_gate_load --guest-burst 20
+    python -m scripts.bench_gate_load --guest-burst 20 --no-single-flight
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from statistics import median, quantiles
+from time import perf_counter
+from typing import Any, Awaitable, Callable, List, TypeVar
+from uuid import uuid4
+
+from app.data import seed
+from app.schemas import AccessEventBase, InferenceRequest
+from app.services.datastore import adb, db
+
+T = TypeVar("T")
+
+
+def _event(plate: str, gate: str) -> AccessEventBase:
+    return AccessEventBase(
+        plate_text=plate,
+        confidence=0.9,
+        decision="ALLOW",
+        role="student",
+        reason="benchmark",
+        gate=gate,
+    )
+
+
+async def _thread_hop_decision(plate: str, gate: str) -> None:
+    await asyncio.to_thread(db.get_gate_by_slug, gate)
+    user, _ = await asyncio.to_thread(db.find_user_by_plate, plate)
+    if user:
+        await asyncio.to_thread(db.get_latest_pass, user.id)
+    await asyncio.to_thread(db.add_access_event, _event(plate, gate))
+
+
+async def _async_decision(plate: str, gate: str) -> None:
+    await adb.get_gate_by_slug(gate)
+    user, _ = await adb.find_user_by_plate(plate)
+    if user:
+        await adb.get_latest_pass(user.id)
+    await adb.add_access_event(_event(plate, gate))
+
+
+async def _run(
+    label: str,
+    decide: Callable[[str, str], Awaitable[None]],
+    gates: int,
+    frames: int,
+) -> None:
+    plates = [vehicle.plate_text for vehicle in seed.seed_vehicles()] + ["VISITX"]
+    latencies: List[float] = []
+
+    async def gate_loop(gate_idx: int) -> None:
+        gate = "outer" if gate_idx % 2 == 0 else "inner"
+        for frame in range(frames):
+            started = perf_counter()
+            await decide(plates[(gate_idx + frame) % len(plates)], gate)
+            latencies.append(perf_counter() - started)
+
+    started = perf_counter()
+    await asyncio.gather(*(gate_loop(idx) for idx in range(gates)))
+    elapsed = perf_counter() - started
+    p95 = quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    print(
+        f"{label:<12} decisions={len(latencies):>5} "
+        f"throughput={len(latencies) / elapsed:8.1f}/s "
+        f"p50={median(latencies) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms"
+    )
+
+
+class _RemoteStore:
+    """``adb`` as seen over a network: every call yields for ``latency`` seconds first."""
+
+    def __init__(self, store: Any, latency: float) -> None:
+        self._store = store
+        self._latency = latency
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._store, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            await asyncio.sleep(self._latency)
+            return await attr(*args, **kwargs)
+
+        return call
+
+
+class _NoFlight:
+    """Stand-in for ``SingleFlight`` that lets every caller run the work."""
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        return await fn()
+
+
+async def guest_burst(frames: int, latency_ms: float, single_flight: bool) -> bool:
+    from app.services import inference  # loads the vision stack
+
+    inference.adb = _RemoteStore(adb, latency_ms / 1_000)  # type: ignore[assignment]
+    if not single_flight:
+        inference.inference_service._guest_flights = _NoFlight()  # type: ignore[assignment]
+    plate = f"BURST {uuid4().hex[:4].upper()}"
+    request = InferenceRequest(gate="outer", plate_override=plate)
+    responses = await asyncio.gather(*(inference.inference_service.infer(request) for _ in range(frames)))
+    sessions = [session for session in db.list_guest_sessions() if session.plate_text == plate]
+    decisions = {response.decision.decision for response in responses}
+    print(
+        f"guest-burst  plate={plate} frames={frames} single_flight={single_flight} "
+        f"decisions={sorted(decisions)} sessions={len(sessions)}"
+    )
+    return len(sessions) == 1
+
+
+async def main(gates: int, frames: int, burst: int, latency_ms: float, single_flight: bool) -> None:
+    try:
+        if burst:
+            if not await guest_burst(burst, latency_ms, single_flight):
+                raise SystemExit("expected exactly one guest session for the burst plate")
+            return
+        await _run("thread-hop", _thread_hop_decision, gates, frames)
+        await _run("async", _async_decision, gates, frames)
+    finally:
+        await adb.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--gates", type=int, default=8, help="concurrent gate cameras")
+    parser.add_argument("--frames", type=int, default=25, help="frames submitted per gate")
+    parser.add_argument("--guest-burst", type=int, default=0, help="parallel frames for one unknown plate")
+    parser.add_argument("--store-latency-ms", type=float, default=2.0, help="delay before each store call in a burst")
+    parser.add_argument("--no-single-flight", action="store_true", help="run the burst without the guard")
+    args = parser.parse_args()
+    asyncio.run(main(args.gates, args.frames, args.guest_burst, args.store_latency_ms, not args.no_single_flight))
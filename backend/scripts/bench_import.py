@@ -0,0 +1,120 @@
+"""Time onboarding a batch one call per row vs through the bulk importer.
+
+For the in-memory and SQLite stores, each entity is loaded twice into a fresh
+store: once with ``create_user`` / ``create_vehicle`` / ``create_pass`` per
+row (what a client script does against the admin API today) and once as a
+CSV through ``BulkImporter``. Users carry a bcrypt hash each, so they use
+``--users`` rows (default small) and the importer runs with
+``--hash-workers`` processes. Redis caches are disabled.
+
+The per-row baseline calls the store in-process, so it leaves out the HTTP
+round trip and request parsing a real client pays on every row; the bulk
+timing includes CSV parsing and validation. For the in-memory store, where
+an insert is a dict write, the two are therefore close.
+
+Usage:
+    python -m scripts.bench_import --rows 20000 --users 64 --hash-workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+from app.schemas import PassCreate, UserCreate, VehicleCreate
+from app.services.bulk_import import BulkImporter
+from app.services.cache import redis_cache
+from app.services.datastore import MockDatabase
+from app.services.sqlite_store import SqliteStore
+
+from scripts.bench_backends import populate_memory, populate_sqlite
+
+
+def user_row(idx: int) -> Dict[str, Any]:
+    return {
+        "id": f"USR-I{idx:07d}",
+        "name": f"Import User {idx}",
+        "email": f"import{idx}@smartgate.demo",
+        "phone": f"+6013{idx:07d}",
+        "role": "student",
+        "programme": "Benchmark",
+    }
+
+
+def vehicle_row(idx: int) -> Dict[str, Any]:
+    # Owners come from populate_* (USR-B...), so vehicles and passes need no user import first.
+    return {"id": f"VEH-I{idx:07d}", "plate_text": f"IMP {idx}", "user_id": f"USR-B{idx % 1000:07d}"}
+
+
+def pass_row(idx: int) -> Dict[str, Any]:
+    return {"id": f"PASS-I{idx:07d}", "user_id": f"USR-B{idx % 1000:07d}", "role": "student", "plan_type": "annual"}
+
+
+def as_csv(rows: List[Dict[str, Any]]) -> io.BytesIO:
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return io.BytesIO(text.getvalue().encode())
+
+
+def fresh(kind: str) -> Any:
+    if kind == "memory":
+        store: Any = MockDatabase()
+        populate_memory(store, 1000)
+    else:
+        store = SqliteStore(str(Path(tempfile.mkdtemp()) / "bench.db"))
+        populate_sqlite(store, 1000)
+    return store
+
+
+def compare(
+    kind: str, entity: str, rows: List[Dict[str, Any]], per_row: Callable[[Any, Dict[str, Any]], Any], workers: int
+) -> None:
+    store = fresh(kind)
+    started = perf_counter()
+    for row in rows:
+        per_row(store, row)
+    single = perf_counter() - started
+
+    store = fresh(kind)
+    importer = BulkImporter(store, chunk_size=500, hash_workers=workers)
+    body = as_csv(rows)
+    started = perf_counter()
+    result = getattr(importer, f"import_{entity}")(body, "csv")
+    bulk = perf_counter() - started
+    importer.close()
+    print(
+        f"{kind:<7} {entity:<9} rows={len(rows):>6}  per-row={len(rows) / single:9.0f}/s"
+        f"  bulk={len(rows) / bulk:9.0f}/s  x{single / bulk:5.1f}  created={result.created} failed={result.failed}"
+    )
+
+
+def main(rows: int, users: int, workers: int) -> None:
+    logger.remove()
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    redis_cache.delete = lambda key: None  # type: ignore[method-assign]
+    for kind in ("memory", "sqlite"):
+        vehicles = [vehicle_row(idx) for idx in range(rows)]
+        compare(kind, "vehicles", vehicles, lambda store, row: store.create_vehicle(VehicleCreate(**row)), workers)
+        passes = [pass_row(idx) for idx in range(rows)]
+        compare(kind, "passes", passes, lambda store, row: store.create_pass(PassCreate(**row)), workers)
+        people = [user_row(idx) for idx in range(users)]
+        compare(kind, "users", people, lambda store, row: store.create_user(UserCreate(**row)), workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000, help="vehicles and passes per run")
+    parser.add_argument("--users", type=int, default=64, help="users per run (one bcrypt hash each)")
+    parser.add_argument("--hash-workers", type=int, default=0, help="0 = one per CPU")
+    args = parser.parse_args()
+    main(args.rows, args.users, args.hash_workers)
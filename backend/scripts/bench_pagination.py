@@ -0,0 +1,95 @@
+"""Compare full-collection lists with keyset pages as the tables grow.
+
+For each ``--sizes`` entry the in-memory and SQLite stores are filled with
+that many users / vehicles / passes, then timed on:
+
+* list - ``list_passes`` / ``list_users``, the old unbounded endpoints;
+* first - ``page_*`` for the first ``--limit`` rows;
+* deep - ``page_*`` from a cursor half-way through the collection.
+
+``bytes`` is the JSON body the route would serialise. Pages should stay flat
+in both time and size while the list grows with the table. Redis caches are
+disabled.
+
+Usage:
+    python -m scripts.bench_pagination --sizes 1000 10000 100000 --limit 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import TypeAdapter
+
+from app.schemas import Pass, User
+from app.services.cache import redis_cache
+from app.services.datastore import MockDatabase
+from app.services.pagination import PageQuery
+from app.services.sqlite_store import SqliteStore
+
+from scripts.bench_backends import populate_memory, populate_sqlite
+
+BODIES = {"passes": TypeAdapter(List[Pass]), "users": TypeAdapter(List[User])}
+
+
+def timed(fn: Callable[[], Any], repeats: int) -> Tuple[float, Any]:
+    result = fn()  # warm caches / lazily built sort orders
+    started = perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (perf_counter() - started) / repeats * 1_000, result
+
+
+def cursor_at(pager: Callable[[PageQuery], Tuple[List[Any], Optional[str]]], rows: int) -> Optional[str]:
+    cursor: Optional[str] = None
+    for _ in range(rows // 500):
+        _, cursor = pager(PageQuery(limit=500, cursor=cursor))
+    return cursor
+
+
+def run(label: str, store: Any, size: int, limit: int, repeats: int) -> None:
+    for collection in ("passes", "users"):
+        lister = getattr(store, f"list_{collection}")
+        pager = getattr(store, f"page_{collection}")
+        body = BODIES[collection]
+        deep = cursor_at(pager, size // 2)
+        cases = (
+            ("list", lambda: lister()),
+            ("first", lambda: pager(PageQuery(limit=limit))[0]),
+            ("deep", lambda: pager(PageQuery(limit=limit, cursor=deep))[0]),
+        )
+        for case, fn in cases:
+            ms, rows = timed(fn, 1 if case == "list" else repeats)
+            print(
+                f"{label:<7} {size:>7} {collection:<7} {case:<5} {ms:9.2f}ms"
+                f" rows={len(rows):>7} bytes={len(body.dump_json(rows)):>10}"
+            )
+
+
+def main(sizes: List[int], limit: int, repeats: int) -> None:
+    logger.remove()
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    redis_cache.delete = lambda key: None  # type: ignore[method-assign]
+    for size in sizes:
+        memory = MockDatabase()
+        populate_memory(memory, size)
+        run("memory", memory, size, limit, repeats)
+        sqlite = SqliteStore(str(Path(tempfile.mkdtemp()) / "bench.db"))
+        populate_sqlite(sqlite, size)
+        run("sqlite", sqlite, size, limit, repeats)
+        sqlite.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    main(args.sizes, args.limit, args.repeats)
@@ -0,0 +1,82 @@
+"""Measure access-policy compile time and per-decision evaluation latency.
+
+Generates a synthetic policy with thousands of gate-scoped rules on top of
+the shipped defaults and times ``AccessPolicy.evaluate`` against it.
+
+Usage:
+    python -m scripts.bench_policy --rules 5000 --gates 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from app.core.config import settings
+from app.core.constants import ROLE_LADDER
+from app.services.access_policy import PASS_STATES, AccessFacts, AccessPolicy
+
+
+def synthetic_policy(rules: int, gates: int, rng: random.Random) -> dict:
+    base = json.loads(Path(settings.access_policy_path).read_text(encoding="utf-8"))
+    extra = []
+    for idx in range(rules):
+        when = {}
+        if rng.random() < 0.5:
+            when["pass"] = rng.choice(PASS_STATES)
+        if rng.random() < 0.5:
+            when["role"] = rng.sample(ROLE_LADDER, k=rng.randint(1, 3))
+        if rng.random() < 0.3:
+            when["role_meets_gate"] = rng.random() < 0.5
+        extra.append(
+            {
+                "name": f"synthetic_{idx}",
+                "gates": [f"gate-{rng.randrange(gates)}"],
+                "when": when,
+                "decision": rng.choice(["ALLOW", "DENY"]),
+                "reason": "Synthetic rule for {gate}",
+            }
+        )
+    return {"version": 1, "rules": extra + base["rules"]}
+
+
+def main(rules: int, gates: int, evaluations: int) -> None:
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "policy.json"
+        path.write_text(json.dumps(synthetic_policy(rules, gates, rng)), encoding="utf-8")
+        started = perf_counter()
+        policy = AccessPolicy(str(path), reload_interval=3600)
+        compile_ms = (perf_counter() - started) * 1000
+
+        samples = [
+            (
+                f"gate-{rng.randrange(gates)}",
+                AccessFacts(
+                    registered=rng.random() < 0.8,
+                    pass_state=rng.choice(PASS_STATES),
+                    role=rng.choice(ROLE_LADDER),
+                    required_role=rng.choice(ROLE_LADDER),
+                ),
+            )
+            for _ in range(1024)
+        ]
+        started = perf_counter()
+        for idx in range(evaluations):
+            gate, facts = samples[idx & 1023]
+            policy.evaluate(gate, facts, pass_expiry="2030-01-01")
+        per_eval_us = (perf_counter() - started) / evaluations * 1_000_000
+    print(f"rules={rules} gates={gates} compile={compile_ms:.1f}ms evaluate={per_eval_us:.2f}us/decision")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--gates", type=int, default=200)
+    parser.add_argument("--evaluations", type=int, default=200_000)
+    args = parser.parse_args()
+    main(args.rules, args.gates, args.evaluations)
@@ -0,0 +1,212 @@
+"""Measure what the compact ``mock_records`` rows save over pydantic models.
+
+* memory - bytes per entity (and MB per ``--count``) for users, vehicles,
+  passes, guest sessions and access events held as models vs records, each
+  built from its own freshly allocated values (tracemalloc);
+* mutation - updates/s for the hot in-place writes (parking occupancy,
+  wallet balance, pass paid flag) done the old way (``model_copy`` + store
+  back) and the record way (attribute write), then the same writes through
+  ``MockDatabase`` end to end;
+* read - the per-record ``to_model`` cost paid when a row leaves the store.
+
+Usage:
+    python -m scripts.bench_records --count 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.schemas import (
+    AccessEvent,
+    GuestSession,
+    ParkingEventRequest,
+    ParkingVenueStatus,
+    Pass,
+    PassCreate,
+    User,
+    Vehicle,
+)
+from app.services.cache import redis_cache
+from app.services.datastore import MockDatabase
+from app.services.mock_records import (
+    AccessEventRecord,
+    GuestSessionRecord,
+    ParkingVenueRecord,
+    PassRecord,
+    Record,
+    UserRecord,
+    VehicleRecord,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+def user_values(idx: int) -> Dict[str, Any]:
+    return {
+        "id": f"USR-R{idx:07d}",
+        "name": f"Record User {idx}",
+        "email": f"record{idx}@smartgate.demo",
+        "phone": f"+6012{idx:07d}",
+        "role": "student",
+        "programme": "Benchmark",
+        "wallet_balance": None,
+    }
+
+
+def vehicle_values(idx: int) -> Dict[str, Any]:
+    return {"id": f"VEH-R{idx:07d}", "plate_text": f"REC {idx}", "user_id": f"USR-R{idx:07d}"}
+
+
+def pass_values(idx: int) -> Dict[str, Any]:
+    return {
+        "id": f"PASS-R{idx:07d}",
+        "user_id": f"USR-R{idx:07d}",
+        "role": "student",
+        "plan_type": "annual",
+        "valid_from": NOW + timedelta(seconds=idx),
+        "valid_to": NOW + timedelta(days=365, seconds=idx),
+        "price_rm": 240.0,
+        "is_paid": False,
+        "paid_at": None,
+    }
+
+
+def session_values(idx: int) -> Dict[str, Any]:
+    return {
+        "id": f"GST-R{idx:07d}",
+        "plate_text": f"VIS {idx}",
+        "start_time": NOW + timedelta(seconds=idx),
+        "end_time": None,
+        "minutes": None,
+        "fee": None,
+        "status": "open",
+    }
+
+
+def event_values(idx: int) -> Dict[str, Any]:
+    return {
+        "id": f"EVT-R{idx:07d}",
+        "timestamp": NOW + timedelta(seconds=idx),
+        "plate_text": f"REC {idx}",
+        "confidence": 0.9,
+        "decision": "ALLOW",
+        "gate": "outer",
+        "role": "student",
+        "reason": f"bench {idx}",
+        "snapshot_url": None,
+    }
+
+
+ENTITIES: Dict[str, Tuple[Type[BaseModel], Type[Record], Callable[[int], Dict[str, Any]]]] = {
+    "users": (User, UserRecord, user_values),
+    "vehicles": (Vehicle, VehicleRecord, vehicle_values),
+    "passes": (Pass, PassRecord, pass_values),
+    "sessions": (GuestSession, GuestSessionRecord, session_values),
+    "events": (AccessEvent, AccessEventRecord, event_values),
+}
+
+
+def bytes_per_entity(build: Callable[[Dict[str, Any]], Any], values: Callable[[int], Dict[str, Any]], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    rows: List[Any] = [build(values(idx)) for idx in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del rows
+    return used / count
+
+
+def rate(fn: Callable[[int], Any], repeats: int) -> float:
+    started = perf_counter()
+    for idx in range(repeats):
+        fn(idx)
+    return repeats / (perf_counter() - started)
+
+
+def memory(count: int) -> None:
+    print(f"memory ({count} entities each)")
+    for name, (model, record, values) in ENTITIES.items():
+        as_model = bytes_per_entity(lambda data: model(**data), values, count)
+        as_record = bytes_per_entity(lambda data: record(**data), values, count)
+        print(
+            f"  {name:<9} model={as_model:6.0f} B ({as_model * count / 2**20:6.1f} MB)"
+            f"  record={as_record:6.0f} B ({as_record * count / 2**20:6.1f} MB)  x{as_model / as_record:4.2f}"
+        )
+
+
+def mutation(repeats: int) -> None:
+    print(f"mutation ({repeats} updates)")
+    venue_model = ParkingVenueStatus(id="VEN-R", name="Bench", capacity=10_000, occupied=0, percent=0.0)
+    venue_record = ParkingVenueRecord.from_model(venue_model)
+    venues: Dict[str, Any] = {"VEN-R": venue_model}
+
+    def occupancy_copy(idx: int) -> None:
+        current = venues["VEN-R"]
+        venues["VEN-R"] = current.model_copy(update={"occupied": idx, "percent": idx / 100})
+
+    def occupancy_inplace(idx: int) -> None:
+        venue_record.occupied = idx
+        venue_record.percent = idx / 100
+
+    parking_pass = Pass(**pass_values(0))
+    pass_record = PassRecord.from_model(parking_pass)
+
+    def paid_copy(idx: int) -> None:
+        parking_pass.model_copy(update={"is_paid": True, "paid_at": NOW})
+
+    def paid_inplace(idx: int) -> None:
+        pass_record.paid_at = NOW
+        pass_record.is_paid = True
+
+    for name, old, new in (("occupancy", occupancy_copy, occupancy_inplace), ("pass paid", paid_copy, paid_inplace)):
+        before, after = rate(old, repeats), rate(new, repeats)
+        print(f"  {name:<10} model_copy={before:10.0f}/s  in-place={after:10.0f}/s  x{after / before:5.1f}")
+
+    db = MockDatabase()
+    venue = db.list_parking_venues()[0]
+    user = db.list_users()[0]
+    entry, exit_ = (ParkingEventRequest(venue_id=venue.id, direction=direction) for direction in ("entry", "exit"))
+    parking = rate(lambda idx: db.record_parking_event(entry if idx % 2 else exit_), repeats)
+    wallet = rate(
+        lambda idx: db._apply_wallet_delta(user.id, delta=1.0, txn_type="top_up", description="bench", source="bench"),
+        repeats,
+    )
+    print(f"  store      record_parking_event={parking:8.0f}/s  wallet delta={wallet:8.0f}/s")
+    pass_ids = [db.create_pass(PassCreate(user_id=user.id, role=user.role, plan_type="annual")).id for _ in range(repeats)]
+    db._apply_wallet_delta(user.id, delta=repeats * 1_000.0, txn_type="top_up", description="bench", source="bench")
+    print(f"  store      pay_pass_invoice={rate(lambda idx: db.pay_pass_invoice(user.id, pass_ids[idx]), repeats):8.0f}/s")
+
+
+def reads(repeats: int) -> None:
+    print(f"to_model ({repeats} conversions)")
+    for name, (model, record, values) in ENTITIES.items():
+        row = record(**values(1))
+        print(f"  {name:<9} {1_000_000 / rate(lambda idx: row.to_model(), repeats):6.2f}us")
+
+
+def main(count: int, repeats: int) -> None:
+    logger.remove()
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    redis_cache.delete = lambda key: None  # type: ignore[method-assign]
+    memory(count)
+    mutation(repeats)
+    reads(repeats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.count, args.repeats)
@@ -0,0 +1,75 @@
+"""Client summary polls: rebuilt every time vs served from the summary cache.
+
+Calls the ``/api/client/summary`` handler directly (no HTTP) against a
+seeded store, ``--polls`` times per case:
+
+* rebuild - the cache emptied before every poll, so each one reads the store;
+* cached - a warm entry returned as the stored JSON body;
+* not-modified - the client sends back the ETag and gets an empty 304.
+
+``reads`` counts ``get_client_summary`` calls the polls made. Redis caches
+are disabled.
+
+Usage:
+    python -m scripts.bench_summary_cache --store sqlite --polls 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Optional
+
+from loguru import logger
+
+from app.api.routes import client as client_routes
+from app.services.cache import redis_cache
+from app.services.datastore import MockDatabase
+from app.services.sqlite_store import SqliteStore
+from app.services.summary_cache import client_summary_cache
+
+
+def main(store_name: str, polls: int) -> None:
+    logger.remove()
+    redis_cache.get_json = lambda key: None  # type: ignore[method-assign]
+    redis_cache.set_json = lambda key, value, ttl=None: None  # type: ignore[method-assign]
+    redis_cache.delete = lambda key: None  # type: ignore[method-assign]
+    store = SqliteStore(str(Path(tempfile.mkdtemp()) / "bench.db")) if store_name == "sqlite" else MockDatabase()
+    user_id = store.list_users()[0].id
+    reads = 0
+    build = store.get_client_summary
+
+    def counted(requested: str):
+        nonlocal reads
+        reads += 1
+        return build(requested)
+
+    store.get_client_summary = counted  # type: ignore[method-assign]
+    client_routes.db = store
+
+    def poll(etag: Optional[str] = None) -> int:
+        return client_routes.fetch_client_summary(user_id, if_none_match=etag).status_code
+
+    etag = client_routes.fetch_client_summary(user_id, if_none_match=None).headers["etag"]
+    cases: tuple[tuple[str, Callable[[], int]], ...] = (
+        ("rebuild", lambda: (client_summary_cache.clear(), poll())[1]),
+        ("cached", poll),
+        ("not-modified", lambda: poll(etag)),
+    )
+    for label, fn in cases:
+        fn()
+        reads = 0
+        started = perf_counter()
+        statuses = {fn() for _ in range(polls)}
+        per_poll = (perf_counter() - started) / polls * 1_000_000
+        print(f"{store_name:<7} {label:<13} {per_poll:9.1f}us/poll  reads={reads:<6} status={sorted(statuses)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--store", choices=("memory", "sqlite"), default="sqlite")
+    parser.add_argument("--polls", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.store, args.polls)
@@ -0,0 +1,35 @@
+"""One-shot migration of the legacy JSON face store to the binary layout.
+
+Reads ``FACE_STORE_PATH`` (or ``--source``), writes the memory-mapped store
+into ``FACE_STORE_DIR`` (or ``--target``) and renames the JSON file to
+``*.migrated``. The API performs the same import on startup; this script lets
+operators do it ahead of a deploy.
+
+Usage:
+    python -m scripts.migrate_face_store
+    python -m scripts.migrate_face_store --source old/face_store.json --target app/data/face_store
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from app.core.config import settings
+from app.services.face_store import MANIFEST_FILE, FaceEmbeddingStore, migrate_json_store
+
+
+def main(source: str, target: str) -> None:
+    if os.path.exists(os.path.join(target, MANIFEST_FILE)):
+        raise SystemExit(f"{target} already holds a face store; refusing to merge {source} into it")
+    store = FaceEmbeddingStore(target)
+    imported = migrate_json_store(source, store)
+    print(f"imported={imported} profiles={len(store.list_profiles())} target={target}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default=settings.face_store_path)
+    parser.add_argument("--target", default=settings.face_store_dir)
+    args = parser.parse_args()
+    main(args.source, args.target)
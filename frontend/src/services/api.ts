@@ -93,10 +93,17 @@ export interface PassUpdatePayload {
 export interface UserFace {
   id: string
   user_id: string
-  embedding: number[]
+  embedding?: number[]
   captured_at: string
 }
 
+export interface FaceProfilePage {
+  items: UserFace[]
+  total: number
+  offset: number
+  limit: number
+}
+
 export interface AccessEvent {
   id: string
   plate_text: string
@@ -119,6 +126,8 @@ export interface AccessDecision {
   owner_phone?: string | null
   owner_affiliation?: string | null
   pass_valid_to?: string | null
+  face_state?: "unchecked" | "absent" | "unknown" | "match" | "mismatch" | null
+  face_match?: FaceMatch | null
 }
 
 export interface APIMessage {
@@ -319,35 +328,63 @@ export interface FaceEnrollResponse {
 
 const unwrap = <T>(promise: Promise<{ data: T }>) => promise.then((r) => r.data)
 
-export const fetchUsers = () => unwrap<User[]>(api.get("/admin/users"))
+export interface ListPage<T> {
+  items: T[]
+  nextCursor: string | null
+}
+
+// List endpoints are keyset-paginated: each page carries the cursor for the
+// next one in X-Next-Cursor (absent on the last page). The admin tables load
+// the first page and fetch the next one only when asked to.
+const LIST_PAGE_SIZE = 100
+
+const fetchPage = async <T>(
+  url: string,
+  cursor?: string | null,
+  params: Record<string, unknown> = {},
+): Promise<ListPage<T>> => {
+  const response = await api.get<T[]>(url, { params: { ...params, limit: LIST_PAGE_SIZE, cursor: cursor ?? undefined } })
+  return { items: response.data, nextCursor: response.headers["x-next-cursor"] || null }
+}
+
+export const fetchUsers = (cursor?: string | null) => fetchPage<User>("/admin/users", cursor)
+export const fetchUser = (id: string) => unwrap<User>(api.get("/admin/users/" + id))
 export const createUser = (payload: Partial<User>) => unwrap<User>(api.post("/admin/users", payload))
 export const updateUser = (id: string, payload: Partial<User>) => unwrap<User>(api.put("/admin/users/" + id, payload))
 export const deleteUser = (id: string) => unwrap(api.delete("/admin/users/" + id))
 
-export const fetchVehicles = () => unwrap<Vehicle[]>(api.get("/admin/vehicles"))
+export const fetchVehicles = (cursor?: string | null) => fetchPage<Vehicle>("/admin/vehicles", cursor)
 export const createVehicle = (payload: Partial<Vehicle>) => unwrap<Vehicle>(api.post("/admin/vehicles", payload))
 export const updateVehicle = (id: string, payload: Partial<Vehicle>) => unwrap<Vehicle>(api.put("/admin/vehicles/" + id, payload))
 export const deleteVehicle = (id: string) => unwrap(api.delete("/admin/vehicles/" + id))
 
-export const fetchPasses = () => unwrap<Pass[]>(api.get("/admin/passes"))
+export const fetchPasses = (cursor?: string | null) => fetchPage<Pass>("/admin/passes", cursor)
 export const fetchPassPlans = () => unwrap<PassPlan[]>(api.get("/admin/passes/plans"))
 export const createPass = (payload: PassIssuePayload) => unwrap<Pass>(api.post("/admin/passes", payload))
 export const updatePass = (id: string, payload: PassUpdatePayload) => unwrap<Pass>(api.put("/admin/passes/" + id, payload))
 export const deletePass = (id: string) => unwrap(api.delete("/admin/passes/" + id))
 export const payPassInvoice = (passId: string, userId: string) =>
   unwrap<Pass>(api.post(`/client/pass/${passId}/pay`, null, { params: { user_id: userId } }))
-export const fetchPassApplications = (status?: string) =>
-  unwrap<PassApplication[]>(api.get("/admin/pass-applications", { params: status ? { status } : undefined }))
+export const fetchPassApplications = (status?: string, cursor?: string | null) =>
+  fetchPage<PassApplication>("/admin/pass-applications", cursor, status ? { status } : {})
 export const reviewPassApplication = (id: string, payload: PassApplicationDecisionPayload) =>
   unwrap<PassApplication>(api.post(`/admin/pass-applications/${id}/decision`, payload))
 
 export const fetchAccessEvents = (limit = 50) => unwrap<AccessEvent[]>(api.get("/access-events", { params: { limit } }))
-export const runInference = (payload: { gate: string; plate_override?: string; image_base64?: string }) =>
+export interface InferencePayload {
+  gate: string
+  plate_override?: string
+  image_base64?: string
+  driver_image_base64?: string
+  face_check?: boolean
+}
+
+export const runInference = (payload: InferencePayload) =>
   unwrap<InferenceResponse>(api.post("/infer", payload))
 
 export const fetchAnalytics = () => unwrap<AnalyticsResponse>(api.get("/analytics/mock"))
 
-export const fetchGuestSessions = () => unwrap<GuestSession[]>(api.get("/guest/sessions"))
+export const fetchGuestSessions = (cursor?: string | null) => fetchPage<GuestSession>("/guest/sessions", cursor)
 export const openGuestSession = (plate_text: string) => unwrap<GuestSession>(api.post("/guest/session/open", { plate_text }))
 export const closeGuestSession = (session_id: string) => unwrap<GuestSession>(api.post("/guest/session/close", { session_id }))
 export const payGuestSession = (session_id: string, amount?: number, paymentSource: "touchngo" | "wallet" = "touchngo") =>
@@ -364,7 +401,8 @@ export const enrollFace = (payload: { user_id: string; image_base64: string }) =
   unwrap<FaceEnrollResponse>(api.post("/face/enroll", payload))
 export const verifyFace = (payload: { image_base64: string; top_k?: number; threshold?: number }) =>
   unwrap<FaceVerifyResponse>(api.post("/face/verify", payload))
-export const fetchFaceProfiles = () => unwrap<UserFace[]>(api.get("/face/profiles"))
+export const fetchFaceProfiles = (params: { user_id?: string; offset?: number; limit?: number } = {}) =>
+  unwrap<FaceProfilePage>(api.get("/face/profiles", { params }))
 
 export const registerClient = (payload: ClientRegistrationRequest) =>
   unwrap<ClientRegistrationResponse>(api.post("/client/register", payload))
@@ -1,7 +1,9 @@
 import { computed, ref } from "vue"
+import type { Ref } from "vue"
 import { defineStore } from "pinia"
 
 import type {
+  ListPage,
   Pass,
   PassApplication,
   PassApplicationDecisionPayload,
@@ -21,6 +23,7 @@ import {
   fetchPassPlans,
   fetchPassApplications,
   fetchPasses,
+  fetchUser,
   fetchUsers,
   fetchVehicles,
   reviewPassApplication,
@@ -38,24 +41,67 @@ export const useAdminStore = defineStore("admin", () => {
   const loading = ref(false)
   const error = ref<string | null>(null)
 
-  const userLookup = computed(() => Object.fromEntries(users.value.map((user) => [user.id, user])))
+  // Cursor of the next page per table; null once the last page is loaded.
+  const userCursor = ref<string | null>(null)
+  const vehicleCursor = ref<string | null>(null)
+  const passCursor = ref<string | null>(null)
+  const applicationCursor = ref<string | null>(null)
+  const applicationStatus = ref<string | undefined>(undefined)
+  // Owners of loaded rows whose user record is not on a loaded user page.
+  const resolvedUsers = ref<Record<string, User>>({})
+
+  const userLookup = computed(() => ({
+    ...resolvedUsers.value,
+    ...Object.fromEntries(users.value.map((user) => [user.id, user])),
+  }))
+
+  const setPage = <T>(items: Ref<T[]>, cursor: Ref<string | null>, page: ListPage<T>) => {
+    items.value = page.items
+    cursor.value = page.nextCursor
+  }
+
+  // Append the next page unless the table was reloaded (or already advanced) meanwhile.
+  const appendPage = async <T>(
+    items: Ref<T[]>,
+    cursor: Ref<string | null>,
+    fetch: (cursor: string) => Promise<ListPage<T>>,
+  ) => {
+    const requested = cursor.value
+    if (!requested) return []
+    const page = await fetch(requested)
+    if (cursor.value !== requested) return []
+    items.value = [...items.value, ...page.items]
+    cursor.value = page.nextCursor
+    return page.items
+  }
+
+  const resolveUsers = async (ids: string[]) => {
+    const missing = [...new Set(ids)].filter((id) => !userLookup.value[id])
+    if (!missing.length) return
+    const results = await Promise.allSettled(missing.map((id) => fetchUser(id)))
+    const found = results.flatMap((result) => (result.status === "fulfilled" ? [result.value] : []))
+    resolvedUsers.value = { ...resolvedUsers.value, ...Object.fromEntries(found.map((user) => [user.id, user])) }
+  }
+
+  const ownerIds = (rows: { user_id: string }[]) => rows.map((row) => row.user_id)
 
   const bootstrap = async () => {
     loading.value = true
     error.value = null
     try {
-      const [userData, vehicleData, passData, planData, applicationData] = await Promise.all([
+      const [userPage, vehiclePage, passPage, planData, applicationPage] = await Promise.all([
         fetchUsers(),
         fetchVehicles(),
         fetchPasses(),
         fetchPassPlans(),
-        fetchPassApplications(),
+        fetchPassApplications(applicationStatus.value),
       ])
-      users.value = userData
-      vehicles.value = vehicleData
-      passes.value = passData
+      setPage(users, userCursor, userPage)
+      setPage(vehicles, vehicleCursor, vehiclePage)
+      setPage(passes, passCursor, passPage)
       passPlans.value = planData
-      passApplications.value = applicationData
+      setPage(passApplications, applicationCursor, applicationPage)
+      await resolveUsers(ownerIds([...vehicles.value, ...passes.value, ...passApplications.value]))
     } catch (err) {
       error.value = err instanceof Error ? err.message : "Failed to load admin data"
     } finally {
@@ -64,19 +110,43 @@ export const useAdminStore = defineStore("admin", () => {
   }
 
   const reloadUsers = async () => {
-    users.value = await fetchUsers()
+    setPage(users, userCursor, await fetchUsers())
+  }
+
+  const loadMoreUsers = async () => {
+    await appendPage(users, userCursor, fetchUsers)
   }
 
   const reloadVehicles = async () => {
-    vehicles.value = await fetchVehicles()
+    setPage(vehicles, vehicleCursor, await fetchVehicles())
+    await resolveUsers(ownerIds(vehicles.value))
+  }
+
+  const loadMoreVehicles = async () => {
+    await resolveUsers(ownerIds(await appendPage(vehicles, vehicleCursor, fetchVehicles)))
   }
 
   const reloadPasses = async () => {
-    passes.value = await fetchPasses()
+    setPage(passes, passCursor, await fetchPasses())
+    await resolveUsers(ownerIds(passes.value))
+  }
+
+  const loadMorePasses = async () => {
+    await resolveUsers(ownerIds(await appendPage(passes, passCursor, fetchPasses)))
   }
 
   const reloadPassApplications = async (status?: string) => {
-    passApplications.value = await fetchPassApplications(status)
+    applicationStatus.value = status
+    setPage(passApplications, applicationCursor, await fetchPassApplications(status))
+    await resolveUsers(ownerIds(passApplications.value))
+  }
+
+  const loadMorePassApplications = async () => {
+    const status = applicationStatus.value
+    const loaded = await appendPage(passApplications, applicationCursor, (cursor) =>
+      fetchPassApplications(status, cursor),
+    )
+    await resolveUsers(ownerIds(loaded))
   }
 
   const loadPassPlans = async () => {
@@ -132,7 +202,7 @@ export const useAdminStore = defineStore("admin", () => {
 
   const reviewApplication = async (id: string, payload: PassApplicationDecisionPayload) => {
     await reviewPassApplication(id, payload)
-    await Promise.all([reloadPassApplications(), reloadPasses()])
+    await Promise.all([reloadPassApplications(applicationStatus.value), reloadPasses()])
   }
 
   return {
@@ -143,15 +213,24 @@ export const useAdminStore = defineStore("admin", () => {
     passApplications,
     loading,
     error,
+    userCursor,
+    vehicleCursor,
+    passCursor,
+    applicationCursor,
     get userMap() {
       return userLookup.value
     },
     getUserById,
+    resolveUsers,
     bootstrap,
     reloadUsers,
+    loadMoreUsers,
     reloadVehicles,
+    loadMoreVehicles,
     reloadPasses,
+    loadMorePasses,
     reloadPassApplications,
+    loadMorePassApplications,
     loadPassPlans,
     addUser,
     editUser,
@@ -1,7 +1,7 @@
 import { ref } from "vue"
 import { defineStore } from "pinia"
 
-import type { AccessDecision, AccessEvent, FaceMatch } from "@/services/api"
+import type { AccessDecision, AccessEvent, FaceMatch, InferencePayload } from "@/services/api"
 import { fetchAccessEvents, runInference, verifyFace } from "@/services/api"
 
 export const useGuardStore = defineStore("guard", () => {
@@ -11,12 +11,16 @@ export const useGuardStore = defineStore("guard", () => {
   const error = ref<string | null>(null)
   const faceMatches = ref<FaceMatch[]>([])
 
-  const capture = async (payload: { gate: string; plate_override?: string; image_base64?: string }) => {
+  const capture = async (payload: InferencePayload) => {
     loading.value = true
     error.value = null
     try {
       const response = await runInference(payload)
       latestDecision.value = response.decision
+      // Fused captures carry the face check; no second upload to /face/verify.
+      if (payload.face_check || payload.driver_image_base64) {
+        faceMatches.value = response.decision.face_match ? [response.decision.face_match] : []
+      }
       events.value = [response.event, ...events.value].slice(0, 10)
       return response
     } catch (err) {
@@ -17,13 +17,16 @@ export const useGuestStore = defineStore("guest", () => {
   const loading = ref(false)
   const error = ref<string | null>(null)
   const lastPayment = ref<Payment | null>(null)
+  // Cursor of the next page of sessions; null once the last page is loaded.
+  const sessionCursor = ref<string | null>(null)
 
   const bootstrap = async () => {
     loading.value = true
     error.value = null
     try {
-      const [sessionData, rateData] = await Promise.all([fetchGuestSessions(), fetchGuestRate()])
-      sessions.value = sessionData
+      const [sessionPage, rateData] = await Promise.all([fetchGuestSessions(), fetchGuestRate()])
+      sessions.value = sessionPage.items
+      sessionCursor.value = sessionPage.nextCursor
       rate.value = rateData
     } catch (err) {
       error.value = err instanceof Error ? err.message : "Failed to load guest data"
@@ -33,7 +36,18 @@ export const useGuestStore = defineStore("guest", () => {
   }
 
   const refreshSessions = async () => {
-    sessions.value = await fetchGuestSessions()
+    const page = await fetchGuestSessions()
+    sessions.value = page.items
+    sessionCursor.value = page.nextCursor
+  }
+
+  const loadMoreSessions = async () => {
+    const requested = sessionCursor.value
+    if (!requested) return
+    const page = await fetchGuestSessions(requested)
+    if (sessionCursor.value !== requested) return  // refreshed or already advanced meanwhile
+    sessions.value = [...sessions.value, ...page.items]
+    sessionCursor.value = page.nextCursor
   }
 
   const updateRate = async (payload: GuestRate) => {
@@ -62,8 +76,10 @@ export const useGuestStore = defineStore("guest", () => {
     loading,
     error,
     lastPayment,
+    sessionCursor,
     bootstrap,
     refreshSessions,
+    loadMoreSessions,
     updateRate,
     startSession,
     stopSession,